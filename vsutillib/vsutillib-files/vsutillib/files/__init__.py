@@ -7,18 +7,35 @@ findFileInPath - find a file in system PATH or
 getExecutable - find a file in system PATH and
     the standard directories for applications
 
+getDeviceID - get the device id st_dev for a file or
+    directory
+
 getFilesList - get list of files in a directory
-    can be recursive
+    can be recursive, depth limited or a generator
+
+getDirectoryList - get list of directories in a directory
+
+crc32 - crc32 of a file can use several threads for one file
+
+crc32Batch - crc32 of many files at the same time
 """
 
 from .fileutil import (
     crc32,
+    crc32Batch,
+    crc32Combine,
     fileQuote,
     findFileInPath,
+    getDeviceID,
     getFileList,
     getDirectoryList,
     getExecutable,
     possibleCRC,
     stripEncaseQuotes,
 )
-from .classes import ConfigurationSettings, DisplayPath
+from .classes import (
+    ConfigurationSettings,
+    DirectorySnapshot,
+    DisplayPath,
+    FileStream,
+)
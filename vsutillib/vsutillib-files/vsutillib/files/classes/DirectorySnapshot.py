@@ -0,0 +1,171 @@
+"""
+DirectorySnapshot
+
+Directory listings read once with os.scandir and shared by all
+the users that need the same directory
+"""
+
+# DSN0001
+
+import fnmatch
+import os
+import threading
+
+from pathlib import Path
+
+
+class DirectorySnapshot:
+    """
+    Keep the listing of every directory read. A directory is read only
+    the first time it is needed, the file type comes from the os.DirEntry
+    so no extra stat is done for every file.
+
+    .. code:: Python
+
+        snapshot = DirectorySnapshot()
+
+        if snapshot.isFile(sourceFile):
+            filesInDir = snapshot.files(sourceFile.parent, "*" + sourceFile.suffix)
+
+    The listing doesn't change once read create a new snapshot or call
+    clear to read the directories again.
+    """
+
+    def __init__(self):
+
+        self.__listings = {}
+        self.__lock = threading.Lock()
+
+    def __contains__(self, directory):
+        return str(directory) in self.__listings
+
+    def __len__(self):
+        return len(self.__listings)
+
+    def clear(self):
+        """forget all the listings"""
+
+        with self.__lock:
+            self.__listings.clear()
+
+    def entries(self, directory):
+        """
+        entries listing of directory
+
+        Args:
+            directory (str|Path): directory to read
+
+        Returns:
+            dict:
+
+            name: (isFile, isDir) for every entry empty if the directory
+            can not be read. The dictionary is shared don't change it.
+        """
+
+        key = str(directory)
+
+        if (listing := self.__listings.get(key, None)) is None:
+            listing = _scanDirectory(key)
+            with self.__lock:
+                listing = self.__listings.setdefault(key, listing)
+
+        return listing
+
+    def files(self, directory, pattern="*"):
+        """
+        files in directory that match pattern as glob does names that
+        start with a dot are not matched unless the pattern does
+
+        Args:
+            directory (str|Path): directory to read
+            pattern (str, optional): fnmatch pattern. Defaults to "*".
+
+        Returns:
+            list:
+
+            Path for every file found
+        """
+        return self._select(directory, pattern, 0)
+
+    def directories(self, directory, pattern="*"):
+        """
+        directories in directory that match pattern
+
+        Args:
+            directory (str|Path): directory to read
+            pattern (str, optional): fnmatch pattern. Defaults to "*".
+
+        Returns:
+            list:
+
+            Path for every directory found
+        """
+        return self._select(directory, pattern, 1)
+
+    def isFile(self, fileName):
+        """
+        isFile check file using the listing of its directory
+
+        Args:
+            fileName (str|Path): file to check
+
+        Returns:
+            bool:
+
+            True if fileName is a file False otherwise
+        """
+
+        p = Path(fileName)
+
+        return self.entries(p.parent).get(p.name, (False, False))[0]
+
+    def isDir(self, directory):
+        """
+        isDir check directory using the listing of its parent
+
+        Args:
+            directory (str|Path): directory to check
+
+        Returns:
+            bool:
+
+            True if directory is a directory False otherwise
+        """
+
+        p = Path(directory)
+
+        if p.parent == p:
+            return p.is_dir()
+
+        return self.entries(p.parent).get(p.name, (False, False))[1]
+
+    def _select(self, directory, pattern, typeIndex):
+
+        matchHidden = pattern.startswith(".")
+        pattern = os.path.normcase(pattern)
+        d = Path(directory)
+
+        return [
+            d.joinpath(name)
+            for name, types in self.entries(directory).items()
+            if types[typeIndex]
+            and (matchHidden or not name.startswith("."))
+            and fnmatch.fnmatchcase(os.path.normcase(name), pattern)
+        ]
+
+
+def _scanDirectory(directory):
+
+    listing = {}
+
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    listing[entry.name] = (entry.is_file(), entry.is_dir())
+                except OSError:
+                    listing[entry.name] = (False, False)
+    except (OSError, ValueError):
+        pass
+
+    return listing
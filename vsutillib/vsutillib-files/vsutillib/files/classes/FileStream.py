@@ -0,0 +1,145 @@
+"""
+FileStream
+
+Files found by getFileList delivered while the directory walk is still
+running
+"""
+
+# FST0001
+
+import queue
+import threading
+import time
+
+from ..fileutil import getFileList
+
+_END = object()
+
+
+class FileStream:
+    """
+    Walk a directory in a producer thread and deliver the files through
+    a queue. The consumer starts working with the first file found and
+    the walk continues while it works.
+
+    .. code:: Python
+
+        stream = FileStream(directory, wildcard="*.dsf", recursive=True)
+
+        for oFile in stream:
+            cli.command = command + " " + shlex.quote(str(oFile))
+            cli.run()
+
+        print(f"{stream.count} files")
+
+    Stopping the iteration, i.e. break or an exception, stops the walk.
+    Files created after the stream started, i.e. the output of the
+    commands, are not delivered.
+
+    Args:
+        strPath (str|Path): directory to walk
+        queueSize (int, optional): files found ahead of the consumer
+            before the walk waits. Defaults to 1024.
+        **kwargs: getFileList keyword arguments i.e. wildcard, recursive,
+            maxDepth. fullpath defaults to True and createdBefore to the
+            time start is called.
+    """
+
+    def __init__(self, strPath, queueSize=1024, **kwargs):
+
+        kwargs.setdefault("fullpath", True)
+        kwargs["generator"] = True
+
+        self.__strPath = strPath
+        self.__kwargs = kwargs
+        self.__queue = queue.Queue(maxsize=queueSize)
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__consumed = False
+        self.__count = 0
+        self.__done = False
+        self.__error = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __iter__(self):
+
+        self.start()
+
+        if self.__consumed:
+            return
+
+        self.__consumed = True
+
+        try:
+            while (item := self.__queue.get()) is not _END:
+                yield item
+        finally:
+            self.stop()
+
+        if self.__error is not None:
+            raise self.__error
+
+    @property
+    def count(self):
+        """files found so far"""
+        return self.__count
+
+    @property
+    def done(self):
+        """True when the walk finished count is the total"""
+        return self.__done
+
+    def start(self):
+        """
+        start the walk it is started by iteration if not called
+
+        Returns:
+            FileStream:
+
+            self
+        """
+
+        if self.__thread is None:
+            self.__kwargs.setdefault("createdBefore", time.time())
+            self.__thread = threading.Thread(
+                target=self._produce, name="FileStream", daemon=True
+            )
+            self.__thread.start()
+
+        return self
+
+    def stop(self):
+        """stop the walk the files not read are discarded"""
+
+        self.__stop.set()
+
+    def _produce(self):
+
+        try:
+            for item in getFileList(self.__strPath, **self.__kwargs):
+                self.__count += 1
+                if not self._put(item):
+                    return
+        except Exception as error:  # pylint: disable=broad-except
+            # raised by the consumer
+            self.__error = error
+        finally:
+            self.__done = True
+            self._put(_END)
+
+    def _put(self, item):
+        """put item in queue unless the stream is stopped"""
+
+        while not self.__stop.is_set():
+            try:
+                self.__queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
@@ -5,7 +5,14 @@ classes related to files
 ConfigurationSettings - read/save dictionary of terms
     from file, keys must be strings
 
+DirectorySnapshot - directory listings read once with os.scandir
+
+FileStream - files found by getFileList delivered while the walk
+    is running
+
 """
 
 from .Configuration import ConfigurationSettings
+from .DirectorySnapshot import DirectorySnapshot
 from .DisplayPath import DisplayPath
+from .FileStream import FileStream
@@ -2,26 +2,198 @@
 Convenience functions related to files and file system
 """
 
+import fnmatch
+import mmap
 import os
 import platform
 import re
 import shlex
 import zlib
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path, PurePath
 
 _reCrcChars = re.compile('^[0123456789ABCDEF]+$', flags=re.IGNORECASE)
 
-def crc32(fileName):
+CRCBLOCKSIZE = 1 << 20
 
-    with open(fileName, 'rb') as fh:
-        hash = 0
-        while True:
-            s = fh.read(65536)
-            if not s:
+# crc32 polynomial reflected
+_CRCPOLY = 0xEDB88320
+
+
+def crc32(fileName, blockSize=CRCBLOCKSIZE, workers=1, useMmap=False):
+    """
+    crc32 of a file as used in file names i.e. [1A2B3C4D]
+
+    The file is read in blocks into one reusable buffer. With workers
+    greater than 1 the file is split in segments hashed in parallel
+    threads, zlib releases the GIL, and the results are combined with
+    :func:`crc32Combine`.
+
+    Args:
+        fileName (str|Path): file to hash
+        blockSize (int, optional): bytes read at a time.
+            Defaults to CRCBLOCKSIZE 1 MiB.
+        workers (int, optional): threads used for one file.
+            Defaults to 1.
+        useMmap (bool, optional): hash a memory map of the file instead
+            of reading it. Defaults to False.
+
+    Returns:
+        str:
+
+        crc32 as 8 hexadecimal upper case characters
+    """
+
+    blockSize = max(int(blockSize), 4096)
+    size = os.path.getsize(fileName)
+
+    if workers > 1 and size >= 2 * blockSize:
+        # segments aligned to blockSize
+        segmentSize = -(-size // workers // blockSize) * blockSize
+        segments = [
+            (start, min(segmentSize, size - start))
+            for start in range(0, size, segmentSize)
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            crcs = list(
+                executor.map(
+                    lambda segment: _crcRange(
+                        fileName, segment[0], segment[1], blockSize, useMmap
+                    ),
+                    segments,
+                )
+            )
+        crc = crcs[0]
+        for segmentCrc, (_, length) in zip(crcs[1:], segments[1:]):
+            crc = crc32Combine(crc, segmentCrc, length)
+    else:
+        crc = _crcRange(fileName, 0, size, blockSize, useMmap)
+
+    return "%08X" % (crc & 0xFFFFFFFF)
+
+
+def crc32Batch(fileNames, maxWorkers=4, **kwargs):
+    """
+    crc32 of many files hashed concurrently at most maxWorkers files are
+    read at the same time
+
+    Args:
+        fileNames (iterable): files to hash
+        maxWorkers (int, optional): files hashed at the same time.
+            Defaults to 4.
+        **kwargs: crc32 keyword arguments
+
+    Returns:
+        dict:
+
+        crc32 for every file in fileNames order None for the files that
+        can't be read
+    """
+
+    def fileCrc(fileName):
+        try:
+            return crc32(fileName, **kwargs)
+        except (OSError, ValueError):
+            return None
+
+    fileNames = list(fileNames)
+
+    with ThreadPoolExecutor(max_workers=max(maxWorkers, 1)) as executor:
+        return dict(zip(fileNames, executor.map(fileCrc, fileNames)))
+
+
+def crc32Combine(crc1, crc2, len2):
+    """
+    crc32Combine crc32 of two blocks of data joined from the crc32 of
+    every block as zlib crc32_combine
+
+    Args:
+        crc1 (int): crc32 of first block
+        crc2 (int): crc32 of second block
+        len2 (int): length of second block
+
+    Returns:
+        int:
+
+        crc32 of first block followed by the second
+    """
+
+    return _multModP(_x2nModP(len2, 3), crc1) ^ crc2
+
+
+def _crcRange(fileName, start, length, blockSize, useMmap):
+    """crc32 for length bytes of the file starting at start"""
+
+    crc = 0
+
+    if length <= 0:
+        return crc
+
+    with open(fileName, "rb", buffering=0) as fh:
+        if useMmap:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    for position in range(start, start + length, blockSize):
+                        end = min(position + blockSize, start + length)
+                        crc = zlib.crc32(view[position:end], crc)
+            return crc
+
+        fh.seek(start)
+        buffer = bytearray(min(blockSize, length))
+        with memoryview(buffer) as view:
+            while length > 0:
+                n = fh.readinto(view[: min(len(buffer), length)])
+                if not n:
+                    break
+                crc = zlib.crc32(view[:n], crc)
+                length -= n
+
+    return crc
+
+
+def _multModP(a, b):
+    """a * b modulo the crc32 polynomial"""
+
+    m = 1 << 31
+    p = 0
+
+    while True:
+        if a & m:
+            p ^= b
+            if (a & (m - 1)) == 0:
                 break
-            hash = zlib.crc32(s, hash)
-        return "%08X" % (hash & 0xFFFFFFFF)
+        m >>= 1
+        b = (b >> 1) ^ _CRCPOLY if b & 1 else b >> 1
+
+    return p
+
+
+def _x2nTable():
+
+    table = [1 << 30]  # x^1
+
+    for _ in range(31):
+        table.append(_multModP(table[-1], table[-1]))
+
+    return table
+
+
+_X2NTABLE = _x2nTable()
+
+
+def _x2nModP(n, k):
+    """x^(n * 2^k) modulo the crc32 polynomial"""
+
+    p = 1 << 31  # x^0
+
+    while n:
+        if n & 1:
+            p = _multModP(_X2NTABLE[k & 31], p)
+        n >>= 1
+        k += 1
+
+    return p
 
 def findFileInPath(element, dirPath=None):
     """
@@ -59,158 +231,273 @@ def findFileInPath(element, dirPath=None):
 
 
 def getFileList(
-    strPath, wildcard="*.*", fullpath=False, recursive=False, strName=False
+    strPath,
+    wildcard="*.*",
+    fullpath=False,
+    recursive=False,
+    strName=False,
+    maxDepth=None,
+    followSymlinks=True,
+    generator=False,
+    createdBefore=None,
 ):
     """
     Get files in a directory
     strPath has to be an existing directory or file
     in case of a file the parent directory is used
     strExtFilter in the form -> .ext
-    """
 
-    doubleWildcard = False
-    argWildcard = wildcard
-    lstObjFileNames = []
+    The directories are read with os.scandir the type of every entry
+    comes from the directory listing no extra stat is done per file.
+    Symbolic links to directories are not followed when recursive.
+    Every directory is read completely before its files are returned.
 
-    p = Path(strPath)
-
-    try:
-        if p.is_file():
-            p = p.parent
-    except OSError:
-        pass
+    Args:
+        strPath (str|Path): directory to search
+        wildcard (str, optional): fnmatch pattern for the file names.
+            Defaults to "*.*".
+        fullpath (bool, optional): return Path objects instead of file
+            names. Defaults to False.
+        recursive (bool, optional): search subdirectories.
+            Defaults to False.
+        strName (bool, optional): with fullpath return full path as str.
+            Defaults to False.
+        maxDepth (int, optional): when recursive levels of subdirectories
+            to search 0 is only strPath. Defaults to None no limit.
+        followSymlinks (bool, optional): a symbolic link to a file is
+            reported as a file. Defaults to True.
+        generator (bool, optional): return a generator that yields the
+            files as they are found. Defaults to False.
+        createdBefore (float, optional): time stamp, files with st_ctime
+            at or after it are skipped i.e. files written while the
+            generator is used. Defaults to None all files.
 
-    try:
-        if not p.is_dir():
-            p = p.parent
-    except OSError:
-        wildcard = p.stem
-        p = p.parent
-        doubleWildcard = True  # wildcard found on strPath argument
+    Returns:
+        list|generator:
 
-    try:
-        if not p.is_dir():
-            # Wrong argument for strPath
-            return []
-    except OSError:
-        # Wrong argument for strPath
-        return []
+        files found
+    """
 
-    if (not p.is_file()) and (not p.is_dir()):
-        return []
+    return _listTree(
+        strPath,
+        wildcard,
+        False,
+        fullpath,
+        recursive,
+        strName,
+        maxDepth,
+        followSymlinks,
+        generator,
+        createdBefore,
+    )
 
-    lstFilesFilter = []
 
-    if p.is_file():
-        p = p.parent
+def getDirectoryList(
+    strPath,
+    wildcard="*",
+    fullpath=False,
+    recursive=False,
+    strName=False,
+    maxDepth=None,
+    followSymlinks=True,
+    generator=False,
+):
+    """
+    Get directories in a directory
+    strPath has to be an existing directory or file
+    in case of a file the parent directory is used
 
-    wc = wildcard
-    awc = argWildcard
+    Same arguments as :func:`getFileList`
 
-    if doubleWildcard:
+    Returns:
+        list|generator:
 
-        lstFiles = [x for x in p.glob(wc) if x.is_file()]
+        directories found
+    """
 
-        if recursive:
-            awc = "**/" + stripEncaseQuotes(argWildcard)
+    return _listTree(
+        strPath,
+        wildcard,
+        True,
+        fullpath,
+        recursive,
+        strName,
+        maxDepth,
+        followSymlinks,
+        generator,
+    )
+
+
+def _listTree(
+    strPath,
+    wildcard,
+    directories,
+    fullpath,
+    recursive,
+    strName,
+    maxDepth,
+    followSymlinks,
+    generator,
+    createdBefore=None,
+):
+    """getFileList and getDirectoryList work"""
 
-            for d in lstFiles:
-                if d.is_dir():
-                    oFiles = [x for x in d.glob(awc) if x.is_file()]
-                    lstObjFileNames.extend(oFiles)
-        else:
-            lstObjFileNames.extend(lstFiles)
+    p, topWildcard = _searchDirectory(strPath)
 
-    else:
-        if recursive:
-            wc = "**/" + stripEncaseQuotes(wildcard)
+    if p is None:
+        # Wrong argument for strPath
+        return iter(()) if generator else []
 
-        # print("Path = {}\nWith wildcard ={}\n".format(p, wc))
+    if not recursive:
+        maxDepth = 0
 
-        lstObjFileNames = [x for x in p.glob(wc) if x.is_file()]
+    entries = _scanTree(
+        str(p),
+        _wildcardMatch(wildcard),
+        _wildcardMatch(topWildcard) if topWildcard else None,
+        directories,
+        maxDepth,
+        followSymlinks,
+        createdBefore,
+    )
 
     if not fullpath:
-        lstFilesFilter = [x.name for x in lstObjFileNames]
-        return lstFilesFilter
-
-    if strName:
-        lstFilesFilter = [str(x) for x in lstObjFileNames]
-        return lstFilesFilter
+        result = (entry.name for entry in entries)
+    elif strName:
+        result = (entry.path for entry in entries)
+    else:
+        result = (Path(entry.path) for entry in entries)
 
-    return lstObjFileNames
+    return result if generator else list(result)
 
 
-def getDirectoryList(
-    strPath, wildcard="*", fullpath=False, recursive=False, strName=False
-):
+def _searchDirectory(strPath):
     """
-    Get files in a directory
-    strPath has to be an existing directory or file
-    in case of a file the parent directory is used
-    strExtFilter in the form -> .ext
+    directory to search for strPath and wildcard found on strPath if the
+    operating system rejects it as a path (Windows)
     """
 
-    doubleWildcard = False
-    argWildcard = wildcard
-    lstObjFileNames = []
-
     p = Path(strPath)
-
-    try:
-        if p.is_file():
-            p = p.parent
-    except OSError:
-        pass
+    topWildcard = None
 
     try:
         if not p.is_dir():
+            # file or not existing
             p = p.parent
-    except OSError:
-        wildcard = p.stem
+    except (OSError, ValueError):
+        # wildcard found on strPath argument
+        topWildcard = p.name
         p = p.parent
-        doubleWildcard = True  # wildcard found on strPath argument
 
     try:
         if not p.is_dir():
-            # Wrong argument for strPath
-            return []
-    except OSError:
-        # Wrong argument for strPath
-        return []
+            return None, None
+    except (OSError, ValueError):
+        return None, None
 
-    lstFilesFilter = []
+    return p, topWildcard
 
-    wc = wildcard
-    awc = argWildcard
 
-    if doubleWildcard:
-        dirs = [x for x in p.glob(wc) if x.is_dir()]
+def _wildcardMatch(wildcard):
+    """compiled fnmatch pattern case insensitive where the os is"""
 
-        if recursive:
-            awc = "**/" + stripEncaseQuotes(argWildcard)
-            for d in dirs:
-                if d.is_dir():
-                    lstObjFileNames.append(d)
-                    oDirs = [x for x in d.glob(awc) if x.is_dir()]
-                    lstObjFileNames.extend(oDirs)
+    pattern = os.path.normcase(stripEncaseQuotes(wildcard))
 
-        else:
-            lstObjFileNames.extend(dirs)
-    else:
-        if recursive:
-            wc = "**/" + stripEncaseQuotes(wildcard)
+    return re.compile(fnmatch.translate(pattern)).match
 
-        lstObjFileNames = [x for x in p.glob(wc) if x.is_dir()]
 
-    if not fullpath:
-        lstFilesFilter = [x.name for x in lstObjFileNames]
-        return lstFilesFilter
+def _scanTree(
+    directory,
+    match,
+    topMatch,
+    directories,
+    maxDepth,
+    followSymlinks,
+    createdBefore=None,
+    depth=0,
+):
+    """
+    yield os.DirEntry for the files or directories in directory that
+    match in the same order as Path.glob("**/" + wildcard). If there is a
+    topMatch it is used for the entries in directory and only the
+    subdirectories it matches are searched. Files with st_ctime at or
+    after createdBefore are skipped.
+    """
+
+    subDirectories = []
+    levelMatch = topMatch if (topMatch is not None and depth == 0) else match
+
+    try:
+        # the listing is read and closed before yielding, files created
+        # by the consumer are not found in the directory being read
+        with os.scandir(directory) as it:
+            listing = list(it)
+    except (OSError, ValueError):
+        # not found or no permission
+        return
+
+    for entry in listing:
+        try:
+            isDir = entry.is_dir(follow_symlinks=followSymlinks)
+            isFile = False if isDir else entry.is_file(follow_symlinks=followSymlinks)
+            name = os.path.normcase(entry.name)
+            if (
+                (isDir if directories else isFile)
+                and levelMatch(name)
+                and (
+                    createdBefore is None
+                    or entry.stat(follow_symlinks=followSymlinks).st_ctime
+                    < createdBefore
+                )
+            ):
+                yield entry
+            if (
+                (maxDepth is None or depth < maxDepth)
+                and isDir
+                and not entry.is_symlink()
+                and (topMatch is None or depth > 0 or topMatch(name))
+            ):
+                subDirectories.append(entry.path)
+        except OSError:
+            continue
+
+    for subDirectory in subDirectories:
+        yield from _scanTree(
+            subDirectory,
+            match,
+            topMatch,
+            directories,
+            maxDepth,
+            followSymlinks,
+            createdBefore,
+            depth + 1,
+        )
+
+
+def getDeviceID(fileName):
+    """
+    Convenience function that returns the device where a file or
+    directory lives. If the path doesn't exist yet, as with a destination
+    file, the first parent directory found is used.
 
-    if strName:
-        lstFilesFilter = [str(x) for x in lstObjFileNames]
-        return lstFilesFilter
+    Args:
+        fileName (str|Path): file or directory
+
+    Returns:
+        int: st_dev of the path None if it can not be determined
+    """
 
-    return lstObjFileNames
+    p = Path(fileName)
+
+    for candidate in [p, *p.parents]:
+        try:
+            return candidate.stat().st_dev
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError:
+            break
+
+    return None
 
 
 def getExecutable(search):
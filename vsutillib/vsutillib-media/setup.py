@@ -51,7 +51,10 @@ setup(
     author_email=config.EMAIL,
     license="MIT",
     packages=["vsutillib." + PACKAGE, "vsutillib." + PACKAGE + ".classes"],
-    install_requires=["pymediainfo" + config.PYMEDIAINFO_VERSION],
+    install_requires=[
+        "pymediainfo" + config.PYMEDIAINFO_VERSION,
+        "vsutillib-sql>=" + config.SQL_VERSION,
+    ],
     zip_safe=False,
     url="https://pypi.org/project/vsutillib-" + PACKAGE + "/",
     python_requires=config.PYTHON_VERSION,
@@ -1,4 +1,12 @@
 """audio/video related functions"""
 
-from .classes import MediaFileInfo, MediaTrackInfo, Series
+from .classes import (
+    MediaFileInfo,
+    MediaFileInfoList,
+    MediaFileInfoView,
+    MediaInfoCache,
+    MediaTrackInfo,
+    MediaTrackTable,
+    Series,
+)
 from .mediautils import isMediaInfoLib
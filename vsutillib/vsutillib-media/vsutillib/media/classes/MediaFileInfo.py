@@ -5,8 +5,12 @@ Get file structure information from media file
 # MFI0001
 
 import base64
+import hashlib
 import logging
+import sys
+import threading
 
+from collections import OrderedDict
 from pathlib import PurePath
 
 # import pprint
@@ -15,6 +19,9 @@ from pymediainfo import MediaInfo
 
 from vsutillib.misc import iso639
 
+from .MediaInfoCache import fileVersionKey
+from .MediaTrackTable import MediaTrackTable
+
 MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
 
@@ -36,10 +43,19 @@ class MediaFileInfo:
 
         lstMediaTracks (MediaTrackInfo): list of media tracks
             found
+
+    Use MediaFileInfo.get to share one instance for every file instead
+    of probing it again.
     """
 
     # log state
     __log = False
+    # MediaInfoCache
+    __cache = None
+    # registry used by get
+    __registry = OrderedDict()
+    __registryLock = threading.Lock()
+    __registrySize = 256
 
     def __init__(self, mediaFile, log=None):
 
@@ -61,12 +77,17 @@ class MediaFileInfo:
             "Text": {"all": 0},
         }
         self.attachments = ""
+        self.__fingerprint = None
+        self.__trackTable = None
         self._initHelper()
 
     def _initHelper(self):
         self.suffix = PurePath(self.fileName).suffix
         try:
-            fileMediaInfo = MediaInfo.parse(self.fileName)
+            if MediaFileInfo.__cache:
+                fileMediaInfo = MediaFileInfo.__cache.parse(self.fileName)
+            else:
+                fileMediaInfo = MediaInfo.parse(self.fileName)
             self.mediaInfo = fileMediaInfo
         except OSError as e:
             raise OSError("MediaInfo not found.") from e
@@ -178,7 +199,7 @@ class MediaFileInfo:
 
     def __eq__(self, objOther):
 
-        bReturn = True
+        bReturn = self.fingerprint == objOther.fingerprint
 
         if self.log:
             MODULELOG.debug(
@@ -188,92 +209,82 @@ class MediaFileInfo:
             )
             MODULELOG.debug("MFI0002: FORMAT: %s", self.format)
 
-        if self.codec != objOther.codec:
-            if self.log:
+            if not bReturn:
+                self._logStructureMismatch(objOther)
+
+            if bReturn:
                 MODULELOG.debug(
-                    "MFI0003: Codec mismatched %s - %s", self.codec, objOther.codec
+                    "MFI0012: Structure found ok.",
                 )
-            bReturn = False
-        elif len(self) != len(objOther):
-            if self.log:
+            else:
                 MODULELOG.debug(
-                    "MFI0004: Number of tracks mismatched %s - %s",
-                    len(self),
-                    len(objOther),
+                    "MFI0013: Structure not ok.",
                 )
-            bReturn = False
-        elif len(self) == len(objOther):
+
+        return bReturn
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def _logStructureMismatch(self, objOther):
+        """log the differences found between the structure of the files"""
+
+        if self.codec != objOther.codec:
+            MODULELOG.debug(
+                "MFI0003: Codec mismatched %s - %s", self.codec, objOther.codec
+            )
+        elif len(self) != len(objOther):
+            MODULELOG.debug(
+                "MFI0004: Number of tracks mismatched %s - %s",
+                len(self),
+                len(objOther),
+            )
+        else:
             for a, b in zip(self.lstMediaTracks, objOther.lstMediaTracks):
                 if a.streamorder != b.streamorder:
-                    if self.log:
-                        MODULELOG.debug(
-                            "MFI0005:  Stream order mismatched %s - %s",
-                            a.streamorder,
-                            b.streamorder,
-                        )
-                    bReturn = False
+                    MODULELOG.debug(
+                        "MFI0005:  Stream order mismatched %s - %s",
+                        a.streamorder,
+                        b.streamorder,
+                    )
                 elif a.track_type != b.track_type:
-                    if self.log:
+                    MODULELOG.debug(
+                        "MFI006: Stream type mismatched %s - %s",
+                        a.track_type,
+                        b.track_type,
+                    )
+                elif (a.language != b.language) and (a.track_type != "Video"):
+                    MODULELOG.debug(
+                        "MFI0007: Stream language mismatched %s - %s",
+                        a.language,
+                        b.language,
+                    )
+                    if self.format == "AVI":
+                        # Ignore language for AVI container
                         MODULELOG.debug(
-                            "MFI006: Stream type mismatched %s - %s",
+                            "MFI0008: AVI container ignore language mismatched %s - %s",
                             a.track_type,
                             b.track_type,
                         )
-                    bReturn = False
-                elif (a.language != b.language) and (a.track_type != "Video"):
-                    if self.log:
-                        MODULELOG.debug(
-                            "MFI0007: Stream language mismatched %s - %s",
-                            a.language,
-                            b.language,
-                        )
-                    if self.format == "AVI":
-                        # Ignore language for AVI container
-                        if self.log:
-                            MODULELOG.debug(
-                                "MFI0008: AVI container ignore language mismatched %s - %s",
-                                a.track_type,
-                                b.track_type,
-                            )
-                    else:
-                        bReturn = False
                 elif (a.codec != b.codec) and (
                     a.track_type != "Audio"
                 ):  # Audio has no codec
-                    if self.log:
-                        MODULELOG.debug(
-                            "MFI0009: Codec mismatched %s - %s", a.codec, b.codec
-                        )
+                    MODULELOG.debug(
+                        "MFI0009: Codec mismatched %s - %s", a.codec, b.codec
+                    )
                     if self.format == "AVI":
                         # Ignore for AVI container
-                        if self.log:
-                            MODULELOG.debug(
-                                "MFI0010: AVI container ignore codec mismatched %s - %s",
-                                a.codec,
-                                b.codec,
-                            )
-                    else:
-                        bReturn = False
-                elif a.format != b.format:
-                    if self.log:
                         MODULELOG.debug(
-                            "MFI0011: Stream format mismatched %s - %s",
-                            a.format,
-                            b.format,
+                            "MFI0010: AVI container ignore codec mismatched %s - %s",
+                            a.codec,
+                            b.codec,
                         )
-                    bReturn = False
-
-        if self.log:
-            if bReturn:
-                MODULELOG.debug(
-                    "MFI0012: Structure found ok.",
-                )
-            else:
-                MODULELOG.debug(
-                    "MFI0013: Structure not ok.",
-                )
-
-        return bReturn
+                elif a.format != b.format:
+                    MODULELOG.debug(
+                        "MFI0011: Stream format mismatched %s - %s",
+                        a.format,
+                        b.format,
+                    )
 
     def __getitem__(self, value):
         return self.lstMediaTracks[value]
@@ -291,7 +302,7 @@ class MediaFileInfo:
         for track in self.lstMediaTracks:
             tmpStr += (
                 f"Track: {tmpNum:>2} "
-                f"Order: {track.streamorder:>2} - {track.track_type:>5} "
+                f"Order: {str(track.streamorder):>2} - {str(track.track_type):>5} "
                 f"- Language: {str(track.language):>4} "
                 f"- Format: {track.format}\n"
             )
@@ -324,6 +335,168 @@ class MediaFileInfo:
 
         return cls.__log
 
+    @property
+    def fingerprint(self):
+        """
+        structure fingerprint computed once from the file codec and the
+        (streamorder, type, language, codec, format) of every track. The
+        language of video tracks, the codec of audio tracks and both for
+        the AVI container are not included same as the structure
+        comparison. Two files have the same structure if they have the
+        same fingerprint.
+
+        Returns:
+            str:
+
+            hexadecimal digest of the structure
+        """
+
+        if self.__fingerprint is None:
+            isAVI = self.format == "AVI"
+            structure = [self.codec, len(self)]
+            for track in self.lstMediaTracks:
+                structure.append(
+                    (
+                        track.streamorder,
+                        track.track_type,
+                        None
+                        if isAVI or track.track_type == "Video"
+                        else track.language,
+                        None if isAVI or track.track_type == "Audio" else track.codec,
+                        track.format,
+                    )
+                )
+            self.__fingerprint = hashlib.blake2b(
+                repr(structure).encode("utf-8"), digest_size=16
+            ).hexdigest()
+
+        return self.__fingerprint
+
+    @staticmethod
+    def groupByStructure(mediaFilesInfo):
+        """
+        groupByStructure bucket files by structure fingerprint in one pass
+
+        Args:
+            mediaFilesInfo (iterable): MediaFileInfo elements
+
+        Returns:
+            dict:
+
+            fingerprint as key and list of MediaFileInfo with that
+            structure as value
+        """
+
+        groups = {}
+
+        for mediaFileInfo in mediaFilesInfo:
+            groups.setdefault(mediaFileInfo.fingerprint, []).append(mediaFileInfo)
+
+        return groups
+
+    @property
+    def trackTable(self):
+        """
+        columnar representation of lstMediaTracks created the first time
+        is used
+
+        Returns:
+            MediaTrackTable:
+
+            table with the tracks
+        """
+
+        if self.__trackTable is None:
+            self.__trackTable = MediaTrackTable.fromTracks(self.lstMediaTracks)
+
+        return self.__trackTable
+
+    @classmethod
+    def get(cls, mediaFile, log=None):
+        """
+        get MediaFileInfo for mediaFile from the in memory registry the
+        file is probed only the first time or if it changed. The registry
+        keeps the last classRegistrySize files used.
+
+        Args:
+            mediaFile (str|Path): name with fullpath of source file
+            log (bool, optional): log for a new instance. Defaults to None.
+
+        Returns:
+            MediaFileInfo:
+
+            shared instance for the file
+        """
+
+        key = fileVersionKey(mediaFile)
+
+        with cls.__registryLock:
+            if (mediaFileInfo := cls.__registry.get(key, None)) is not None:
+                cls.__registry.move_to_end(key)
+                return mediaFileInfo
+
+        mediaFileInfo = cls(mediaFile, log=log)
+
+        with cls.__registryLock:
+            cls.__registry[key] = mediaFileInfo
+            while len(cls.__registry) > cls.__registrySize:
+                cls.__registry.popitem(last=False)
+
+        return mediaFileInfo
+
+    @classmethod
+    def clearRegistry(cls):
+        """remove all the files in the registry used by get"""
+
+        with cls.__registryLock:
+            cls.__registry.clear()
+
+    @classmethod
+    def classRegistrySize(cls, setSize=None):
+        """
+        get/set the maximum number of files kept by get
+
+        Args:
+            setSize (int):
+                - int maximum number of files
+                - None returns current Value
+
+        Returns:
+            int:
+
+            returns the current value set
+        """
+
+        if isinstance(setSize, int) and setSize > 0:
+            with cls.__registryLock:
+                cls.__registrySize = setSize
+                while len(cls.__registry) > cls.__registrySize:
+                    cls.__registry.popitem(last=False)
+
+        return cls.__registrySize
+
+    @classmethod
+    def classCache(cls, setCache=None):
+        """
+        get/set the MediaInfoCache used by all instances
+
+        Args:
+            setCache (MediaInfoCache):
+                - MediaInfoCache probes are read and saved in it
+                - False turn off the cache
+                - None returns current Value
+
+        Returns:
+            MediaInfoCache:
+
+            returns the current cache None if not in use
+        """
+
+        if setCache is not None:
+            cls.__cache = setCache if setCache else None
+
+        return cls.__cache
+
     @property
     def log(self):
         """
@@ -373,8 +546,28 @@ class MediaTrackInfo:
         title (str): Track tittle
         codec (str): Codec used
         format (str): Track format
+
+    The class uses __slots__ and the repeated strings are interned to
+    keep the memory used low when working with many files. trackType
+    and streamOrder are computed from track_type and streamorder.
     """
 
+    __slots__ = (
+        "streamorder",
+        "track_type",
+        "language",
+        "default",
+        "forced",
+        "title",
+        "codec",
+        "format",
+        "log",
+        "totalTracksOfThisKind",
+        "typeOrder",
+        "typeLanguageOrder",
+        "tracksLanguageOfThisKind",
+    )
+
     def __init__(
         self,
         streamorder=None,
@@ -392,14 +585,14 @@ class MediaTrackInfo:
         log=False,
     ):
 
-        self.streamorder = streamorder
-        self.track_type = track_type  # pylint: disable=C0103
-        self.language = language
-        self.default = default
-        self.forced = forced
+        self.streamorder = _intern(streamorder)
+        self.track_type = _intern(track_type)  # pylint: disable=C0103
+        self.language = _intern(language)
+        self.default = _intern(default)
+        self.forced = _intern(forced)
         self.title = title
-        self.codec = codec
-        self.format = format_
+        self.codec = _intern(codec)
+        self.format = _intern(format_)
         self.log = log
         # Extending
         self.totalTracksOfThisKind = tracksOfThisKind
@@ -410,9 +603,19 @@ class MediaTrackInfo:
         self.tracksLanguageOfThisKind = (
             (-1) if tracksLanguageOfThisKind is None else int(tracksLanguageOfThisKind)
         )
-        # Extending compatibility
-        self.trackType = track_type
-        self.streamOrder = (-1) if streamorder is None else int(streamorder)
+
+    # Extending compatibility
+    @property
+    def trackType(self):
+        return self.track_type
+
+    @trackType.setter
+    def trackType(self, value):
+        self.track_type = _intern(value)
+
+    @property
+    def streamOrder(self):
+        return (-1) if self.streamorder is None else int(self.streamorder)
 
     def __eq__(self, otherTrack):
 
@@ -514,3 +717,12 @@ class MediaTrackInfo:
             f"Format: {str(self.format):>7} "
             f"Title: {str(self.title)}"
         )
+
+
+def _intern(value):
+    """intern str values that repeat in every file"""
+
+    if isinstance(value, str):
+        return sys.intern(value)
+
+    return value
@@ -0,0 +1,147 @@
+"""
+Sequence of MediaFileInfo read on demand
+"""
+
+# MFL0001
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from .MediaFileInfo import MediaFileInfo
+
+
+class MediaFileInfoList(Sequence):
+    """
+    Sequence of MediaFileInfo for a list of files. A file is probed the
+    first time its index is accessed and the result is kept.
+
+    .. code:: Python
+
+        filesMediaInfo = MediaFileInfoList(filesInDir)
+
+        # only the first file is probed
+        print(filesMediaInfo[0].title)
+
+    Args:
+        files (:obj:`list`, optional): media files. Defaults to None.
+        maxWorkers (:obj:`int`, optional): threads used by readAll.
+            Defaults to None ThreadPoolExecutor default
+            min(32, os.cpu_count() + 4).
+    """
+
+    def __init__(self, files=None, maxWorkers=None):
+
+        self.__files = [] if files is None else list(files)
+        self.__mediaFilesInfo = [None] * len(self.__files)
+        self.__maxWorkers = maxWorkers
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if (mediaFileInfo := self.__mediaFilesInfo[index]) is None:
+            mediaFileInfo = MediaFileInfo.get(self.__files[index])
+            self.__mediaFilesInfo[index] = mediaFileInfo
+
+        return mediaFileInfo
+
+    def __len__(self):
+        return len(self.__files)
+
+    def __setitem__(self, index, value):
+
+        if not isinstance(value, MediaFileInfo):
+            raise TypeError("MediaFileInfo expected")
+
+        self.__mediaFilesInfo[index] = value
+
+    @property
+    def files(self):
+        return self.__files
+
+    def isRead(self, index):
+        """
+        isRead check if file at index was already probed
+
+        Args:
+            index (int): file index
+
+        Returns:
+            bool:
+
+            True if MediaFileInfo for the file is available False otherwise
+        """
+        return self.__mediaFilesInfo[index] is not None
+
+    def readAll(self, maxWorkers=None):
+        """
+        readAll probe all the files not read yet using a thread pool
+        libmediainfo releases the GIL while it reads a file
+
+        Args:
+            maxWorkers (int, optional): threads to use. Defaults to None
+                the value set when the list was created.
+        """
+
+        pending = [i for i in range(len(self)) if not self.isRead(i)]
+        workers = self.__maxWorkers if maxWorkers is None else maxWorkers
+
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, mediaFileInfo in zip(
+                    pending,
+                    executor.map(MediaFileInfo.get, [self.__files[i] for i in pending]),
+                ):
+                    self.__mediaFilesInfo[index] = mediaFileInfo
+        else:
+            for index in pending:
+                self[index]  # pylint: disable=pointless-statement
+
+    def view(self, attribute, default=""):
+        """
+        view sequence with one attribute of every MediaFileInfo the file is
+        probed when the element is accessed
+
+        Args:
+            attribute (str): MediaFileInfo attribute i.e. "title"
+            default (any, optional): value used if the attribute is None.
+                Defaults to "".
+
+        Returns:
+            MediaFileInfoView:
+
+            read only sequence with the attribute values
+        """
+        return MediaFileInfoView(self, attribute, default)
+
+
+class MediaFileInfoView(Sequence):
+    """
+    Read only sequence of one attribute of the elements in a
+    MediaFileInfoList
+
+    Args:
+        mediaFileInfoList (MediaFileInfoList): list to read from
+        attribute (str): attribute name
+        default (any, optional): value used if the attribute is None.
+            Defaults to "".
+    """
+
+    def __init__(self, mediaFileInfoList, attribute, default=""):
+
+        self.__mediaFileInfoList = mediaFileInfoList
+        self.__attribute = attribute
+        self.__default = default
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        value = getattr(self.__mediaFileInfoList[index], self.__attribute, None)
+
+        return self.__default if value is None else value
+
+    def __len__(self):
+        return len(self.__mediaFileInfoList)
@@ -0,0 +1,258 @@
+"""
+Persistent cache for MediaInfo probes
+
+The MediaInfo xml of every file probed is saved in a SQLite database
+the entry is valid while the size, modification time and inode of the
+file don't change.
+
+.. code:: Python
+
+    MediaFileInfo.classCache(MediaInfoCache())
+
+    # files already probed don't call libmediainfo again
+    mi = MediaFileInfo("/media/Show/Show - S01E01.mkv")
+"""
+
+# MIC0001
+
+import logging
+import os
+import threading
+import zlib
+
+from pathlib import Path
+
+from pymediainfo import MediaInfo
+
+from vsutillib.sql import SqlDb
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+DBFILE = Path(Path.home(), ".vsutillib", "mediainfo.db")
+
+
+class MediaInfoCache:
+    """
+    MediaInfo probe cache saved in a SQLite database
+
+    Args:
+        dbFile (:obj:`str`|:obj:`pathlib.Path`, optional): database file.
+            Defaults to ~/.vsutillib/mediainfo.db.
+        log (:obj:`bool`, optional): log hits and misses. Defaults to None.
+
+    Attributes:
+        hits (int): files found in the cache
+        misses (int): files probed with libmediainfo
+    """
+
+    __log = False
+
+    __sqlCreate = """
+        CREATE TABLE IF NOT EXISTS mediainfo (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            info BLOB NOT NULL
+        );
+        """
+    __sqlSelect = "SELECT size, mtime, inode, info FROM mediainfo WHERE path = ?;"
+    __sqlInsert = (
+        "INSERT OR REPLACE INTO mediainfo (path, size, mtime, inode, info) "
+        "VALUES (?, ?, ?, ?, ?);"
+    )
+    __sqlDelete = "DELETE FROM mediainfo;"
+
+    @classmethod
+    def classLog(cls, setLogging=None):
+        """
+        get/set logging at class level
+        every class instance will log
+        unless overwritten
+
+        Args:
+            setLogging (bool):
+                - True class will log
+                - False turn off logging
+                - None returns current Value
+
+        Returns:
+            bool:
+
+            returns the current value set
+        """
+
+        if setLogging is not None:
+            if isinstance(setLogging, bool):
+                cls.__log = setLogging
+
+        return cls.__log
+
+    def __init__(self, dbFile=None, log=None):
+
+        self.__dbFile = Path(DBFILE if dbFile is None else dbFile)
+        self.__lock = threading.Lock()
+        self.__log = None
+        self.log = log
+        self.hits = 0
+        self.misses = 0
+
+        self.__db = None
+
+        try:
+            self.__dbFile.parent.mkdir(parents=True, exist_ok=True)
+            self.__db = SqlDb(str(self.__dbFile), checkSameThread=False)
+        except OSError as error:
+            # cache disabled files are probed every time
+            MODULELOG.error("MIC0004: Cache disabled %s", error)
+            return
+
+        if self.__db:
+            self.__db.sqlExecute(MediaInfoCache.__sqlCreate)
+        if self.__db.error and self.log:
+            MODULELOG.error("MIC0001: Cache database error %s", self.__db.error)
+
+    def __bool__(self):
+        return bool(self.__db)
+
+    @property
+    def dbFile(self):
+        return self.__dbFile
+
+    @property
+    def log(self):
+        """
+        class property can be used to override the class global
+        logging setting
+
+        Returns:
+            bool:
+
+            True if logging is enable False otherwise
+        """
+        if self.__log is not None:
+            return self.__log
+
+        return MediaInfoCache.classLog()
+
+    @log.setter
+    def log(self, value):
+        """set instance log variable"""
+        if isinstance(value, bool) or value is None:
+            self.__log = value
+
+    def clear(self):
+        """delete all the entries in the cache"""
+
+        if not self.__db:
+            return
+
+        with self.__lock:
+            self.__db.sqlExecute(MediaInfoCache.__sqlDelete)
+
+    def close(self):
+        """close the database"""
+
+        with self.__lock:
+            if self.__db:
+                self.__db.close()
+
+    def get(self, fileName):
+        """
+        get MediaInfo xml saved for fileName
+
+        Args:
+            fileName (str|Path): media file
+
+        Returns:
+            str:
+
+            xml saved None if the file is not in the cache or it changed
+        """
+
+        if not self.__db:
+            return None
+
+        path, key = fileVersionKey(fileName)
+
+        with self.__lock:
+            cursor = self.__db.sqlExecute(MediaInfoCache.__sqlSelect, path)
+            row = None if cursor is None else cursor.fetchone()
+
+        if row is not None and tuple(row[0:3]) == key:
+            return zlib.decompress(row[3]).decode("utf-8")
+
+        return None
+
+    def parse(self, fileName):
+        """
+        parse same as MediaInfo.parse using the cache
+
+        Args:
+            fileName (str|Path): media file
+
+        Returns:
+            pymediainfo.MediaInfo:
+
+            MediaInfo of the file
+        """
+
+        xml = self.get(fileName)
+
+        if xml is None:
+            self.misses += 1
+            xml = MediaInfo.parse(fileName, output="OLDXML")
+            self.put(fileName, xml)
+            if self.log:
+                MODULELOG.debug("MIC0002: Cache miss %s", str(fileName))
+        else:
+            self.hits += 1
+
+        return MediaInfo(xml)
+
+    def put(self, fileName, xml):
+        """
+        save MediaInfo xml for fileName
+
+        Args:
+            fileName (str|Path): media file
+            xml (str): MediaInfo.parse output="OLDXML"
+        """
+
+        if not self.__db:
+            return
+
+        path, key = fileVersionKey(fileName)
+
+        with self.__lock:
+            self.__db.sqlExecute(
+                MediaInfoCache.__sqlInsert,
+                path,
+                *key,
+                zlib.compress(xml.encode("utf-8")),
+            )
+            if self.__db.error and self.log:
+                MODULELOG.error("MIC0003: Cache database error %s", self.__db.error)
+
+
+def fileVersionKey(fileName):
+    """
+    fileVersionKey absolute path and the stat values that identify the
+    current version of a file
+
+    Args:
+        fileName (str|Path): file
+
+    Returns:
+        tuple:
+
+            path (str), (size, mtime_ns, inode)
+    """
+
+    st = os.stat(fileName)
+
+    return (
+        str(Path(fileName).absolute()),
+        (st.st_size, st.st_mtime_ns, st.st_ino),
+    )
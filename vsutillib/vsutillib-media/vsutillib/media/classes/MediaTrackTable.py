@@ -0,0 +1,171 @@
+"""
+Columnar representation of the tracks in a media file
+"""
+
+# MTT0001
+
+import threading
+
+from array import array
+
+
+class MediaTrackTable:
+    """
+    Tracks of a MediaFileInfo as parallel arrays of integers. Strings
+    like track type, language, codec and format are saved as codes
+    shared by all the tables so the columns of two files can be compared
+    with one array comparison.
+
+    .. code:: Python
+
+        table = MediaTrackTable.fromTracks(mediaFileInfo.lstMediaTracks)
+
+        if table.trackTypes == otherTable.trackTypes:
+            print("Same type of tracks in same order")
+
+    Attributes:
+        trackTypes (array): track type codes
+        languages (array): language codes
+        streamOrders (array): stream order as int -1 if not available
+        codecs (array): codec codes
+        formats (array): format codes
+    """
+
+    __slots__ = ("trackTypes", "languages", "streamOrders", "codecs", "formats")
+
+    __codes = {}
+    __values = []
+    __codesLock = threading.Lock()
+
+    def __init__(self):
+
+        self.trackTypes = array("i")
+        self.languages = array("i")
+        self.streamOrders = array("i")
+        self.codecs = array("i")
+        self.formats = array("i")
+
+    def __eq__(self, other):
+
+        if not isinstance(other, MediaTrackTable):
+            return NotImplemented
+
+        return (
+            self.streamOrders == other.streamOrders
+            and self.trackTypes == other.trackTypes
+            and self.languages == other.languages
+            and self.codecs == other.codecs
+            and self.formats == other.formats
+        )
+
+    def __len__(self):
+        return len(self.trackTypes)
+
+    @classmethod
+    def code(cls, value):
+        """
+        code for value the same value always gets the same code
+
+        Args:
+            value (str): value to encode
+
+        Returns:
+            int:
+
+            code for value
+        """
+
+        if (code := cls.__codes.get(value, None)) is None:
+            with cls.__codesLock:
+                if (code := cls.__codes.get(value, None)) is None:
+                    code = len(cls.__values)
+                    cls.__values.append(value)
+                    cls.__codes[value] = code
+
+        return code
+
+    @classmethod
+    def value(cls, code):
+        """
+        value decode a code
+
+        Args:
+            code (int): code returned by code
+
+        Returns:
+            str:
+
+            value for the code
+        """
+        return cls.__values[code]
+
+    @classmethod
+    def fromTracks(cls, tracks):
+        """
+        fromTracks create table from MediaTrackInfo list
+
+        Args:
+            tracks (list): MediaTrackInfo elements
+
+        Returns:
+            MediaTrackTable:
+
+            table for the tracks
+        """
+
+        table = cls()
+
+        for track in tracks:
+            table.append(track)
+
+        return table
+
+    def append(self, track):
+        """
+        append add MediaTrackInfo to the table
+
+        Args:
+            track (MediaTrackInfo): track to add
+        """
+
+        self.trackTypes.append(self.code(track.track_type))
+        self.languages.append(self.code(track.language))
+        self.streamOrders.append(_streamOrder(track.streamorder))
+        self.codecs.append(self.code(track.codec))
+        self.formats.append(self.code(track.format))
+
+    def select(self, column, trackType):
+        """
+        select values of a column for the tracks of one type
+
+        Args:
+            column (str): attribute name of the column i.e. "languages"
+            trackType (str): "Video", "Audio" or "Text"
+
+        Returns:
+            array:
+
+            values in the column for the tracks of trackType
+        """
+
+        typeCode = self.code(trackType)
+        values = getattr(self, column)
+
+        return array(
+            "i", (v for t, v in zip(self.trackTypes, values) if t == typeCode)
+        )
+
+
+def _streamOrder(streamorder):
+    """
+    stream order as int, orders that are not numbers get a unique
+    negative value so comparisons still work
+    """
+
+    if streamorder is None:
+        return -1
+
+    try:
+        return int(streamorder)
+    except ValueError:
+        return -2 - MediaTrackTable.code(streamorder)
@@ -2,6 +2,9 @@
 
 from .Keys import MTKeys
 from .MediaFileInfo import MediaFileInfo, MediaTrackInfo
+from .MediaFileInfoList import MediaFileInfoList, MediaFileInfoView
+from .MediaInfoCache import MediaInfoCache
+from .MediaTrackTable import MediaTrackTable
 from .Movie import Movie
 from .ParseMediaFilenames import ParseMediaFileName
 from .Series import Series
@@ -2,11 +2,11 @@
 miscellaneous functions/classes
 """
 
-from .classes import XLate
+from .classes import compileTemplate, XLate, XLateTemplate
 
 from .callerName import callerName
 from .cipher import encrypt, decrypt
 from .decorators import staticVars, callCounter
 from .iso639 import iso639
-from .regexutils import multipleReplace
+from .regexutils import keysRegex, multipleReplace
 from .strFormatTimeDelta import strFormatTimeDelta
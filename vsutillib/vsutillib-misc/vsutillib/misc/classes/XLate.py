@@ -5,20 +5,187 @@ Returns:
     str: text with any successful substitution
 """
 
-import re
+from functools import lru_cache
+
+from ..regexutils import keysRegex
 
 
 class XLate(dict):
-    """ All-in-one multiple-string-substitution class """
+    """
+    All-in-one multiple-string-substitution class
+
+    The regular expression is compiled the first time is needed and it's
+    kept until the dictionary changes.
+
+    .. code:: Python
+
+        xLate = XLate({"<SOURCE0>": "a.mkv", "<OUTPUTFILE>": "b.mkv"})
+        command = xLate.xLate(template)
+
+        # template split once rendered many times
+        compiled = xLate.compile(template)
+        for keys in keysByIndex:
+            command = compiled.render(keys)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.__regex = None
 
     def _makeRegex(self):
         """ Build re object based on the keys of the current dictionary """
-        return re.compile("|".join(map(re.escape, self.keys())))
+        if self.__regex is None:
+            self.__regex = keysRegex(tuple(self.keys()))
+        return self.__regex
+
+    def _changed(self):
+        """ Dictionary changed the regex has to be rebuilt """
+        self.__regex = None
 
     def __call__(self, match):
         """ Handler invoked for each regex match """
         return self[match.group(0)]
 
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._changed()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._changed()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def compile(self, template):
+        """
+        compile split template in literal and key segments for the keys
+        in the dictionary
+
+        Args:
+            template (str): text with keys to substitute
+
+        Returns:
+            XLateTemplate:
+
+            template ready to render with this or other dictionary with
+            the same keys
+        """
+        return compileTemplate(template, tuple(self.keys()))
+
     def xLate(self, text):
         """ Translate text, returns the modified text. """
+        if not self:
+            return text
         return self._makeRegex().sub(self, text)
+
+
+class XLateTemplate:
+    """
+    Template split in literal and key segments. Rendering is a join of
+    the segments no regular expression is used.
+
+    Args:
+        template (str): text with keys to substitute
+        keys (tuple): keys to look for in the template
+    """
+
+    __slots__ = ("__segments", "__keys", "__template")
+
+    def __init__(self, template, keys):
+
+        self.__template = template
+        self.__keys = tuple(keys)
+        # literal at even positions keys at odd positions
+        self.__segments = [template]
+
+        if self.__keys:
+            segments = []
+            position = 0
+            for match in keysRegex(self.__keys).finditer(template):
+                segments.append(template[position : match.start()])
+                segments.append(match.group(0))
+                position = match.end()
+            segments.append(template[position:])
+            self.__segments = segments
+
+    def __str__(self):
+        return self.__template
+
+    @property
+    def keys(self):
+        """keys found in the template"""
+        return tuple(dict.fromkeys(self.__segments[1::2]))
+
+    @property
+    def segments(self):
+        """literal segments at even positions and keys at odd positions"""
+        return tuple(self.__segments)
+
+    @property
+    def template(self):
+        return self.__template
+
+    def render(self, keyDictionary):
+        """
+        render substitute the keys using keyDictionary
+
+        Args:
+            keyDictionary (dict): value for every key in the template
+
+        Returns:
+            str:
+
+            text with the substitutions
+        """
+
+        segments = list(self.__segments)
+        for i in range(1, len(segments), 2):
+            segments[i] = keyDictionary[segments[i]]
+
+        return "".join(segments)
+
+
+@lru_cache(maxsize=256)
+def compileTemplate(template, keys):
+    """
+    compileTemplate get XLateTemplate for template and keys the result
+    is cached
+
+    Args:
+        template (str): text with keys to substitute
+        keys (tuple): keys to look for in the template
+
+    Returns:
+        XLateTemplate:
+
+        compiled template
+    """
+    return XLateTemplate(template, keys)
@@ -2,4 +2,4 @@
 misc classes import
 """
 
-from .XLate import XLate
+from .XLate import compileTemplate, XLate, XLateTemplate
@@ -4,10 +4,43 @@ Regular Expresions utils
 
 import re
 
+from functools import lru_cache
+
 
 def multipleReplace(aDict, text):
-    # Create a regular expression from all of the dictionary keys
-    regex = re.compile("|".join(map(re.escape, aDict.keys())))
+    """
+    multipleReplace replace all the keys of aDict found in text with
+    their values. The regular expression for a set of keys is compiled
+    only once.
+
+    Args:
+        aDict (dict): strings to replace as keys and their replacement
+        text (str): text to work on
+
+    Returns:
+        str: text with the substitutions
+    """
+
+    if not aDict:
+        return text
+
+    # Regular expression from all of the dictionary keys
+    regex = keysRegex(tuple(aDict.keys()))
 
     # For each match, look up the corresponding value in the dictionary
     return regex.sub(lambda match: aDict[match.group(0)], text)
+
+
+@lru_cache(maxsize=128)
+def keysRegex(keys):
+    """
+    keysRegex compiled regular expression that matches any of the keys
+    the results are cached by keys
+
+    Args:
+        keys (tuple): strings to match in order of preference
+
+    Returns:
+        re.Pattern: alternation of the escaped keys
+    """
+    return re.compile("|".join(map(re.escape, keys)))
@@ -8,6 +8,12 @@ from .classes import (
     MergeOptions,
     MKVAttachment,
     MKVAttachments,
+    MKVAttachmentNode,
+    MKVCommandAST,
+    MKVOptionNode,
+    MKVSourceNode,
+    MKVCommandTemplate,
+    CompiledCommandTemplate,
     MKVParseKey,
     MKVCommandParser,
     SourceFile,
@@ -20,6 +26,12 @@ from .classes import (
 
 # Functions
 from .adjustSources import adjustSources
+from .classes import (
+    compileCommandTemplate,
+    parseCommand,
+    parseSource,
+    tokenizeCommand,
+)
 from .generateCommandTemplate import generateCommandTemplate
 from .mkvutils import (
     convertToBashStyle,
@@ -6,7 +6,7 @@ import copy
 
 from pathlib import PurePath
 
-from vsutillib.media import MediaFileInfo, MediaTrackInfo
+from vsutillib.media import MediaTrackInfo
 from vsutillib.mkv import TracksOrder
 
 from .findSimilarTrack import findSimilarTrack
@@ -44,7 +44,8 @@ def adjustSources(oCommand, index, algorithm=1):
     foundBadTrack = False
     for baseIndex, oBaseFile in enumerate(oCommand.oBaseFiles):
         baseFileInfo = oBaseFile.mediaFileInfo
-        sourceFileInfo = MediaFileInfo(sourceFiles[baseIndex])
+        # sourceFiles[baseIndex] probed on demand by SourceFile
+        sourceFileInfo = oBaseFile.filesMediaInfo[index]
         trackOptions = oBaseFile.trackOptions
         translate = {}
         usedTracks = []
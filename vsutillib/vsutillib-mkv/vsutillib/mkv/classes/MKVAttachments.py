@@ -15,12 +15,14 @@
   meaning corresponding file has no attachments.
 """
 
-import re
 import shlex
 
 from pathlib import Path
 
+from vsutillib.files import DirectorySnapshot
+
 from ..mkvutils import unQuote
+from .MKVCommandAST import parseCommand
 
 
 class MKVAttachment:  # pylint: disable=too-few-public-methods
@@ -29,7 +31,7 @@ class MKVAttachment:  # pylint: disable=too-few-public-methods
 
     """
 
-    def __init__(self, attachment, span=None, matchString=None):
+    def __init__(self, attachment, span=None, matchString=None, snapshot=None):
 
         self.name = None
         self.mimeType = None
@@ -43,7 +45,7 @@ class MKVAttachment:  # pylint: disable=too-few-public-methods
             p = Path(f)
 
             try:
-                test = p.is_file()
+                test = p.is_file() if snapshot is None else snapshot.isFile(p)
             except OSError:
                 self.fileName = None
             else:
@@ -78,10 +80,14 @@ class MKVAttachments:
             return MKVCommandParser.attachmentsString for every Source
     """
 
-    def __init__(self, strCommand=None):
+    def __init__(self, strCommand=None, snapshot=None):
 
         # for iterator
         self.__index = 0
+        # vsutillib.files.DirectorySnapshot used to read the directories
+        # if None every command set reads them again
+        self.directorySnapshot = snapshot
+        self.__snapshot = None
         self.strCommand = strCommand
 
     def _initVars(self):
@@ -189,9 +195,7 @@ class MKVAttachments:
         if isinstance(value, str):
             self._initVars()
             self.__strCommand = value
-            self._parse()
-            if self.__cmdLineAttachments:
-                self._readDirs()
+            self._parseCommand()
 
     @property
     def strCommand(self):
@@ -202,45 +206,51 @@ class MKVAttachments:
         if isinstance(value, str):
             self._initVars()
             self.__strCommand = value
+            self._parseCommand()
+
+    def _parseCommand(self):
+        """parse command with the directories listed once"""
+
+        self.__snapshot = self.directorySnapshot
+        if self.__snapshot is None:
+            self.__snapshot = DirectorySnapshot()
+
+        try:
             self._parse()
             if self.__cmdLineAttachments:
                 self._readDirs()
+        finally:
+            self.__snapshot = None
 
     def _parse(self):
 
-        reSourceEx = re.compile(r"'\('\s(.*?)\s'\)'")
+        cmdAST = parseCommand(self.__strCommand)
+        snapshot = self._snapshot()
 
-        reAttachmentsEx = re.compile(
-            (
-                r"--attachment-name (.*?) --attachment-mime-type "
-                r"(.*?) --attach-file (.*?)(?= --)"
-            )
-        )
+        if cmdAST.sources:
 
-        if match := reSourceEx.search(self.__strCommand):
-
-            f = unQuote(match.group(1))
+            f = cmdAST.sources[0].file.value
             p = Path(f)
 
             try:
-                test = p.is_file()
+                test = snapshot.isFile(p)
             except OSError:
                 pass
             else:
                 if test:
-                    fid = fid = [
-                        x for x in p.parent.glob("*" + p.suffix) if x.is_file()
-                    ]
+                    fid = snapshot.files(p.parent, "*" + p.suffix)
                     self.__totalSourceFiles = len(fid)
 
-        if matchAttachments := reAttachmentsEx.finditer(self.__strCommand):
+        if cmdAST.attachments:
             dirs = set()
-            for match in matchAttachments:
-                attachment = MKVAttachment(match.groups(), match.span(), match.group())
+            for node in cmdAST.attachments:
+                attachment = MKVAttachment(
+                    node.groups(), node.span, node.text, snapshot
+                )
                 self.__cmdLineAttachments.append(attachment)
-                p = Path(unQuote(match.group(3)))
+                p = Path(node.file.value)
                 try:
-                    test = p.is_file()
+                    test = snapshot.isFile(p)
                 except OSError:
                     pass
                 else:
@@ -249,20 +259,31 @@ class MKVAttachments:
                         dirs.add(p.parent)
             self.__cmdLineAttachmentsDirs.extend(list(dirs))
 
+    def _snapshot(self):
+        """directory listings for the command being parsed"""
+
+        if self.__snapshot is not None:
+            return self.__snapshot
+
+        if self.directorySnapshot is not None:
+            return self.directorySnapshot
+
+        return DirectorySnapshot()
+
     def _readDirs(self):
 
+        snapshot = self._snapshot()
+
         if len(self.__cmdLineAttachmentsDirs) == 1:
             # Check parent for directories
-            d = self.__cmdLineAttachmentsDirs[0]
             pd = self.__cmdLineAttachmentsDirs[0].parent
-            did = [x for x in pd.glob("*") if x.is_dir()]
-            fid = [x for x in d.glob("*") if x.is_file()]
+            did = snapshot.directories(pd)
 
             if self.__totalSourceFiles == len(did):
                 self.__attachmentsDirByEpisode = True
                 self.__attachmentsDirs.extend(did)
                 for d in did:
-                    fid = [x for x in d.glob("*") if x.is_file()]
+                    fid = snapshot.files(d)
                     lstTmp = []
                     lstTmp.extend(fid)
                     self.__attachmentsFiles.append(lstTmp)
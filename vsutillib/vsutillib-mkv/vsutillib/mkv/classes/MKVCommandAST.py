@@ -0,0 +1,483 @@
+"""
+Parse a mkvmerge command line in one pass
+
+The command is split in option nodes at every whitespace followed by an
+option name (--xxx) or by the '(' and ')' that enclose a source file.
+Whitespace inside a single quoted parameter is not a boundary so file
+names and values can have " --". The parameters are not split with shlex
+the command lines from mkvtoolnix-gui can have file names with ' after
+restoreEscapeQuote, a quote only closes a parameter when followed by
+whitespace or the end of the command.
+
+.. code:: Python
+
+    cmdAST = parseCommand(bashCommand)
+
+    if cmdAST:
+        print(cmdAST.executable, cmdAST.output.value)
+        for source in cmdAST.sources:
+            print(source.optionsText, source.file.value)
+"""
+
+# MCA0001
+
+import re
+
+from functools import lru_cache
+
+from ..mkvutils import unQuote
+
+OPENSOURCE = "'('"
+CLOSESOURCE = "')'"
+
+# whitespace followed by an option or by '(' ')' fixed length lookahead no
+# backtracking, or a quote starting a parameter
+_reBoundary = re.compile(r"\s+(?=--[^\s-]|'[()]'(?:\s|$))|(?<!\S)'")
+# end of single quoted parameter skipping '\'' escapes
+_reQuoteEnd = re.compile(r"'\\''|'(?=\s|$)")
+_reSpace = re.compile(r"\s")
+
+# options saved in MKVCommandAST attributes first one found is used
+_UNIQUE = {
+    "--output": "output",
+    "--title": "title",
+    "--chapters": "chapters",
+    "--chapter-language": "chapterLanguage",
+    "--track-order": "trackOrder",
+}
+
+
+class MKVOptionNode:
+    """
+    Option with its parameter as found in the command line
+
+    Attributes:
+        name (str): option name i.e. "--output" or "'('" for a source
+        parameter (str): parameter as in command line "" if none
+        start (int): start of option in command line
+        end (int): end of parameter in command line
+        parameterStart (int): start of parameter in command line
+    """
+
+    __slots__ = ("name", "parameter", "start", "end", "parameterStart")
+
+    def __init__(self, name, parameter, start, end, parameterStart):
+
+        self.name = name
+        self.parameter = parameter
+        self.start = start
+        self.end = end
+        self.parameterStart = parameterStart
+
+    def __repr__(self):
+        return f"MKVOptionNode({self.name!r}, {self.parameter!r})"
+
+    @property
+    def span(self):
+        return (self.start, self.end)
+
+    @property
+    def parameterSpan(self):
+        return (self.parameterStart, self.end)
+
+    @property
+    def value(self):
+        """parameter without enclosing quotes"""
+        return unQuote(self.parameter)
+
+
+class MKVSourceNode:
+    """
+    Source file with its options
+
+    Attributes:
+        options (list): MKVOptionNode for the options of the source
+        file (MKVOptionNode): '(' node its parameter is the file
+        optionsText (str): options as in command line
+        fileText (str): "'(' file ')'" as in command line
+        start (int): start of options or file in command line
+        end (int): end of ')' in command line
+    """
+
+    __slots__ = ("options", "file", "optionsText", "fileText", "start", "end")
+
+    def __init__(self, strCommand, options, fileNode, closeNode):
+
+        self.options = options
+        self.file = fileNode
+        self.start = options[0].start if options else fileNode.start
+        self.end = closeNode.start + len(CLOSESOURCE)
+        self.optionsText = (
+            strCommand[options[0].start : options[-1].end] if options else ""
+        )
+        self.fileText = strCommand[fileNode.start : self.end]
+
+    def __repr__(self):
+        return f"MKVSourceNode({self.text!r})"
+
+    @property
+    def span(self):
+        return (self.start, self.end)
+
+    @property
+    def text(self):
+        """options and file as used by SourceFile"""
+        return f"{self.optionsText} {self.fileText}"
+
+    def optionsList(self):
+        """
+        optionsList options as a list like shlex.split
+
+        Returns:
+            list:
+
+            option names followed by their parameter if any
+        """
+
+        return optionsList(self.options)
+
+
+class MKVAttachmentNode:
+    """
+    --attachment-name --attachment-mime-type --attach-file group
+
+    Attributes:
+        name (MKVOptionNode): --attachment-name node
+        mimeType (MKVOptionNode): --attachment-mime-type node
+        file (MKVOptionNode): --attach-file node
+        text (str): group as in command line
+    """
+
+    __slots__ = ("name", "mimeType", "file", "text")
+
+    def __init__(self, strCommand, name, mimeType, fileNode):
+
+        self.name = name
+        self.mimeType = mimeType
+        self.file = fileNode
+        self.text = strCommand[name.start : fileNode.end]
+
+    def __repr__(self):
+        return f"MKVAttachmentNode({self.text!r})"
+
+    @property
+    def span(self):
+        return (self.name.start, self.file.end)
+
+    def groups(self):
+        """name, mime type and file parameters"""
+        return (self.name.parameter, self.mimeType.parameter, self.file.parameter)
+
+
+class MKVCommandAST:
+    """
+    Parsed mkvmerge command line. The class evaluates to True if the
+    command has the executable, output file and at least one source.
+    Use parseCommand to share the result for the same command.
+
+    Args:
+        strCommand (str): mkvmerge command in bash style
+
+    Attributes:
+        command (str): command line
+        executable (str): executable as in command line None if not found
+        executableSpan (tuple): start, end of executable
+        options (list): MKVOptionNode for every option
+        output (MKVOptionNode): --output node
+        sources (list): MKVSourceNode for every source
+        attachments (list): MKVAttachmentNode for every attachment
+        title (MKVOptionNode): --title node
+        chapters (MKVOptionNode): --chapters node
+        chapterLanguage (MKVOptionNode): --chapter-language node
+        trackOrder (MKVOptionNode): --track-order node
+    """
+
+    def __init__(self, strCommand):
+
+        self.command = strCommand
+        self.executable = None
+        self.executableSpan = ()
+        self.options = []
+        self.output = None
+        self.sources = []
+        self.attachments = []
+        self.title = None
+        self.chapters = None
+        self.chapterLanguage = None
+        self.trackOrder = None
+
+        self._parse()
+
+    def __bool__(self):
+        return bool(self.executable and self.output and self.sources)
+
+    def __repr__(self):
+        return f"MKVCommandAST({self.command!r})"
+
+    def _parse(self):
+
+        nodes = tokenizeCommand(self.command)
+
+        # executable must be followed by options
+        if len(nodes) > 1 and not _isOption(nodes[0].name):
+            head = nodes.pop(0)
+            self.executable = self.command[head.start : head.end]
+            self.executableSpan = head.span
+
+        self.options = nodes
+
+        sourceOptions = []
+        fileNode = None
+        skipTo = 0
+
+        for index, node in enumerate(nodes):
+            if index < skipTo:
+                continue
+            if node.name == OPENSOURCE:
+                fileNode = node
+            elif node.name == CLOSESOURCE:
+                if fileNode is not None:
+                    self.sources.append(
+                        MKVSourceNode(self.command, sourceOptions, fileNode, node)
+                    )
+                fileNode = None
+                sourceOptions = []
+            elif fileNode is None:
+                if (attribute := _UNIQUE.get(node.name, None)) is not None:
+                    if getattr(self, attribute) is None:
+                        setattr(self, attribute, node)
+                    if node.name == "--output":
+                        sourceOptions = []
+                elif node.name == "--attachment-name":
+                    if (
+                        index + 2 < len(nodes)
+                        and nodes[index + 1].name == "--attachment-mime-type"
+                        and nodes[index + 2].name == "--attach-file"
+                    ):
+                        self.attachments.append(
+                            MKVAttachmentNode(
+                                self.command, node, nodes[index + 1], nodes[index + 2]
+                            )
+                        )
+                        skipTo = index + 3
+                else:
+                    sourceOptions.append(node)
+
+    @property
+    def normalizedCommand(self):
+        """command with one space between the executable and the options"""
+
+        parts = [] if self.executable is None else [self.executable]
+
+        for node in self.options:
+            parts.append(f"{node.name} {node.parameter}" if node.parameter else node.name)
+
+        return " ".join(parts)
+
+    def count(self, name):
+        """
+        count times the option is found
+
+        Args:
+            name (str): option name i.e. "--language"
+
+        Returns:
+            int:
+
+            number of options with name
+        """
+        return sum(1 for node in self.options if node.name == name)
+
+    def findAll(self, name):
+        """
+        findAll all the nodes for an option
+
+        Args:
+            name (str): option name i.e. "--attach-file"
+
+        Returns:
+            list:
+
+            MKVOptionNode list
+        """
+        return [node for node in self.options if node.name == name]
+
+
+def tokenizeCommand(strCommand):
+    """
+    tokenizeCommand split command line in option nodes. The text before
+    the first option is returned as a node with name as found.
+
+    Args:
+        strCommand (str): command line
+
+    Returns:
+        list:
+
+        MKVOptionNode for every option
+    """
+
+    nodes = []
+    start = position = len(strCommand) - len(strCommand.lstrip())
+    textEnd = len(strCommand.rstrip())
+
+    while match := _reBoundary.search(strCommand, position, textEnd):
+        if match.group() == "'":
+            # no boundaries inside quoted parameter
+            position = _quoteEnd(strCommand, match.end(), textEnd)
+            continue
+        nodes.append(_optionNode(strCommand, start, match.start()))
+        start = position = match.end()
+
+    if start < textEnd:
+        nodes.append(_optionNode(strCommand, start, textEnd))
+
+    return nodes
+
+
+def optionsList(nodes):
+    """
+    optionsList options as a list like shlex.split
+
+    Args:
+        nodes (list): MKVOptionNode list
+
+    Returns:
+        list:
+
+        option names followed by their parameter if any
+    """
+
+    result = []
+
+    for node in nodes:
+        result.append(node.name)
+        if node.parameter:
+            result.append(node.value)
+
+    return result
+
+
+@lru_cache(maxsize=32)
+def parseCommand(strCommand):
+    """
+    parseCommand parse command line the result is cached so the classes
+    working on the same command share it, the result should not be changed
+
+    Args:
+        strCommand (str): mkvmerge command in bash style
+
+    Returns:
+        MKVCommandAST:
+
+        parsed command
+    """
+    return MKVCommandAST(strCommand)
+
+
+@lru_cache(maxsize=128)
+def parseSource(strSource):
+    """
+    parseSource parse the options and file of one source as found in
+    MKVSourceNode.text
+
+    Args:
+        strSource (str): options followed by '(' file ')'
+
+    Returns:
+        MKVSourceNode:
+
+        source node None if the file is not found
+    """
+
+    nodes = tokenizeCommand(strSource)
+
+    for index, node in enumerate(nodes):
+        if node.name == OPENSOURCE:
+            if index + 1 < len(nodes) and nodes[index + 1].name == CLOSESOURCE:
+                return MKVSourceNode(strSource, nodes[:index], node, nodes[index + 1])
+            break
+
+    return None
+
+
+def _isOption(name):
+    return name.startswith("--") or name in (OPENSOURCE, CLOSESOURCE)
+
+
+def _quoteEnd(strCommand, start, end):
+    """position after the quote closing the parameter end if not closed"""
+
+    position = start
+
+    while match := _reQuoteEnd.search(strCommand, position, end):
+        position = match.end()
+        if match.group() == "'":
+            return position
+
+    return end
+
+
+def _optionNode(strCommand, start, end):
+
+    text = strCommand[start:end]
+
+    if text.startswith("--") or text[:3] in (OPENSOURCE, CLOSESOURCE):
+        nameEnd = end
+        parameterStart = end
+        if match := _reSpace.search(strCommand, start, end):
+            nameEnd = match.start()
+            parameterStart = end - len(strCommand[nameEnd:end].lstrip())
+        return MKVOptionNode(
+            strCommand[start:nameEnd],
+            strCommand[parameterStart:end],
+            start,
+            end,
+            parameterStart,
+        )
+
+    # text before first option i.e. executable
+    return MKVOptionNode(text, "", start, end, end)
+
+
+def test():
+    """Testing parameters with whitespace followed by --"""
+
+    command = (
+        "'/usr/bin/mkvmerge' --ui-language en_US "
+        "--output '/media/Show --uncut/out/ep01.mkv' "
+        "--language 0:und --track-name '0:Commentary --extended' "
+        "'(' '/media/Show --uncut/ep01.wav' ')' "
+        "--language 0:und '(' '/media/It'\\''s --x/ep01.wav' ')' "
+        "--language 0:und '(' '/media/Girls' Last/ep01.wav' ')' "
+        "--title 'Show --uncut' --track-order 0:0,1:0,2:0"
+    )
+
+    cmdAST = MKVCommandAST(command)
+
+    assert cmdAST, "command not parsed"
+    assert cmdAST.executable == "'/usr/bin/mkvmerge'"
+    assert cmdAST.output.value == "/media/Show --uncut/out/ep01.mkv"
+    assert [source.file.value for source in cmdAST.sources] == [
+        "/media/Show --uncut/ep01.wav",
+        "/media/It's --x/ep01.wav",
+        "/media/Girls' Last/ep01.wav",
+    ]
+    assert cmdAST.sources[0].optionsList() == [
+        "--language",
+        "0:und",
+        "--track-name",
+        "0:Commentary --extended",
+    ]
+    assert cmdAST.title.value == "Show --uncut"
+    assert cmdAST.trackOrder.parameter == "0:0,1:0,2:0"
+
+    source = parseSource(cmdAST.sources[1].text)
+
+    assert source.file.value == "/media/It's --x/ep01.wav"
+
+    print("MKVCommandAST Ok.")
+
+
+if __name__ == "__main__":
+    test()
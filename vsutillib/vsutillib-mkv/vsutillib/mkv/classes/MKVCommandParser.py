@@ -33,7 +33,7 @@ Flow:
 4. remove title from command we want to preserve what title is set by file
     - Temp OUT:
 5. convert to bash style easier to parse
-6. start parsing self._parse()
+6. start parsing self._parseSyntax() no filesystem access is done here
     - prepare regular expressions
     - first regEx for the whole command to see if general structure is sound
     Look for:
@@ -52,6 +52,8 @@ Flow:
             - <CHAPTERS> for chapters file if given
             - <ATTACHMENTS> attachments if given
             - <ORDER> for the track order if case of adjustments by file
+    with verifyOnly=True it stops here until resolve() is called
+    resolve() self._resolveFiles()
     - from commandTemplate resolve executable file and save it in self.mkvmerge and
     also set self.mkvpropedit
     - from commandTemplate resolve the output file directory
@@ -90,21 +92,25 @@ import ast
 import logging
 import re
 import shlex
+import threading
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from natsort import natsorted, ns
 
+from vsutillib.files import DirectorySnapshot, getDeviceID
+
 # from vsutillib.media import MediaFileInfo
 
 from ..generateCommandTemplate import generateCommandTemplate
 from ..mkvutils import (
     convertToBashStyle,
-    generateCommand,
+    directoriesStamp,
     getMKVMerge,
     getMKVMergeEmbedded,
-    numberOfTracksInCommand,
     resolveOverwrite,
     restoreEscapeQuote,
     setEncaseQuotes,
@@ -112,6 +118,9 @@ from ..mkvutils import (
     unQuote,
 )
 
+from .MKVCommandAST import parseCommand
+from .MKVCommands import MKVCommandsView, MKVTrackedList
+from .MKVCommandTemplate import compileCommandTemplate
 from .SourceFiles import SourceFile, SourceFiles
 from .MKVAttachments import MKVAttachments
 from .MKVParseKey import MKVParseKey
@@ -131,6 +140,31 @@ class MKVCommandParser:
 
     __log = False
 
+    # parse results by command see _saveParse
+    __parseCache = OrderedDict()
+    __parseCacheLock = threading.Lock()
+    __parseCacheSize = 16
+
+    # attributes saved in the parse cache
+    __parseState = (
+        "chaptersFiles",
+        "cliChaptersFile",
+        "cliOutputFile",
+        "cliTracksOrder",
+        "commandTemplate",
+        "commandTemplates",
+        "dirsByKey",
+        "filesInDirByKey",
+        "mkvmerge",
+        "mkvpropedit",
+        "oAttachments",
+        "originalCommandTemplate",
+        "oSourceFiles",
+        "titles",
+        "tracksOrder",
+        "translations",
+    )
+
     # embedded
     rgMkvmerge = r"^(.*?)\s--.*"
     reMkvMergeEx = re.compile(rgMkvmerge)
@@ -167,9 +201,19 @@ class MKVCommandParser:
         self.__lstAnalysis = None
         self.__totalSourceFiles = None
         self.__readFiles = False
+        self.__resolved = False
+        self.__dMatch = None
+        self.__snapshot = None
         self.__strCommand = None
+        # generated commands None if the command has to be generated
         self.__shellCommands = []
         self.__strCommands = []
+        self.__strCommandsView = MKVCommandsView(
+            lambda index: self._commandByIndex(index)[0], self._totalCommands
+        )
+        self.__shellCommandsView = MKVCommandsView(
+            lambda index: self._commandByIndex(index)[1], self._totalCommands
+        )
         # self.__strOCommands = []
         self.__setTitles = True
         self.__preserveTrackNames = False
@@ -200,11 +244,11 @@ class MKVCommandParser:
         return not self.__errorFound
 
     def __contains__(self, item) -> bool:
-        return item in self.__strCommands
+        return item in self.strCommands
 
     def __getitem__(self, index):
         return (
-            self.__shellCommands[index],
+            self.shellCommands[index],
             self.baseFiles,
             self.oSourceFiles[index],
             self.filesInDirByKey[MKVParseKey.outputFile][index],
@@ -244,6 +288,36 @@ class MKVCommandParser:
 
         return cls.__log
 
+    @classmethod
+    def clearParseCache(cls) -> None:
+        """remove all the parse results saved"""
+
+        with cls.__parseCacheLock:
+            cls.__parseCache.clear()
+
+    @classmethod
+    def classParseCacheSize(cls, setSize: Optional[int] = None) -> int:
+        """
+        get/set the maximum number of parse results kept 0 disables the
+        parse cache
+
+        Args:
+            setSize (int, optional): new size. Defaults to None.
+
+        Returns:
+            int:
+
+            current size
+        """
+
+        if isinstance(setSize, int) and setSize >= 0:
+            with cls.__parseCacheLock:
+                cls.__parseCacheSize = setSize
+                while len(cls.__parseCache) > cls.__parseCacheSize:
+                    cls.__parseCache.popitem(last=False)
+
+        return cls.__parseCacheSize
+
     @property
     def log(self) -> bool:
         """
@@ -308,16 +382,30 @@ class MKVCommandParser:
                     self.__embeddedBashCommand = embeddedBashCommand(
                         strCommand,
                         self.__mkvmergeEmbedded)
-                self._parse()
-                if not self.__errorFound:
-                    self.translations = [None] * self.__totalSourceFiles
+                self._parseSyntax()
                 if not self.__verifyOnly:
-                    self.__readFiles = True
-                    self.readFiles()
-                    self.generateCommands()
+                    self.resolve()
                 else:
                     self.__readFiles = False
 
+    @property
+    def commandTemplates(self):
+        """
+        command template by index, assigning an element marks the command
+        for that index to be generated again
+        """
+        return self.__commandTemplates
+
+    @commandTemplates.setter
+    def commandTemplates(self, value):
+        self.__commandTemplates = MKVTrackedList(value, onChange=self.markDirty)
+        self.markAllDirty()
+
+    @property
+    def resolved(self):
+        """True if resolve was done for the command"""
+        return self.__resolved
+
     @property
     def commandsGenerated(self):
         return self.__readFiles
@@ -338,6 +426,26 @@ class MKVCommandParser:
 
         return []
 
+    @property
+    def devices(self):
+        """
+        devices read and written by the commands
+
+        Returns:
+            frozenset:
+
+            device ids (st_dev) of the source directories in dirsByKey
+            and the output directory
+        """
+
+        dirs = [d for k, d in self.dirsByKey.items() if k != MKVParseKey.outputFile]
+        if isinstance(self.cliOutputFile, Path):
+            dirs.append(self.cliOutputFile.parent)
+
+        return frozenset(
+            device for device in map(getDeviceID, dirs) if device is not None
+        )
+
     @property
     def embeddedBashCommand(self):
         return self.__embeddedBashCommand
@@ -381,11 +489,26 @@ class MKVCommandParser:
 
     @property
     def strCommands(self):
-        return self.__strCommands
+        """commands as strings generated on access"""
+        return self.__strCommandsView
 
     @property
     def shellCommands(self):
-        return self.__shellCommands
+        """commands as argument lists generated on access"""
+        return self.__shellCommandsView
+
+    @property
+    def tracksOrder(self):
+        """
+        track order by index, assigning an element marks the command for
+        that index to be generated again
+        """
+        return self.__tracksOrder
+
+    @tracksOrder.setter
+    def tracksOrder(self, value):
+        self.__tracksOrder = MKVTrackedList(value, onChange=self.markDirty)
+        self.markAllDirty()
 
     @property
     def useEmbedded(self):
@@ -396,9 +519,10 @@ class MKVCommandParser:
         if isinstance(value, bool):
             self.__useEmbedded = value
 
-    def _parse(self):
+    def _parseSyntax(self):
         """
-        _parse parse command line
+        _parseSyntax parse command line and generate the template no
+        filesystem access is done
         """
 
         strCommand = self.__bashCommand
@@ -407,28 +531,23 @@ class MKVCommandParser:
 
         self.__lstAnalysis = []
 
-        rg = r"^(.*?)\s--.*?--output.(.*?)\s--.*?\s'\('\s(.*?)\s'\)'.*?--track-order\s(.*)"
-        rgOneTrack = r"^(.*?)\s--.*?--output.(.*?)\s--.*?\s'\('\s(.*?)\s'\)'.*?"
-        reCommandEx = re.compile(rg)
-        reCommandOneTrackEx = re.compile(rgOneTrack)
+        cmdAST = parseCommand(strCommand)
 
         self.__errorFound = False
 
         # To be sound and look Ok
-        # must match the 4 expected groups in the
+        # must have the 4 expected elements in the
         # command line
         # 1: mkvmerge name with fullpath
         # 2: output file
         # 3: at list one source
         # 4: track order for files with more than one track
-        if (matchCommand := reCommandEx.match(strCommand)) and (
-            len(matchCommand.groups()) == 4  # pylint: disable=used-before-assignment
-        ):
-            self.cliTracksOrder = matchCommand.group(4)
+        if cmdAST and (cmdAST.trackOrder is not None):
+            self.cliTracksOrder = cmdAST.trackOrder.parameter
             self.__lstAnalysis.append("chk: Command seems ok.")
             try:
                 d = ast.literal_eval("{" + self.cliTracksOrder + "}")
-                trackTotal = numberOfTracksInCommand(strCommand)
+                trackTotal = cmdAST.count("--language")
                 s = self.cliTracksOrder.split(",")
                 if trackTotal == len(s):
                     for e in s:
@@ -449,22 +568,49 @@ class MKVCommandParser:
             except SyntaxError:
                 self.__lstAnalysis.append("err: Command track order bad format.")
                 self.__errorFound = True
-        elif (matchCommand := reCommandOneTrackEx.match(strCommand)) and (
-            len(matchCommand.groups()) == 3  # pylint: disable=used-before-assignment
-        ):
+        elif cmdAST:
             self.cliTracksOrder = None
             self.__lstAnalysis.append("chk: Command seems ok.")
         else:
             self.__lstAnalysis.append("err: Command bad format.")
             self.__errorFound = True
 
-        self.originalCommandTemplate, dMatch = generateCommandTemplate(
-            strCommand, attachments=self.oAttachments, setTitle=self.__setTitles
+        self.originalCommandTemplate, self.__dMatch = generateCommandTemplate(
+            strCommand, setTitle=self.__setTitles
         )
+        self.commandTemplate = str(self.originalCommandTemplate)
 
         # if matchUILanguage := reLanguageEx.search(strCommand):
         #    self.language = matchUILanguage.group(1)
 
+    def _snapshot(self):
+        """directory listings of the current resolve a new one if none"""
+
+        if self.__snapshot is None:
+            return DirectorySnapshot()
+
+        return self.__snapshot
+
+    def _resolveFiles(self, maxWorkers=None):
+        """
+        _resolveFiles check the files in the command and read the source
+        directories
+        """
+
+        strCommand = self.__bashCommand
+        if self.useEmbedded:
+            strCommand = self.__embeddedBashCommand
+
+        dMatch = self.__dMatch
+        snapshot = self._snapshot()
+
+        # the listings are shared only while resolving
+        self.oAttachments.directorySnapshot = snapshot
+        try:
+            self.oAttachments.command = strCommand
+        finally:
+            self.oAttachments.directorySnapshot = None
+
         if dMatch[MKVParseKey.mkvmergeMatch]:
             f = stripEncaseQuotes(dMatch[MKVParseKey.mkvmergeMatch])
             p = Path(f)
@@ -526,8 +672,12 @@ class MKVCommandParser:
         # From here IO starts
         #
         if dMatch[MKVParseKey.baseFilesMatch]:
-            for index, match in enumerate(dMatch[MKVParseKey.baseFilesMatch]):
-                oFile = SourceFile(match, index)
+            oFiles = _readSourceFiles(
+                dMatch[MKVParseKey.baseFilesMatch], maxWorkers, snapshot
+            )
+            for index, (match, oFile) in enumerate(
+                zip(dMatch[MKVParseKey.baseFilesMatch], oFiles)
+            ):
                 if oFile:
                     self.oSourceFiles.append(oFile)
                     if self.__totalSourceFiles is None:
@@ -574,12 +724,10 @@ class MKVCommandParser:
             self.__errorFound = True
             self.__lstAnalysis.append("err: No source file found in command.")
 
-        self.commandTemplate = str(self.originalCommandTemplate)
-
         # if self.preserveTrackNames:
         #    preserveNames(self)
 
-        self.commandTemplates = [self.commandTemplate] * len(self)
+        self.commandTemplates = [self.commandTemplate] * (self.__totalSourceFiles or 0)
 
         #
         # Optional
@@ -589,7 +737,7 @@ class MKVCommandParser:
             f = unQuote(dMatch[MKVParseKey.chaptersMatch])
             p = Path(f)
             try:
-                test = p.is_file()
+                test = snapshot.isFile(p)
             except OSError:
                 self.__lstAnalysis.append(
                     "err: Chapters file incorrect syntax - {}.".format(str(p))
@@ -607,6 +755,135 @@ class MKVCommandParser:
                     )
                     self.__errorFound = True
 
+    def resolve(self, maxWorkers: Optional[int] = None) -> bool:
+        """
+        resolve second phase of the parse. Check the files in the command,
+        read the source directories and the media information and set up
+        the commands. When the command is set with verifyOnly=True only the
+        syntax is checked and no filesystem access is done until resolve
+        is called.
+
+        Args:
+            maxWorkers (int, optional): threads used to read the source
+                directories. Defaults to None ThreadPoolExecutor default
+                min(32, os.cpu_count() + 4).
+
+        Returns:
+            bool:
+
+            True if no errors were found False otherwise
+        """
+
+        if (self.__bashCommand is None) or self.__resolved:
+            return bool(self)
+
+        self.__resolved = True
+
+        if self._restoreParse():
+            # same command and directories as a previous parse
+            self.__readFiles = True
+            self.generateCommands()
+            return bool(self)
+
+        # every directory is listed once for the sources, attachments and
+        # chapters
+        self.__snapshot = DirectorySnapshot()
+
+        try:
+            self._resolveFiles(maxWorkers)
+            if not self.__errorFound:
+                self.translations = [None] * self.__totalSourceFiles
+            self.__readFiles = True
+            self.readFiles()
+        finally:
+            self.__snapshot = None
+
+        self._saveParse()
+        self.generateCommands()
+
+        return bool(self)
+
+    def _parseKey(self):
+        """key for the parse cache"""
+
+        strCommand = self.__bashCommand
+        if self.useEmbedded:
+            strCommand = self.__embeddedBashCommand
+
+        return (parseCommand(strCommand).normalizedCommand, self.__setTitles)
+
+    def _parseDirectories(self):
+        """directories read by the parse"""
+
+        directories = {d for d in self.dirsByKey.values() if d}
+
+        if self.cliOutputFile is not None:
+            # resolveOverwrite checks the files in the output directory
+            directories.add(self.cliOutputFile.parent)
+        if self.cliChaptersFile is not None:
+            directories.add(self.cliChaptersFile.parent)
+        for d in self.oAttachments.cmdLineAttachmentsDirs:
+            directories.update((d, d.parent))
+        directories.update(self.oAttachments.attachmentsDirs)
+
+        return directories
+
+    def _saveParse(self):
+        """
+        _saveParse save the parse results for the command. They are used
+        while the command and the modification time of the directories
+        read stay the same
+        """
+
+        if self.__errorFound or not self.__parseCacheSize:
+            return
+
+        state = {
+            attribute: _copyState(getattr(self, attribute))
+            for attribute in self.__parseState
+        }
+        state["analysis"] = list(self.__lstAnalysis)
+        state["totalSourceFiles"] = self.__totalSourceFiles
+        stamp = directoriesStamp(self._parseDirectories())
+
+        with self.__parseCacheLock:
+            self.__parseCache[self._parseKey()] = (stamp, state)
+            while len(self.__parseCache) > self.__parseCacheSize:
+                self.__parseCache.popitem(last=False)
+
+    def _restoreParse(self):
+        """
+        _restoreParse set the parse results saved for the command if the
+        directories didn't change
+
+        Returns:
+            bool:
+
+            True if the results were restored False otherwise
+        """
+
+        key = self._parseKey()
+
+        with self.__parseCacheLock:
+            if (entry := self.__parseCache.get(key, None)) is None:
+                return False
+            self.__parseCache.move_to_end(key)
+
+        stamp, state = entry
+
+        if directoriesStamp(d for d, _ in stamp) != stamp:
+            with self.__parseCacheLock:
+                self.__parseCache.pop(key, None)
+            return False
+
+        for attribute in self.__parseState:
+            setattr(self, attribute, _copyState(state[attribute]))
+        self.__lstAnalysis = list(state["analysis"])
+        self.__totalSourceFiles = state["totalSourceFiles"]
+        self.__errorFound = False
+
+        return True
+
     def _readDirs(self):
         """
         _readDirs read files in directories
@@ -626,17 +903,16 @@ class MKVCommandParser:
                     )
 
         # get title from first source file and use that if defined
+        # the files are probed when the title is used
         if self.__setTitles:
-            # ADD to library
-            for mediaInfo in self.oSourceFiles.sourceFiles[0].filesMediaInfo:
-                if mediaInfo:
-                    self.titles.append(mediaInfo.title)
-                else:
-                    self.titles.append("")
+            self.titles = self.oSourceFiles.sourceFiles[0].filesMediaInfo.view(
+                "title"
+            )
 
         if self.cliChaptersFile:
+            snapshot = self._snapshot()
             d = self.cliChaptersFile.parent
-            fid = [x for x in d.glob("*" + self.cliChaptersFile.suffix) if x.is_file()]
+            fid = snapshot.files(d, "*" + self.cliChaptersFile.suffix)
             fid = natsorted(fid, alg=ns.PATH)
             self.chaptersFiles.extend(fid)
 
@@ -653,7 +929,7 @@ class MKVCommandParser:
             self.filesInDirByKey[
                 MKVParseKey.attachmentFiles
             ] = self.oAttachments.attachmentsStr
-        if self.__setTitles:
+        if self.__setTitles and (MKVParseKey.title in self.commandTemplate):
             self.filesInDirByKey[MKVParseKey.title] = self.titles
         if self.chaptersFiles:
             self.filesInDirByKey[MKVParseKey.chaptersFile] = self.chaptersFiles
@@ -684,20 +960,44 @@ class MKVCommandParser:
 
     def generateCommands(self):
         """
-        generateCommands generate and store all command lines needed
+        generateCommands set up storage for all command lines needed the
+        commands are generated when accessed through strCommands or
+        shellCommands
         """
 
         if not self.__errorFound:
             totalCommands = len(self.filesInDirByKey[MKVParseKey.outputFile])
-            self.__strCommands = []
-            self.__shellCommands = []
+            self.__strCommands = [None] * totalCommands
+            self.__shellCommands = [None] * totalCommands
+
+    def markDirty(self, index):
+        """
+        markDirty command at index will be generated again on next access
+
+        Args:
+            index (int): command index
+        """
+
+        if 0 <= index < len(self.__strCommands):
+            self.__strCommands[index] = None
+            self.__shellCommands[index] = None
+
+    def markAllDirty(self):
+        """markAllDirty all commands will be generated again on access"""
 
-            for i in range(totalCommands):
+        self.__strCommands = [None] * len(self.__strCommands)
+        self.__shellCommands = [None] * len(self.__shellCommands)
 
-                self.__strCommands.append(None)
-                self.__shellCommands.append(None)
+    def _commandByIndex(self, index):
+        """command for index generate it if needed"""
 
-                _, _ = self.generateCommandByIndex(i, update=True)
+        if self.__strCommands[index] is None:
+            self.generateCommandByIndex(index, update=True)
+
+        return self.__strCommands[index], self.__shellCommands[index]
+
+    def _totalCommands(self):
+        return len(self.__strCommands)
 
     def generateCommandByIndex(
         self, index, update=False, template=None, tracksOrder=None
@@ -719,10 +1019,12 @@ class MKVCommandParser:
         else:
             cmdTemplate = self.commandTemplates[index]
         keyDictionary = self.createKeysDictionary(index, tracksOrder=tracksOrder)
-        strCommand = generateCommand(cmdTemplate, keyDictionary)
-        shellCommand = shlex.split(
-            strCommand
-        )  # save command as shlex.split to submit to Pipe
+        # argv slots are filled directly no shlex.split of the full command
+        compiledTemplate = compileCommandTemplate(
+            str(cmdTemplate), tuple(keyDictionary)
+        )
+        strCommand = compiledTemplate.render(keyDictionary)
+        shellCommand = compiledTemplate.renderArgv(keyDictionary)
 
         if update:
             self.__strCommands[index] = strCommand
@@ -738,9 +1040,18 @@ class MKVCommandParser:
     def renameOutputFiles(self, newNames):
 
         if len(newNames) == self.__totalSourceFiles:
+            oldNames = self.filesInDirByKey.get(MKVParseKey.outputFile, None)
             self.newNames = list(newNames)
             self.filesInDirByKey[MKVParseKey.outputFile] = self.newNames
-            self.generateCommands()
+            if oldNames is None or len(self.__strCommands) != len(newNames):
+                self.generateCommands()
+            else:
+                # only the commands with a new name are generated again
+                for index, (oldName, newName) in enumerate(
+                    zip(oldNames, self.newNames)
+                ):
+                    if oldName != newName:
+                        self.markDirty(index)
 
 def embeddedBashCommand(strCommand: str, mkvmergeEmbedded) -> str:
 
@@ -757,6 +1068,32 @@ def embeddedBashCommand(strCommand: str, mkvmergeEmbedded) -> str:
     return strEmbeddedCommand
 
 
+def _readSourceFiles(matchStrings, maxWorkers=None, snapshot=None):
+    """SourceFile for every source in command using a thread pool"""
+
+    def sourceFile(argument):
+        return SourceFile.get(argument[1], argument[0], snapshot=snapshot)
+
+    arguments = list(enumerate(matchStrings))
+
+    if len(arguments) < 2 or maxWorkers == 1:
+        return [sourceFile(argument) for argument in arguments]
+
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        return list(executor.map(sourceFile, arguments))
+
+
+def _copyState(value):
+    """copy of the containers saved in the parse cache"""
+
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+
+    return value
+
+
 def preserveNames(self):
     """
     preserveNames alter template if track names have to be preserved
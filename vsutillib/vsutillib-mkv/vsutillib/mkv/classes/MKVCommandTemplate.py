@@ -0,0 +1,200 @@
+"""
+MKVCommandTemplate
+
+mkvmerge command template that can render commands as a string and as
+an argument list without running shlex.split on every command
+"""
+
+# MCT0001
+
+import shlex
+
+from functools import lru_cache
+
+from vsutillib.misc import compileTemplate
+
+_SHELLCHARS = frozenset(" \t\n\r'\"\\")
+
+
+class MKVCommandTemplate(str):
+    """
+    Command template string with the keys of MKVParseKey and <SOURCEN>.
+    Being a str it can be used as any template string.
+
+    .. code:: Python
+
+        template = MKVCommandTemplate(cmdTemplate)
+
+        strCommand = template.render(keyDictionary)
+        shellCommand = template.renderArgv(keyDictionary)
+    """
+
+    __slots__ = ()
+
+    def compile(self, keys):
+        """
+        compile get the compiled template for the keys
+
+        Args:
+            keys (iterable): keys used in the template
+
+        Returns:
+            CompiledCommandTemplate:
+
+            compiled template
+        """
+        return compileCommandTemplate(str(self), tuple(keys))
+
+    def render(self, keyDictionary):
+        """
+        render command as string
+
+        Args:
+            keyDictionary (dict): value for every key the values are used
+                as in the command line quoted if needed
+
+        Returns:
+            str:
+
+            command
+        """
+        return self.compile(keyDictionary.keys()).render(keyDictionary)
+
+    def renderArgv(self, keyDictionary):
+        """
+        render command as argument list same as shlex.split on the
+        command string
+
+        Args:
+            keyDictionary (dict): value for every key
+
+        Returns:
+            list:
+
+            command arguments
+        """
+        return self.compile(keyDictionary.keys()).renderArgv(keyDictionary)
+
+
+class CompiledCommandTemplate:
+    """
+    Template split in literal and key segments once. The literal parts
+    are also split in arguments so a command as argument list is built
+    filling the slots of the keys.
+
+    If a key is not a complete argument in the template, i.e. it is
+    inside quotes, renderArgv uses shlex.split on the rendered string.
+
+    Args:
+        template (str): command template
+        keys (tuple): keys to look for in the template
+    """
+
+    __slots__ = ("__xLateTemplate", "__argv")
+
+    def __init__(self, template, keys):
+
+        self.__xLateTemplate = compileTemplate(template, keys)
+        self.__argv = _argvSlots(self.__xLateTemplate.segments)
+
+    def __str__(self):
+        return self.__xLateTemplate.template
+
+    @property
+    def argvSlots(self):
+        """
+        arguments of the template
+
+        Returns:
+            list:
+
+            literal arguments as str and keys as tuple with the key. None if
+            the template can not be split by arguments.
+        """
+        return self.__argv
+
+    def render(self, keyDictionary):
+        """render command as string"""
+        return self.__xLateTemplate.render(keyDictionary)
+
+    def renderArgv(self, keyDictionary):
+        """render command as argument list"""
+
+        if self.__argv is None:
+            return shlex.split(self.render(keyDictionary))
+
+        argv = []
+
+        for slot in self.__argv:
+            if isinstance(slot, tuple):
+                argv.extend(_splitValue(keyDictionary[slot[0]]))
+            else:
+                argv.append(slot)
+
+        return argv
+
+
+@lru_cache(maxsize=256)
+def compileCommandTemplate(template, keys):
+    """
+    compileCommandTemplate get CompiledCommandTemplate for template and
+    keys the result is cached
+
+    Args:
+        template (str): command template
+        keys (tuple): keys to look for in the template
+
+    Returns:
+        CompiledCommandTemplate:
+
+        compiled template
+    """
+    return CompiledCommandTemplate(template, keys)
+
+
+def _argvSlots(segments):
+    """
+    split the literal segments in arguments the keys must be separated by
+    spaces from the rest of the command
+    """
+
+    argv = []
+    last = len(segments) - 1
+
+    for index, segment in enumerate(segments):
+        if index % 2:
+            before = segments[index - 1]
+            after = segments[index + 1] if index < last else ""
+            if (before and not before[-1].isspace()) or (
+                after and not after[0].isspace()
+            ):
+                return None
+            argv.append((segment,))
+        else:
+            try:
+                argv.extend(shlex.split(segment))
+            except ValueError:
+                # key inside quotes
+                return None
+
+    return argv
+
+
+def _splitValue(value):
+    """shlex.split for value avoiding it for the common cases"""
+
+    value = str(value)
+
+    if not _SHELLCHARS.intersection(value):
+        return [value] if value else []
+
+    if (
+        len(value) > 1
+        and value[0] == "'"
+        and value[-1] == "'"
+        and "'" not in value[1:-1]
+    ):
+        # shlex.quote result
+        return [value[1:-1]]
+
+    return shlex.split(value)
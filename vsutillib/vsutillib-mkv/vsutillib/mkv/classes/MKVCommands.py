@@ -0,0 +1,80 @@
+"""
+Support classes for the commands generated by MKVCommandParser
+"""
+
+# MCS0001
+
+from collections.abc import Sequence
+
+
+class MKVTrackedList(list):
+    """
+    List that reports the indexes changed by item assignment. Used for
+    the per command lists of MKVCommandParser so only the commands that
+    change are generated again.
+
+    Args:
+        iterable (iterable): initial elements
+        onChange (function): called with the index of every element
+            assigned
+    """
+
+    def __init__(self, iterable=(), onChange=None):
+        super().__init__(iterable)
+
+        self.__onChange = onChange
+
+    def __setitem__(self, index, value):
+
+        super().__setitem__(index, value)
+
+        if self.__onChange is not None:
+            if isinstance(index, slice):
+                for i in range(*index.indices(len(self))):
+                    self.__onChange(i)
+            else:
+                self.__onChange(index % len(self))
+
+
+class MKVCommandsView(Sequence):
+    """
+    Read only sequence of the commands of a MKVCommandParser. A command
+    is generated when it is accessed and it is kept until something it
+    depends on changes.
+
+    Args:
+        getCommand (function): called with the index returns the command
+        length (function): called with no arguments returns number of
+            commands
+    """
+
+    def __init__(self, getCommand, length):
+
+        self.__getCommand = getCommand
+        self.__length = length
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("command index out of range")
+
+        return self.__getCommand(index)
+
+    def __len__(self):
+        return self.__length()
+
+    def __eq__(self, other):
+
+        if isinstance(other, (list, tuple, MKVCommandsView)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
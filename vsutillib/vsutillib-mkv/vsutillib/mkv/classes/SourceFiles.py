@@ -3,32 +3,59 @@
 """
 
 import re
+import threading
 
+from collections import OrderedDict
 from pathlib import Path
 
 from natsort import natsorted, ns
 
-from vsutillib.media import MediaFileInfo
+from vsutillib.files import DirectorySnapshot
+from vsutillib.media import MediaFileInfo, MediaFileInfoList
 
-from ..mkvutils import unQuote
+from ..mkvutils import directoriesStamp, unQuote
+from .MKVCommandAST import parseSource
 from .TrackOptions import TrackOptions
 
 
 class SourceFile:
     """
     Tracks and file names
+
+    filesMediaInfo is a MediaFileInfoList in the same order as filesInDir
+    a file is probed the first time it is accessed. With fullInfo all
+    the files in the directory are read using maxWorkers threads, None
+    for the ThreadPoolExecutor default min(32, os.cpu_count() + 4).
+
+    SourceFile.get keeps the objects created and returns the same one
+    while the source directory doesn't change. The directories are read
+    with snapshot a vsutillib.files.DirectorySnapshot that can be shared
+    with others working on the same command.
     """
 
-    def __init__(self, fullMatchString=None, fileOrder=None, fullInfo=False):
+    __registry = OrderedDict()
+    __registryLock = threading.Lock()
+    __registrySize = 64
+
+    def __init__(
+        self,
+        fullMatchString=None,
+        fileOrder=None,
+        fullInfo=False,
+        maxWorkers=None,
+        snapshot=None,
+    ):
 
         self.__fullMatchString = None
+        self.__snapshot = snapshot
         self.__errorFound = False
         self.__fileOrder = None
         self.__fullInfo = False
+        self.__maxWorkers = maxWorkers
 
         self.options = None
         self.filesInDir = []
-        self.filesMediaInfo = []
+        self.filesMediaInfo = MediaFileInfoList()
         self.fileName = None
         self.mediaFileInfo = None
         self.fileMatchString = None
@@ -63,6 +90,61 @@ class SourceFile:
     def __bool__(self):
         return not self.__errorFound
 
+    @classmethod
+    def get(
+        cls, fullMatchString, fileOrder, fullInfo=False, maxWorkers=None, snapshot=None
+    ):
+        """
+        get SourceFile from the in memory registry. The source is parsed
+        and its directory read only the first time or if the modification
+        time of the directory changed.
+
+        Args:
+            fullMatchString (str): options and file as in command line
+            fileOrder (int): source index in command line
+            fullInfo (bool, optional): read MediaFileInfo for all files.
+                Defaults to False.
+            maxWorkers (int, optional): threads used to probe the files.
+                Defaults to None.
+            snapshot (DirectorySnapshot, optional): directory listings to
+                use. Defaults to None.
+
+        Returns:
+            SourceFile:
+
+            source file for the match string
+        """
+
+        key = (fullMatchString, fileOrder, fullInfo, maxWorkers)
+        stamp = None
+
+        if source := parseSource(fullMatchString):
+            stamp = directoriesStamp([Path(source.file.value).parent])
+
+        with cls.__registryLock:
+            if (entry := cls.__registry.get(key, None)) is not None:
+                if entry[0] == stamp:
+                    cls.__registry.move_to_end(key)
+                    return entry[1]
+                del cls.__registry[key]
+
+        sourceFile = cls(fullMatchString, fileOrder, fullInfo, maxWorkers, snapshot)
+
+        if sourceFile and (sourceFile.fileName is not None):
+            with cls.__registryLock:
+                cls.__registry[key] = (stamp, sourceFile)
+                while len(cls.__registry) > cls.__registrySize:
+                    cls.__registry.popitem(last=False)
+
+        return sourceFile
+
+    @classmethod
+    def clearRegistry(cls):
+        """remove all the sources in the registry used by get"""
+
+        with cls.__registryLock:
+            cls.__registry.clear()
+
     @property
     def baseFile(self):
         return self.fileName
@@ -84,6 +166,15 @@ class SourceFile:
         if isinstance(value, bool):
             self.__fullInfo = value
 
+    @property
+    def maxWorkers(self):
+        return self.__maxWorkers
+
+    @maxWorkers.setter
+    def maxWorkers(self, value):
+        if value is None or (isinstance(value, int) and value > 0):
+            self.__maxWorkers = value
+
     @property
     def fullMatchString(self):
         return self.__fullMatchString
@@ -96,9 +187,9 @@ class SourceFile:
             self._parse()
 
     def fullMatchStringWithKey(self):
-        subEx = re.compile(r"(.*?) ('\(' (.*?) '\)')")
-        keySub = f"\\1 <SOURCE{str(self.fileOrder)}>"
-        strTmp = subEx.sub(keySub, self.fullMatchString)
+        strTmp = self.fullMatchString
+        if source := parseSource(self.fullMatchString):
+            strTmp = f"{source.optionsText} <SOURCE{str(self.fileOrder)}>"
 
         return strTmp
 
@@ -125,47 +216,56 @@ class SourceFile:
 
     def _parse(self):
 
-        reInputEx = re.compile(r"(.*?)\s('\('\s(.*?)\s'\)')")
         self.fileName = None
 
         if self.__fullMatchString:
-            if match := reInputEx.search(self.__fullMatchString):
-                self.options = match.group(1)  # Options
-                self.trackOptions.options = self.options
+            if source := parseSource(self.__fullMatchString):
+                self.options = source.optionsText  # Options
+                self.trackOptions.options = (self.options, source.optionsList())
                 self.trackOptions.fileOrder = self.fileOrder
 
-                f = unQuote(match.group(3))  # Source file name
+                f = source.file.value  # Source file name
                 p = Path(f)
 
+                snapshot = self.__snapshot
+                if snapshot is None:
+                    snapshot = DirectorySnapshot()
+
                 try:
-                    test = p.is_file()
+                    test = snapshot.isFile(p)
                 except OSError:
                     self.__errorFound = True
                 else:
                     if test:
                         self.fileName = p
-                        self.mediaFileInfo = MediaFileInfo(p)
-                        self.fileMatchString = match.group(2)  # bad
+                        self.mediaFileInfo = MediaFileInfo.get(p)
+                        self.fileMatchString = source.fileText
                         self.trackOptions.mediaInfo = self.mediaFileInfo
                         d = p.parent
-                        fid = [x for x in d.glob("*" + p.suffix) if x.is_file()]
+                        fid = snapshot.files(d, "*" + p.suffix)
                         fid = natsorted(fid, alg=ns.PATH)
                         self.filesInDir.extend(fid)
-                        # Slow proccess
-                        for f in self.filesInDir:
-                            if f == p:
-                                self.filesMediaInfo.append(self.mediaFileInfo)
-                            else:
-                                if self.fullInfo:
-                                    mi = MediaFileInfo(f)
-                                else:
-                                    mi = None
-                                self.filesMediaInfo.append(mi)
+                        self._readFilesMediaInfo()
                     else:
                         self.__errorFound = True
             else:
                 self.__errorFound = True
 
+    def _readFilesMediaInfo(self, readAll=False):
+        """
+        setup filesMediaInfo the files are probed on demand unless
+        fullInfo or readAll are True
+        """
+
+        self.filesMediaInfo = MediaFileInfoList(
+            self.filesInDir, maxWorkers=self.maxWorkers
+        )
+        if self.fileName in self.filesInDir:
+            index = self.filesInDir.index(self.fileName)
+            self.filesMediaInfo[index] = self.mediaFileInfo
+        if self.fullInfo or readAll:
+            self.filesMediaInfo.readAll()
+
     def _parseOld(self):
 
         reOptionsEx = re.compile(
@@ -219,13 +319,7 @@ class SourceFile:
                         fid = [x for x in d.glob("*" + p.suffix) if x.is_file()]
                         fid = natsorted(fid, alg=ns.PATH)
                         self.filesInDir.extend(fid)
-                        # Slow proccess
-                        for f in self.filesInDir:
-                            if f == p:
-                                self.filesMediaInfo.append(self.mediaFileInfo)
-                            else:
-                                mi = MediaFileInfo(f)
-                                self.filesMediaInfo.append(mi)
+                        self._readFilesMediaInfo(readAll=True)
                     else:
                         self.__errorFound = True
             else:
@@ -3,10 +3,10 @@ Track Options - get the tracks options as set in cli
 """
 
 import re
-import shlex
 
 from ..mkvutils import quoteString
 from .MergeOptions import MergeOptions
+from .MKVCommandAST import optionsList, tokenizeCommand
 
 
 class TrackOptions:
@@ -77,11 +77,19 @@ class TrackOptions:
 
     @options.setter
     def options(self, value):
+        """
+        options as str or as tuple with the str and the options already
+        split by MKVSourceNode.optionsList()
+        """
         if isinstance(value, str):
             self._initVars()
             self.__options = value
-            self._shlexSeparation()
+            self._optionsSeparation()
             # self._parse()
+        elif isinstance(value, tuple):
+            self._initVars()
+            self.__options = value[0]
+            self._optionsSeparation(value[1])
 
     @property
     def trackNames(self):
@@ -289,9 +297,10 @@ class TrackOptions:
 
         return strTmp
 
-    def _shlexSeparation(self):
+    def _optionsSeparation(self, shellOptions=None):
 
-        shellOptions = shlex.split(self.__options)
+        if shellOptions is None:
+            shellOptions = optionsList(tokenizeCommand(self.__options))
         mOptions = MergeOptions()
 
         trackOptions = []
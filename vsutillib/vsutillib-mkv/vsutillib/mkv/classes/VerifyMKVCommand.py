@@ -11,12 +11,12 @@ MKVCommand will find the real errors
 
 import ast
 import logging
-import re
 
 from pathlib import Path
 from typing import Optional
 
 from ..mkvutils import stripEncaseQuotes
+from .MKVCommandAST import parseCommand
 
 MODULELOG = logging.getLogger(__name__)
 MODULELOG.addHandler(logging.NullHandler())
@@ -110,35 +110,21 @@ class VerifyMKVCommand:
 
         self.__lstAnalysis = []
 
-        rg = r"^(.*?)\s\-\-.*?\-\-output.(.*?)\s\-\-.*?\s'\('\s(.*?)\s'\)'.*?\-\-track-order\s(.*)"
-        rgOneTrack = r"^(.*?)\s--.*?--output.(.*?)\s--.*?\s'\('\s(.*?)\s'\)'.*?"
-
-        regCommandEx = re.compile(rg)
-        reCommandOneTrackEx = re.compile(rgOneTrack)
-        reExecutableEx = re.compile(r"^(.*?)\s\-\-")
-        reOutputFileEx = re.compile(r".*?\-\-output\s(.*?)\s\-\-")
-        reSourcesEx = re.compile(r"'\('\s(.*?)\s'\)'")
-        reChaptersFileEx = re.compile(r".*?\-\-chapters\s(.*?)\s\-\-")
-        reAttachmentsEx = re.compile(r"\-\-attach-file.(.*?)\s\-\-")
+        cmdAST = parseCommand(strCommand)
 
         bOk = True
         trackOrder = None
 
-        # To look Ok must match the 5 group in the command line that
+        # To look Ok must have the elements in the command line that
         # are expected
         # 1: mkvmerge name with fullpath
         # 2: output file
         # 3: at list one source
-        # 4: track order
-        if ((matchCommand := regCommandEx.match(strCommand))
-                and (len(matchCommand.groups()) == 4)):
-            self.__lstAnalysis.append("chk: Command seems ok.")
-            trackOrder = matchCommand.group(4)
-        elif (matchCommand := reCommandOneTrackEx.match(strCommand)) and (
-            len(matchCommand.groups()) == 3
-        ):
-            trackOrder = None
+        # 4: track order optional for files with one track
+        if cmdAST:
             self.__lstAnalysis.append("chk: Command seems ok.")
+            if cmdAST.trackOrder is not None:
+                trackOrder = cmdAST.trackOrder.parameter
         else:
             self.__lstAnalysis.append("err: Command bad format.")
             bOk = False
@@ -146,7 +132,7 @@ class VerifyMKVCommand:
         if trackOrder is not None:
             try:
                 d = ast.literal_eval("{" + trackOrder + "}")
-                trackTotal = _numberOfTracksInCommand(strCommand)
+                trackTotal = cmdAST.count("--language")
 
                 s = trackOrder.split(",")
                 if trackTotal == len(s):
@@ -166,9 +152,9 @@ class VerifyMKVCommand:
                     "err: Command track order bad format.")
                 bOk = False
 
-        if matchExecutable := reExecutableEx.match(strCommand):
+        if cmdAST.executable is not None:
             # Executable tests
-            f = stripEncaseQuotes(matchExecutable.group(1))
+            f = stripEncaseQuotes(cmdAST.executable)
             p = Path(f)
             try:
                 test = p.is_file()
@@ -188,9 +174,8 @@ class VerifyMKVCommand:
             self.__lstAnalysis.append("err: mkvmerge not found.")
             bOk = False
 
-        if matchOutputFile := reOutputFileEx.match(strCommand):
-            f = stripEncaseQuotes(matchOutputFile.group(1))
-            f = f.replace(r"'\''", "'")
+        if cmdAST.output is not None:
+            f = cmdAST.output.value
             p = Path(f)
             self.__outputFile = None
 
@@ -218,11 +203,11 @@ class VerifyMKVCommand:
             self.__lstAnalysis.append("err: Destination directory not found.")
             bOk = False
 
-        if matchSources := reSourcesEx.finditer(strCommand):
+        if cmdAST.sources:
             n = 1
 
-            for match in matchSources:
-                f = _unQuote(match.group(1))
+            for source in cmdAST.sources:
+                f = source.file.value
                 p = Path(f)
 
                 try:
@@ -263,17 +248,13 @@ class VerifyMKVCommand:
 
                 n += 1
 
-            if n == 1:
-                # if the command is so bad matchSources for loop won't run
-                self.__lstAnalysis.append("err: Source directory not found.")
-                bOk = False
         else:
             self.__lstAnalysis.append("err: Source directory not found.")
             bOk = False
 
         # Check for optional chapters file
-        if matchChaptersFile := reChaptersFileEx.match(strCommand):
-            f = _unQuote(matchChaptersFile.group(1))
+        if cmdAST.chapters is not None:
+            f = cmdAST.chapters.value
             p = Path(f)
             self.__chaptersFile = None
 
@@ -296,11 +277,11 @@ class VerifyMKVCommand:
                     )
                     self.__chaptersFile = p
 
-        if matchAttachments := reAttachmentsEx.finditer(strCommand):
+        if attachFiles := cmdAST.findAll("--attach-file"):
             # This check if for optional attachments files
             n = 1
-            for match in matchAttachments:
-                f = _unQuote(match.group(1))
+            for node in attachFiles:
+                f = node.value
                 p = Path(f)
                 try:
                     test = p.is_file()
@@ -449,40 +430,3 @@ def _convertToBashStyle(strCommand):
 
     return strTmp
 
-
-def _numberOfTracksInCommand(strCmd):
-    """
-    Every track have a --language option count
-    them to know the number of tracks
-
-    Args:
-        strCmd(str): command line
-
-    Returns:
-        int:
-
-        total number of tracks
-    """
-
-    reLanguageEx = re.compile(r"\-\-language (.*?)\s")
-    matchLanguage = reLanguageEx.findall(strCmd)
-
-    return len(matchLanguage)
-
-
-def _unQuote(fileName):
-    """
-    Remove start end quotes and escape ones
-    Args:
-        fileName (str): file name
-
-    Returns:
-        str:
-
-        file name without quotes if found
-    """
-
-    f = stripEncaseQuotes(fileName)
-    f = f.replace(r"'\''", "'")
-
-    return f
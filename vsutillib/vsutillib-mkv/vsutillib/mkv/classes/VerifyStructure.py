@@ -30,6 +30,18 @@ class VerifyStructure:
         else:
             raise ValueError('')
 
+    All the commands of a MKVCommandParser can be verified in one pass
+    before running any of them.
+
+    .. code:: Python
+
+        verify = VerifyStructure()
+        results = verify.verifyBatch(oCommand)
+
+        for index, result in enumerate(results):
+            if not result:
+                print(index, result.unmatched)
+
     Args:
         lstBaseFile (:obj:`list`, optional): list with the base files
             as found in command
@@ -47,6 +59,7 @@ class VerifyStructure:
         self.__status = None
         self.__matchedTracks = []
         self.__unmatchedTracks = []
+        self.__results = []
 
         self.log = log
 
@@ -138,6 +151,18 @@ class VerifyStructure:
     def unmatched(self):
         return self.__unmatchedTracks
 
+    @property
+    def results(self):
+        """
+        results of the last verifyBatch
+
+        Returns:
+            list:
+
+            VerifyStructure with the result for every command index
+        """
+        return self.__results
+
     def verifyStructure(self, lstBaseFiles, lstSourceFiles, destinationFile=None):
         """
         Verify if structure of files if logically equal.
@@ -161,56 +186,137 @@ class VerifyStructure:
 
             try:
 
-                objSource = MediaFileInfo(baseFile, log=self.log)
-                objFile = MediaFileInfo(sourceFile, log=self.log)
+                objSource = MediaFileInfo.get(baseFile, log=self.log)
+                objFile = MediaFileInfo.get(sourceFile, log=self.log)
 
-                if objSource != objFile:
+            except OSError as error:
 
-                    if destinationFile is not None:
-                        msg = "Error: In structure\nDestination File: {}\n\n"
-                        msg = msg.format(destinationFile)
-                    else:
-                        msg = "Error: In structure\n\n"
-                    msg = msg + "Source:\n{}\n\nBase Source:\n{}\n"
-                    msg = msg.format(str(objFile), str(objSource))
-                    self.__analysis.append(msg)
-                    self.__status = False
-                    self._detailAnalysis(objSource, objFile, sourceIndex)
+                self._probeError(error)
 
-                    if self.log:
+            else:
 
-                        msg = "Error: In structure Source: {} Base Source: {}"
-                        msg = msg.format(objFile.fileName, objSource.fileName)
-                        MODULELOG.error("VFS0002: Error: %s", msg)
+                self._verifyPair(objSource, objFile, sourceIndex, destinationFile)
 
-                        for i, line in enumerate(self.__analysis):
-                            if i > 0:
-                                MODULELOG.error("VFS0003: Error: %s", line.strip())
+    def verifyBatch(self, oCommand, maxWorkers=None):
+        """
+        Verify the structure of the files for all the commands of a
+        MKVCommandParser. The files of every source are probed once in
+        parallel before any comparison.
 
-                        msg = "Structure not ok. Source: {} Base Source: {}"
-                        msg = msg.format(objFile.fileName, objSource.fileName)
-                        MODULELOG.debug("VFS0004: %s", msg)
+        Args:
+            oCommand (MKVCommandParser): parsed command
+            maxWorkers (int, optional): threads used to probe the files.
+                Defaults to None ThreadPoolExecutor default
+                min(32, os.cpu_count() + 4).
 
-                else:
-                    for track in range(len(objSource.lstMediaTracks)):
-                        self.__matchedTracks.append(str(sourceIndex) + ":" + str(track))
+        Returns:
+            list:
 
-                    if self.log:
-                        msg = "Structure seems ok. Source: {} Base Source: {}"
-                        msg = msg.format(objFile.fileName, objSource.fileName)
-                        MODULELOG.debug("VFS0005: %s", msg)
+            VerifyStructure with the result for every command index. The
+            object evaluates to True if all commands are ok.
+        """
 
-            except OSError as error:
+        self.__analysis = []
+        self.__status = True
+        self.__matchedTracks = []
+        self.__unmatchedTracks = []
+        self.__results = []
 
-                msg = "Error: \n{}\n"
-                msg = msg.format(error.strerror)
-                self.__analysis.append(msg)
+        oBaseFiles = oCommand.oBaseFiles
+
+        for oBaseFile in oBaseFiles:
+            try:
+                oBaseFile.filesMediaInfo.readAll(maxWorkers=maxWorkers)
+            except OSError:
+                # reported by the index with the problem
+                pass
+
+        for index in range(len(oCommand)):
+            result = VerifyStructure(log=self.log)
+            result._verifyIndex(  # pylint: disable=protected-access
+                oBaseFiles, index, oCommand.destinationFiles[index]
+            )
+            self.__results.append(result)
+            if not result:
                 self.__status = False
+                self.__analysis.extend(result.analysis)
+
+        return self.__results
+
+    def _verifyIndex(self, oBaseFiles, index, destinationFile=None):
+        """verify command index using the MediaFileInfo already read"""
+
+        self.__analysis = []
+        self.__status = True
+        self.__matchedTracks = []
+        self.__unmatchedTracks = []
+
+        for sourceIndex, oBaseFile in enumerate(oBaseFiles):
+
+            try:
+
+                objSource = oBaseFile.mediaFileInfo
+                objFile = oBaseFile.filesMediaInfo[index]
+
+            except OSError as error:
+
+                self._probeError(error)
+
+            else:
+
+                self._verifyPair(objSource, objFile, sourceIndex, destinationFile)
+
+    def _probeError(self, error):
+        """save error reading a file"""
+
+        msg = "Error: \n{}\n"
+        msg = msg.format(error.strerror)
+        self.__analysis.append(msg)
+        self.__status = False
+
+        if self.log:
+            msg = "Error: {}"
+            msg = msg.format(error.strerror)
+            MODULELOG.error("VFS0001: %s", msg)
+
+    def _verifyPair(self, objSource, objFile, sourceIndex, destinationFile=None):
+        """compare structure of source file against the base file"""
+
+        if objSource != objFile:
+
+            if destinationFile is not None:
+                msg = "Error: In structure\nDestination File: {}\n\n"
+                msg = msg.format(destinationFile)
+            else:
+                msg = "Error: In structure\n\n"
+            msg = msg + "Source:\n{}\n\nBase Source:\n{}\n"
+            msg = msg.format(str(objFile), str(objSource))
+            self.__analysis.append(msg)
+            self.__status = False
+            self._detailAnalysis(objSource, objFile, sourceIndex)
+
+            if self.log:
+
+                msg = "Error: In structure Source: {} Base Source: {}"
+                msg = msg.format(objFile.fileName, objSource.fileName)
+                MODULELOG.error("VFS0002: Error: %s", msg)
+
+                for i, line in enumerate(self.__analysis):
+                    if i > 0:
+                        MODULELOG.error("VFS0003: Error: %s", line.strip())
+
+                msg = "Structure not ok. Source: {} Base Source: {}"
+                msg = msg.format(objFile.fileName, objSource.fileName)
+                MODULELOG.debug("VFS0004: %s", msg)
+
+        else:
+            for track in range(len(objSource.lstMediaTracks)):
+                self.__matchedTracks.append(str(sourceIndex) + ":" + str(track))
 
-                if self.log:
-                    msg = "Error: {}"
-                    msg = msg.format(error.strerror)
-                    MODULELOG.error("VFS0001: %s", msg)
+            if self.log:
+                msg = "Structure seems ok. Source: {} Base Source: {}"
+                msg = msg.format(objFile.fileName, objSource.fileName)
+                MODULELOG.debug("VFS0005: %s", msg)
 
     def _detailAnalysis(self, mediaFile1, mediaFile2, sourceIndex):
 
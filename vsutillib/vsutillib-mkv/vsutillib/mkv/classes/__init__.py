@@ -3,6 +3,20 @@
 from .IVerifyStructure import IVerifyStructure
 from .MergeOptions import MergeOptions
 from .MKVAttachments import MKVAttachment, MKVAttachments
+from .MKVCommandAST import (
+    MKVAttachmentNode,
+    MKVCommandAST,
+    MKVOptionNode,
+    MKVSourceNode,
+    parseCommand,
+    parseSource,
+    tokenizeCommand,
+)
+from .MKVCommandTemplate import (
+    compileCommandTemplate,
+    CompiledCommandTemplate,
+    MKVCommandTemplate,
+)
 from .MKVParseKey import MKVParseKey
 from .MKVCommandParser import MKVCommandParser
 from .SourceFiles import SourceFile, SourceFiles
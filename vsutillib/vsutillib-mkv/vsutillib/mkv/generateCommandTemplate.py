@@ -4,10 +4,10 @@
 
 import logging
 import platform
-import re
 import shlex
 
-from .classes import MKVAttachments
+from .classes.MKVCommandAST import parseCommand
+from .classes.MKVCommandTemplate import MKVCommandTemplate
 from .classes.MKVParseKey import MKVParseKey
 from .mkvutils import stripEncaseQuotes
 
@@ -20,35 +20,34 @@ def generateCommandTemplate(bashCommand, attachments=None, setTitle=False):
 
     Args:
         bashCommand (str): command in linux/unix bash format
+        attachments (MKVAttachments, optional): set with the command if
+            received. Defaults to None no filesystem access is done.
         setTitle (bool, optional): If True mark the title otherwise remove from
         template. Defaults to False.
 
     Returns:
         tuple: tuple with:
 
-            - command template
+            - command template as MKVCommandTemplate
             - match string for mkvmerge executable
             - list with match strings for source files
             - match string for templates
     """
 
-    cmdTemplate = bashCommand
-
     dMatch = {}
     dMatch[MKVParseKey.mkvmergeMatch] = None
     dMatch[MKVParseKey.outputMatch] = None
     dMatch[MKVParseKey.baseFilesMatch] = []
     dMatch[MKVParseKey.chaptersMatch] = None
 
-    reExecutableEx = re.compile(r"^(.*?)\s--")
-    reOutputFileEx = re.compile(r".*?--output\s(.*?)\s--")
-    reFilesEx = re.compile(r"'\(' (.*?) '\)'")
-    reChaptersFileEx = re.compile(r"--chapter-language (.*?) --chapters (.*?) (?=--)")
-    reTracksOrderEx = re.compile(r"--track-order\s(.*)")
-    reTitleEx = re.compile(r"--title\s(.*?)(?=$|\s--)")
+    cmdAST = parseCommand(bashCommand)
+
+    # (start, end, replacement) applied from the end of the command so the
+    # spans are still valid
+    edits = []
 
-    if matchExecutable := reExecutableEx.match(cmdTemplate):
-        dMatch[MKVParseKey.mkvmergeMatch] = matchExecutable.group(1)
+    if cmdAST.executable is not None:
+        dMatch[MKVParseKey.mkvmergeMatch] = cmdAST.executable
         f = stripEncaseQuotes(dMatch[MKVParseKey.mkvmergeMatch])
         e = shlex.quote(f)
 
@@ -70,43 +69,31 @@ def generateCommandTemplate(bashCommand, attachments=None, setTitle=False):
                 e = "'" + f + "'"
         ##
 
-        cmdTemplate = bashCommand
-        cmdTemplate = cmdTemplate.replace(dMatch[MKVParseKey.mkvmergeMatch], e, 1)
+        edits.append((*cmdAST.executableSpan, e))
 
-        if matchOutputFile := reOutputFileEx.match(bashCommand):
-            dMatch[MKVParseKey.outputMatch] = matchOutputFile.group(1)
-            cmdTemplate = cmdTemplate.replace(
-                dMatch[MKVParseKey.outputMatch], MKVParseKey.outputFile, 1
-            )
+        if cmdAST.output is not None:
+            dMatch[MKVParseKey.outputMatch] = cmdAST.output.parameter
+            edits.append((*cmdAST.output.parameterSpan, MKVParseKey.outputFile))
 
-        if matchFiles := reFilesEx.finditer(bashCommand):
-            for index, match in enumerate(matchFiles):
-                key = "<SOURCE{}>".format(str(index))
-                cmdTemplate = cmdTemplate.replace(match.group(0), key, 1)
-                if index == 0:
-                    regEx = r"<OUTPUTFILE>\s(.*?)\s<SOURCE0>"
-                else:
-                    regEx = f"<SOURCE{str(index - 1)}>" + r"\s(.*?)\s" + key
-                    regEx.format(str(index - 1), str(index))
-                options = re.search(regEx, cmdTemplate)
-                dMatch[MKVParseKey.baseFilesMatch].append(
-                    f"{options.group(1)} {match.group(0)}"
-                )  # source file with options
-
-        if attachments is None:
-            oAttachments = MKVAttachments()
-            MODULELOG.debug("GCT0001: Init attacment class.")
-        else:
-            oAttachments = attachments
-            MODULELOG.debug("GCT0002: Attacment already initialized.")
+        for index, source in enumerate(cmdAST.sources):
+            key = "<SOURCE{}>".format(str(index))
+            edits.append((source.file.start, source.end, key))
+            dMatch[MKVParseKey.baseFilesMatch].append(
+                source.text
+            )  # source file with options
 
-        oAttachments.command = bashCommand
+        if attachments is not None:
+            # attachments files are checked only if an object is received
+            attachments.command = bashCommand
+            MODULELOG.debug("GCT0002: Attacment already initialized.")
 
-        if oAttachments.cmdLineAttachments:
-            cmdTemplate = cmdTemplate.replace(
-                oAttachments.attachmentsMatchString,
-                MKVParseKey.attachmentFiles,
-                1,
+        if cmdAST.attachments:
+            edits.append(
+                (
+                    cmdAST.attachments[0].span[0],
+                    cmdAST.attachments[-1].span[1],
+                    MKVParseKey.attachmentFiles,
+                )
             )
 
         ##
@@ -119,23 +106,25 @@ def generateCommandTemplate(bashCommand, attachments=None, setTitle=False):
         # template
         # working with \ ' " backslash, single and double quotes in same title
         ##
-        if match := reTitleEx.search(bashCommand):
+        if cmdAST.title is not None:
             if setTitle:
-                cmdTemplate = cmdTemplate.replace(
-                    match.group(1),
-                    MKVParseKey.title,
-                    1,
-                )
+                edits.append((*cmdAST.title.parameterSpan, MKVParseKey.title))
             else:
-                cmdTemplate = cmdTemplate.replace(" " + match.group(0), "", 1)
+                start = cmdAST.title.start
+                if start > 0 and bashCommand[start - 1] == " ":
+                    start -= 1
+                edits.append((start, cmdAST.title.end, ""))
 
-        if match := reChaptersFileEx.search(bashCommand):
-            dMatch[MKVParseKey.chaptersMatch] = match.group(2)
-            cmdTemplate = cmdTemplate.replace(
-                dMatch[MKVParseKey.chaptersMatch], MKVParseKey.chaptersFile, 1
-            )
+        if (cmdAST.chapters is not None) and (cmdAST.chapterLanguage is not None):
+            dMatch[MKVParseKey.chaptersMatch] = cmdAST.chapters.parameter
+            edits.append((*cmdAST.chapters.parameterSpan, MKVParseKey.chaptersFile))
+
+        if cmdAST.trackOrder is not None:
+            edits.append((*cmdAST.trackOrder.parameterSpan, MKVParseKey.trackOrder))
+
+    cmdTemplate = bashCommand
 
-        if match := reTracksOrderEx.search(bashCommand):
-            cmdTemplate = cmdTemplate.replace(match.group(1), MKVParseKey.trackOrder, 1)
+    for start, end, replacement in sorted(edits, reverse=True):
+        cmdTemplate = cmdTemplate[:start] + replacement + cmdTemplate[end:]
 
-    return (cmdTemplate, dMatch)
+    return (MKVCommandTemplate(cmdTemplate), dMatch)
@@ -15,7 +15,7 @@ import sys
 from pathlib import Path
 
 from vsutillib.files import findFileInPath
-from vsutillib.misc import XLate
+from vsutillib.misc import compileTemplate
 from vsutillib.process import RunCommand
 
 MODULELOG = logging.getLogger(__name__)
@@ -35,8 +35,10 @@ def generateCommand(template, keyDictionary, shell=False):
         (str|list): template with substitutions as string or shlex.split list
     """
 
-    xLate = XLate(keyDictionary)  # instantiate regex dictionary translator
-    strCommand = xLate.xLate(template)
+    # template split by keys once and reused for every command
+    strCommand = compileTemplate(template, tuple(keyDictionary.keys())).render(
+        keyDictionary
+    )
 
     if shell:
         strCommand = shlex.split(
@@ -352,3 +354,31 @@ def strPath(value):
         str -- argument received converted to string
     """
     return str(value)
+
+
+def directoriesStamp(directories):
+    """
+    directoriesStamp modification time of directories used to know if
+    something read from them is still valid, files added, removed or
+    renamed change the modification time of the directory
+
+    Args:
+        directories (iterable): directories as str or Path
+
+    Returns:
+        tuple:
+
+        (directory, st_mtime_ns) pairs sorted st_mtime_ns is None for
+        directories that can not be read
+    """
+
+    stamp = []
+
+    for d in sorted({str(d) for d in directories}):
+        try:
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            mtime = None
+        stamp.append((d, mtime))
+
+    return tuple(stamp)
@@ -51,6 +51,9 @@ setup(
     author_email=config.EMAIL,
     license="MIT",
     packages=["vsutillib." + PACKAGE, "vsutillib." + PACKAGE + ".classes"],
+    install_requires=[
+        "vsutillib-sql>=" + config.SQL_VERSION,
+    ],
     zip_safe=False,
     url="https://pypi.org/project/vsutillib-" + PACKAGE + "/",
     python_requires=config.PYTHON_VERSION,
@@ -3,11 +3,20 @@ process namespace
 """
 
 from .classes import (
+    AsyncRunCommand,
+    CommandJob,
+    CommandScheduler,
     GenericThreadWorker,
+    JobJournal,
+    OutputDiscard,
+    OutputRingBuffer,
+    OutputSink,
+    OutputSpillFile,
     ProcessWorker,
     QueueProcessWorker,
     QueueThreadWorker,
     RunCommand,
+    RunStatus,
     ThreadWorker
 )
 
@@ -0,0 +1,418 @@
+"""
+AsyncRunCommand
+
+Run a command in a subprocess using asyncio and capture any output
+
+Same contract as RunCommand in binary mode. Many commands can run
+concurrently in one event loop without a thread for every command.
+
+.. code:: Python
+
+    async def job(cmd):
+        cli = AsyncRunCommand(cmd, regexsearch=r"Progress: (\\d+)%")
+        async for line in cli.lines():
+            print(line, end="")
+        return cli.rc
+
+    async def main():
+        return await asyncio.gather(*[job(c) for c in commands])
+
+    rcs = asyncio.run(main())
+"""
+# ARC0001
+
+import asyncio
+import codecs
+import inspect
+import logging
+import platform
+import re
+import shlex
+import subprocess
+
+from .RunCommand import LineSplitter, RunStatus
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class AsyncRunCommand:
+    """
+    Run a command in a subprocess using asyncio and capture any output
+
+    processLine function if provided it will be called with every
+    line read. It can be a coroutine function.
+
+    regexsearch regular expression if provided the first
+    match will be set on regexmatch property
+
+    If the task running the command is cancelled the subprocess is
+    killed.
+
+    Args:
+        **command** (str): command to execute
+
+        **commandShlex** (:obj:`bool`): True if command is shlex.split
+        False otherwise. Defaults to False.
+
+        **processLine** (:obj:`function`, optional): Function called with
+        every line read. Defaults to None.
+
+        **processArgs** (:obj:`list`, optional): Variable length list to
+        pass to processLine. Defaults to None.
+
+        **processKWArgs** (:obj:`list`, optional): Arbitrary keyword
+        arguments to pass to processLine. Defaults to None.
+
+        **regexsearch** (:obj:`str`, optional): Regex applied to every
+        line read. Defaults to None
+
+        **controlQueue** (:obj:`collections.deque`, optional): queue checked
+        for RunStatus.Abort, RunStatus.AbortJob and RunStatus.AbortForced
+        to kill the subprocess. Defaults to None.
+
+        **bufferSize** (:obj:`int`): size of the chunks read.
+        Defaults to 65536.
+
+        **outputSink** (:obj:`OutputSink`, optional): where to save the
+        output of the command. Defaults to None all the output is saved
+        in a list.
+
+        **pollInterval** (:obj:`float`): seconds to wait for output before
+        checking the controlQueue again. Defaults to 0.5.
+
+    Raises:
+
+        ValueError: If processArgs is not a list or if processKWArgs
+            is not a dictionary.
+    """
+
+    __log = False
+
+    @classmethod
+    def classLog(cls, setLogging=None):
+        """
+        get/set logging at class level
+        every class instance will log
+        unless overwritten
+
+        Args:
+            setLogging (`bool`):
+
+                - True class will log
+                - False turn off logging
+                - None returns current Value
+
+        Returns:
+            bool:
+
+            returns the current value set
+        """
+
+        if setLogging is not None:
+            if isinstance(setLogging, bool):
+                cls.__log = setLogging
+
+        return cls.__log
+
+    def __init__(
+        self,
+        command=None,
+        processLine=None,
+        processArgs=None,
+        processKWArgs=None,
+        regexsearch=None,
+        commandShlex=False,
+        controlQueue=None,
+        log=None,
+        bufferSize=65536,
+        outputSink=None,
+        pollInterval=0.5,
+    ):  # pylint: disable=too-many-arguments
+
+        self.__command = None
+        self.__outputSink = outputSink
+        self.command = command  # Call class setter property
+
+        self.__commandShlex = commandShlex
+        self.__processLine = processLine
+        self.__bufferSize = bufferSize
+        self.__pollInterval = pollInterval
+
+        self.__processArgs = []
+        if processArgs is not None:
+            if isinstance(processArgs, list):
+                self.__processArgs = processArgs
+            else:
+                raise ValueError("processLineParam has to be a list")
+
+        self.__processKWArgs = {}
+        if processKWArgs is not None:
+            if isinstance(processKWArgs, dict):
+                self.__processKWArgs = processKWArgs
+            else:
+                raise ValueError("processLineParam has to be a dictionary")
+
+        self.__regEx = None
+        if regexsearch is not None:
+            if isinstance(regexsearch, list):
+                self.__regEx = []
+                for regex in regexsearch:
+                    self.__regEx.append(re.compile(regex))
+            else:
+                self.__regEx = re.compile(regexsearch)
+
+        self.__error = ""
+        self.__output = [] if outputSink is None else outputSink
+        self.__controlQueue = controlQueue
+        self.__returnCode = None
+        self.__regexmatch = None
+        self.__log = log
+
+    def __bool__(self):
+        if self.__command:
+            return True
+        return False
+
+    # region log setup
+    @property
+    def log(self):
+        """
+        class property can be used to override the class global
+        logging setting if set to None class log will be followed
+
+        Returns:
+            bool:
+
+            True if logging is enable False otherwise
+        """
+        if self.__log is not None:
+            return self.__log
+
+        return AsyncRunCommand.classLog()
+
+    @log.setter
+    def log(self, value):
+        """set instance log variable"""
+        if isinstance(value, bool) or value is None:
+            self.__log = value
+    # endregion log setup
+
+    # region properties
+    @property
+    def command(self):
+        """return current command set in class"""
+
+        return self.__command
+
+    @command.setter
+    def command(self, value):
+        """
+        command to execute
+
+        Args:
+            command (str): command to execute
+        """
+        self.__command = None
+        self._reset(value)
+
+    @property
+    def error(self):
+        """
+        error if command can not be executed
+
+        Returns:
+            str:
+
+            message if command fails to execute
+        """
+        return self.__error
+
+    @property
+    def output(self):
+        """
+        captured output
+
+        Returns:
+            list|OutputSink:
+
+            output of executed command. If an outputSink was set the
+            sink is returned.
+        """
+        return self.__output
+
+    @property
+    def rc(self):
+        """
+        Return code.
+
+        Returns:
+            int:
+
+            return code of executed command
+        """
+        return self.__returnCode
+
+    @property
+    def regexmatch(self):
+        """
+        results of regular expression search
+
+        Returns:
+            list|dict:
+
+            list if matches if single regex passed.  dict of list
+            with the regex as key if a list of regex is passed.
+        """
+        return self.__regexmatch
+    # endregion properties
+
+    async def run(self):
+        """
+        coroutine to run the command and wait for it to finish
+
+        Returns:
+            bool:
+
+            True if any output was read False otherwise
+        """
+
+        async for _ in self.lines():
+            pass
+
+        if self.__output:
+            return True
+        return False
+
+    async def lines(self):
+        """
+        async generator that runs the command and yields every line read
+        after processLine and the regex search are applied to it
+        """
+
+        self._reset()
+        self.__returnCode = 10000
+
+        if self.__commandShlex:
+            cmd = self.__command
+        else:
+            cmd = shlex.split(self.__command)
+
+        cFlag = 0
+        if platform.system() == "Windows":
+            cFlag = subprocess.CREATE_NO_WINDOW
+
+        try:
+            p = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                creationflags=cFlag,
+            )
+        except FileNotFoundError as e:
+            self.__error = e
+            return
+
+        decoder = codecs.getincrementaldecoder("utf8")()
+        splitter = LineSplitter()
+        endOfOutput = False
+
+        try:
+            while True:
+                if self._abortRequested():
+                    p.kill()
+                    if self.log:
+                        MODULELOG.debug("ARC0002: Aborting %s", str(cmd))
+                    break
+                try:
+                    chunk = await asyncio.wait_for(
+                        p.stdout.read(self.__bufferSize), self.__pollInterval
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                if chunk:
+                    lines = splitter.feed(decoder.decode(chunk))
+                else:
+                    lines = splitter.feed(decoder.decode(b"", final=True))
+                    lines.extend(splitter.flush())
+                for line in lines:
+                    await self._processLine(line)
+                    yield line
+                if not chunk:
+                    endOfOutput = True
+                    break
+        except UnicodeDecodeError as error:
+            msg = "Error: {}".format(error.reason)
+            self.__output.append(str(cmd) + "\n")
+            self.__output.append(msg)
+            p.kill()
+            if self.log:
+                MODULELOG.debug("ARC0003: Unicode decode error %s", msg)
+        finally:
+            # on end of output the child watcher reaps the process killing it
+            # here can reap it first and the return code is lost
+            if not endOfOutput and p.returncode is None:
+                try:
+                    p.kill()
+                except ProcessLookupError:
+                    pass
+                # don't leave a zombie if the task was cancelled
+                await asyncio.shield(p.wait())
+                if self.log:
+                    MODULELOG.debug("ARC0004: Process killed %s", str(cmd))
+
+        self.__returnCode = await p.wait()
+
+    def _abortRequested(self):
+        """check controlQueue for abort status"""
+
+        if self.__controlQueue:
+            queueStatus = self.__controlQueue[0]
+            if queueStatus in [
+                RunStatus.Abort,
+                RunStatus.AbortJob,
+                RunStatus.AbortForced,
+            ]:
+                return True
+
+        return False
+
+    async def _processLine(self, line):
+        """Save line read and pass it to processLine and regex search"""
+
+        self.__output.append(line)
+        self._regexMatch(line)
+        if self.__processLine is not None:
+            result = self.__processLine(
+                line, *self.__processArgs, **self.__processKWArgs
+            )
+            if inspect.isawaitable(result):
+                await result
+
+    def _reset(self, command=None):
+        """reset internal variables"""
+
+        if self.__outputSink is None:
+            self.__output = []
+        else:
+            self.__outputSink.clear()
+        self.__error = ""
+        self.__regexmatch = None
+        if command is not None:
+            self.__command = command
+
+    def _regexMatch(self, line):
+        """Have to set the size of in case of list"""
+
+        if isinstance(self.__regEx, list):
+            for index, regex in enumerate(self.__regEx):
+                if m := regex.search(line):
+                    if self.__regexmatch is None:
+                        self.__regexmatch = [None] * len(self.__regEx)
+                    self.__regexmatch[index] = list(m.groups())
+        else:
+            if self.__regEx:
+                if m := self.__regEx.search(line):
+                    if self.__regexmatch is None:
+                        self.__regexmatch = []
+                    self.__regexmatch.extend(m.groups())
@@ -0,0 +1,600 @@
+"""
+CommandScheduler
+
+Run a batch of commands using a pool of worker threads every
+command runs in its own RunCommand.
+
+.. code:: Python
+
+    scheduler = CommandScheduler(
+        mkv.shellCommands,
+        mkv.destinationFiles,
+        maxWorkers=4,
+        successCodes=(0, 1),
+    )
+    scheduler.run()
+
+    for job in scheduler:
+        print(job.destinationFile, job.status)
+
+Commands limited by disk throughput can be capped per device, a job
+only starts when every device it uses has a free slot.
+
+The jobs can also be read while the batch runs, i.e. from a
+:class:`vsutillib.files.FileStream`, a new job is read when a worker is
+free.
+
+.. code:: Python
+
+    scheduler = CommandScheduler(maxWorkers=8, progressRegex=None)
+    scheduler.run(feed=(command + " " + shlex.quote(str(f)) for f in stream))
+
+.. code:: Python
+
+    scheduler = CommandScheduler(
+        mkv.shellCommands,
+        mkv.destinationFiles,
+        devices=[mkv.devices] * len(mkv),
+        maxWorkers=4,
+        maxPerDevice=1,
+    )
+"""
+# CSH0001
+
+import logging
+import os
+import re
+import threading
+
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .RunCommand import RunCommand, RunStatus
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+
+class CommandJob:  # pylint: disable=too-few-public-methods
+    """
+    Information for one command run by CommandScheduler
+
+    Args:
+        index (int): position of the job in the batch
+        command (str|list): command to execute
+        destinationFile (:obj:`pathlib.Path`, optional): file generated
+            by the command. Defaults to None.
+        devices (:obj:`list`, optional): device ids (st_dev) read or
+            written by the command. Defaults to None.
+
+    Attributes:
+        status (str): RunStatus Queue, Running, Done, Error, Aborted or
+            Skipped
+        rc (int): return code of the command
+        error (str): error if command can not be executed
+        output (list|OutputSink): captured output
+        regexmatch (list): results of regular expression search
+        progress (int): last progress percentage read from the output
+    """
+
+    def __init__(self, index, command, destinationFile=None, devices=None):
+
+        self.index = index
+        self.command = command
+        self.destinationFile = destinationFile
+        self.devices = frozenset()
+        if devices is not None:
+            self.devices = frozenset(d for d in devices if d is not None)
+        self.status = RunStatus.Queue
+        self.rc = None
+        self.error = ""
+        self.output = None
+        self.regexmatch = None
+        self.progress = 0
+
+    def __str__(self):
+        return f"Job {self.index}: {self.status} - {self.destinationFile}"
+
+
+class CommandScheduler:
+    """
+    Run commands with a configurable number of worker threads
+
+    Every job goes through RunStatus.Queue -> RunStatus.Running ->
+    RunStatus.Done or RunStatus.Error. All the jobs are aborted putting
+    RunStatus.Abort, RunStatus.AbortJob or RunStatus.AbortForced at the
+    left of the controlQueue, running jobs end as RunStatus.Aborted and
+    the jobs not started as RunStatus.Skipped.
+
+    Args:
+        **commands** (:obj:`list`, optional): commands to execute.
+        Defaults to None.
+
+        **destinationFiles** (:obj:`list`, optional): file generated by
+        every command. Defaults to None.
+
+        **devices** (:obj:`list`, optional): for every command the device
+        ids (st_dev) of the directories it reads and writes, see
+        :func:`vsutillib.files.getDeviceID`. Defaults to None.
+
+        **maxWorkers** (:obj:`int`, optional): number of commands to run
+        in parallel. Defaults to None os.cpu_count().
+
+        **maxPerDevice** (:obj:`int`|:obj:`dict`, optional): number of
+        commands that can use the same device at the same time. A
+        dictionary sets the limit by device id, devices not in it have no
+        limit. Defaults to None no limit.
+
+        **processLine** (:obj:`function`, optional): Function called with
+        every line read by any of the jobs. Defaults to None.
+
+        **regexsearch** (:obj:`str`, optional): Regex applied to every
+        line read. Defaults to None
+
+        **progressRegex** (:obj:`str`, optional): Regex with one group to
+        read the progress percentage of a job. Defaults to mkvmerge
+        "Progress: NN%".
+
+        **funcProgress** (:obj:`function`, optional): Call back function
+        called with jobs finished, total jobs and the aggregate
+        percentage of the batch. Defaults to None.
+
+        **funcJobStart** (:obj:`function`, optional): Call back function
+        called with the CommandJob before it runs. Defaults to None.
+
+        **funcJobFinished** (:obj:`function`, optional): Call back
+        function called with the CommandJob after it finish.
+        Defaults to None.
+
+        **controlQueue** (:obj:`collections.deque`, optional): queue
+        checked for abort status. Defaults to None a new deque is used.
+
+        **commandShlex** (:obj:`bool`): True if commands are shlex.split
+        False otherwise. Defaults to True.
+
+        **universalNewLines** (:obj:`bool`): True to read in text mode
+        False to read binary mode. Defaults to False.
+
+        **outputSink** (:obj:`callable`, optional): called with no
+        arguments to create the OutputSink for every job, the class can
+        be used i.e. OutputSpillFile. Defaults to None output saved in a
+        list.
+
+        **successCodes** (:obj:`tuple`): return codes that mark a job
+        as RunStatus.Done. Defaults to (0,).
+
+        **pollInterval** (:obj:`float`): seconds between checks of the
+        controlQueue while the jobs run. Defaults to 0.5.
+
+    The call back functions are called holding a lock, they never run
+    at the same time.
+    """
+
+    __log = False
+
+    @classmethod
+    def classLog(cls, setLogging=None):
+        """
+        get/set logging at class level
+        every class instance will log
+        unless overwritten
+
+        Args:
+            setLogging (`bool`):
+
+                - True class will log
+                - False turn off logging
+                - None returns current Value
+
+        Returns:
+            bool:
+
+            returns the current value set
+        """
+
+        if setLogging is not None:
+            if isinstance(setLogging, bool):
+                cls.__log = setLogging
+
+        return cls.__log
+
+    def __init__(
+        self,
+        commands=None,
+        destinationFiles=None,
+        devices=None,
+        maxWorkers=None,
+        maxPerDevice=None,
+        processLine=None,
+        regexsearch=None,
+        progressRegex=r"Progress:\s(\d+)%",
+        funcProgress=None,
+        funcJobStart=None,
+        funcJobFinished=None,
+        controlQueue=None,
+        commandShlex=True,
+        universalNewLines=False,
+        outputSink=None,
+        successCodes=(0,),
+        pollInterval=0.5,
+        log=None,
+    ):  # pylint: disable=too-many-arguments
+
+        self.__jobs = []
+        self.__lock = threading.Lock()
+        self.__maxWorkers = maxWorkers
+        self.__maxPerDevice = maxPerDevice
+        self.__devicesInUse = Counter()
+        self.__processLine = processLine
+        self.__regexsearch = regexsearch
+        self.__reProgressEx = None
+        if progressRegex is not None:
+            self.__reProgressEx = re.compile(progressRegex)
+        self.__funcProgress = funcProgress
+        self.__funcJobStart = funcJobStart
+        self.__funcJobFinished = funcJobFinished
+        self.__controlQueue = deque() if controlQueue is None else controlQueue
+        self.__commandShlex = commandShlex
+        self.__universalNewLines = universalNewLines
+        self.__outputSink = outputSink
+        self.__successCodes = successCodes
+        self.__jobsFinished = 0
+        self.__percent = -1
+        self.__running = {}
+        self.__pollInterval = pollInterval
+        self.__log = None
+        self.log = log
+
+        if commands is not None:
+            for index, command in enumerate(commands):
+                destinationFile = None
+                jobDevices = None
+                if destinationFiles is not None:
+                    destinationFile = destinationFiles[index]
+                if devices is not None:
+                    jobDevices = devices[index]
+                self.addJob(command, destinationFile, jobDevices)
+
+    def __getitem__(self, index):
+        return self.__jobs[index]
+
+    def __iter__(self):
+        return iter(self.__jobs)
+
+    def __len__(self):
+        return len(self.__jobs)
+
+    # region log setup
+    @property
+    def log(self):
+        """
+        class property can be used to override the class global
+        logging setting if set to None class log will be followed
+
+        Returns:
+            bool:
+
+            True if logging is enable False otherwise
+        """
+        if self.__log is not None:
+            return self.__log
+
+        return CommandScheduler.classLog()
+
+    @log.setter
+    def log(self, value):
+        """set instance log variable"""
+        if isinstance(value, bool) or value is None:
+            self.__log = value
+    # endregion log setup
+
+    @property
+    def controlQueue(self):
+        return self.__controlQueue
+
+    @property
+    def jobs(self):
+        return self.__jobs
+
+    @property
+    def jobsFinished(self):
+        return self.__jobsFinished
+
+    @property
+    def maxWorkers(self):
+        if self.__maxWorkers is None:
+            return os.cpu_count() or 1
+        return self.__maxWorkers
+
+    @maxWorkers.setter
+    def maxWorkers(self, value):
+        if isinstance(value, int) and value > 0:
+            self.__maxWorkers = value
+
+    @property
+    def maxPerDevice(self):
+        return self.__maxPerDevice
+
+    @maxPerDevice.setter
+    def maxPerDevice(self, value):
+        if value is None or isinstance(value, (int, dict)):
+            self.__maxPerDevice = value
+
+    @property
+    def percent(self):
+        """
+        aggregate percentage of the batch
+
+        Returns:
+            int:
+
+            average percentage of all the jobs
+        """
+        if not self.__jobs:
+            return 0
+        return sum(job.progress for job in self.__jobs) // len(self.__jobs)
+
+    def abort(self, status=RunStatus.Abort):
+        """
+        abort all jobs using the controlQueue
+
+        Args:
+            status (str, optional): abort status. Defaults to RunStatus.Abort.
+        """
+        self.__controlQueue.appendleft(status)
+        self._killRunning()
+
+    def addJob(self, command, destinationFile=None, devices=None):
+        """
+        addJob add a command to the batch
+
+        Args:
+            command (str|list): command to execute
+            destinationFile (pathlib.Path, optional): file generated by the
+                command. Defaults to None.
+            devices (list, optional): device ids used by the command.
+                Defaults to None.
+
+        Returns:
+            CommandJob: job added
+        """
+        job = CommandJob(len(self.__jobs), command, destinationFile, devices)
+        self.__jobs.append(job)
+
+        return job
+
+    def run(self, feed=None):
+        """
+        run all jobs in queue and wait for them to finish
+
+        Args:
+            feed (iterable, optional): more jobs read while the batch runs
+                only when a worker is free. Every element is a command or a
+                tuple with addJob arguments. Defaults to None.
+
+        Returns:
+            bool:
+
+            True if all jobs finished as RunStatus.Done False otherwise
+        """
+
+        self.__jobsFinished = 0
+        self.__percent = -1
+
+        self.__devicesInUse.clear()
+
+        queued = deque(job for job in self.__jobs if job.status == RunStatus.Queue)
+        pending = {}
+        feed = None if feed is None else iter(feed)
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            try:
+                while queued or pending or feed is not None:
+                    if self._abortRequested():
+                        # commands with no output don't check the controlQueue
+                        self._killRunning()
+                        self._skipJobs(queued)
+                        feed = None
+                    else:
+                        feed = self._readFeed(feed, queued, pending)
+                        self._dispatch(executor, queued, pending)
+                    if not pending:
+                        continue
+                    done, _ = wait(
+                        pending,
+                        timeout=self.__pollInterval,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        self.__devicesInUse.subtract(pending.pop(future).devices)
+            except KeyboardInterrupt as error:
+                self.abort()
+                self._skipJobs(queued)
+                wait(pending)
+                if self.log:
+                    MODULELOG.debug("CSH0002: Keyboard interrupt all jobs aborted.")
+                raise SystemExit(0) from error
+
+        return all(job.status == RunStatus.Done for job in self.__jobs)
+
+    def _abortRequested(self):
+        """check controlQueue for abort status"""
+
+        if self.__controlQueue:
+            if self.__controlQueue[0] in [
+                RunStatus.Abort,
+                RunStatus.AbortJob,
+                RunStatus.AbortForced,
+            ]:
+                return True
+
+        return False
+
+    def _deviceLimit(self, device):
+        """maximum number of jobs for device None for no limit"""
+
+        if isinstance(self.__maxPerDevice, dict):
+            return self.__maxPerDevice.get(device, None)
+
+        return self.__maxPerDevice
+
+    def _devicesAvailable(self, job):
+        """check if all devices used by job have a free slot"""
+
+        for device in job.devices:
+            limit = self._deviceLimit(device)
+            if limit is not None and self.__devicesInUse[device] >= max(limit, 1):
+                return False
+
+        return True
+
+    def _dispatch(self, executor, queued, pending):
+        """
+        submit the queued jobs that fit in the free workers and devices
+        a job waiting for a busy device doesn't block the jobs behind it
+        """
+
+        for job in list(queued):
+            if len(pending) >= self.maxWorkers:
+                break
+            if self._devicesAvailable(job):
+                queued.remove(job)
+                self.__devicesInUse.update(job.devices)
+                pending[executor.submit(self._runJob, job)] = job
+                if self.log:
+                    MODULELOG.debug(
+                        "CSH0004: Job %s started devices %s",
+                        job.index,
+                        sorted(job.devices),
+                    )
+
+    def _readFeed(self, feed, queued, pending):
+        """
+        add jobs from feed until there is one for every worker
+
+        Returns:
+            iterator:
+
+            feed None if there are no more jobs
+        """
+
+        while feed is not None and len(queued) + len(pending) < self.maxWorkers:
+            try:
+                item = next(feed)
+            except StopIteration:
+                return None
+            if isinstance(item, tuple):
+                job = self.addJob(*item)
+            else:
+                job = self.addJob(item)
+            queued.append(job)
+
+        return feed
+
+    def _skipJobs(self, queued):
+        """mark jobs not started as skipped"""
+
+        while queued:
+            job = queued.popleft()
+            job.status = RunStatus.Skipped
+            self._jobFinished(job)
+
+    def _killRunning(self):
+        """kill the commands running"""
+
+        with self.__lock:
+            running = list(self.__running.values())
+
+        for cli in running:
+            cli.kill()
+
+    def _runJob(self, job):
+        """worker function runs one job"""
+
+        if self._abortRequested():
+            job.status = RunStatus.Skipped
+            self._jobFinished(job)
+            return
+
+        with self.__lock:
+            job.status = RunStatus.Running
+            if callable(self.__funcJobStart):
+                self.__funcJobStart(job)
+
+        cli = RunCommand(
+            job.command,
+            processLine=self._processLine,
+            processArgs=[job],
+            regexsearch=self.__regexsearch,
+            commandShlex=self.__commandShlex,
+            universalNewLines=self.__universalNewLines,
+            controlQueue=self.__controlQueue,
+            outputSink=None if self.__outputSink is None else self.__outputSink(),
+            log=self.log,
+        )
+
+        with self.__lock:
+            self.__running[job.index] = cli
+
+        try:
+            cli.run()
+        except Exception as error:  # pylint: disable=broad-except
+            job.error = error
+            if self.log:
+                MODULELOG.error("CSH0003: Job %s error %s", job.index, error)
+        finally:
+            with self.__lock:
+                del self.__running[job.index]
+
+        job.rc = cli.rc
+        job.output = cli.output
+        job.regexmatch = cli.regexmatch
+        if cli.error:
+            job.error = cli.error
+
+        if job.error:
+            job.status = RunStatus.Error
+        elif job.rc in self.__successCodes:
+            job.status = RunStatus.Done
+            job.progress = 100
+        elif self._abortRequested():
+            job.status = RunStatus.Aborted
+        else:
+            job.status = RunStatus.Error
+
+        if self.log:
+            MODULELOG.debug("CSH0001: %s rc=%s", str(job), job.rc)
+
+        self._jobFinished(job)
+
+    def _processLine(self, line, job):
+        """read progress for job and pass line to processLine"""
+
+        if self.__reProgressEx is not None:
+            if match := self.__reProgressEx.search(line):
+                job.progress = int(match.group(1))
+                self._updateProgress()
+
+        if self.__processLine is not None:
+            self.__processLine(line)
+
+    def _jobFinished(self, job):
+        """update totals and call back functions for finished job"""
+
+        with self.__lock:
+            self.__jobsFinished += 1
+            if callable(self.__funcJobFinished):
+                self.__funcJobFinished(job)
+        self._updateProgress(force=True)
+
+    def _updateProgress(self, force=False):
+        """call funcProgress when the aggregate percentage changes"""
+
+        if not callable(self.__funcProgress):
+            return
+
+        with self.__lock:
+            percent = self.percent
+            if force or percent != self.__percent:
+                self.__percent = percent
+                self.__funcProgress(self.__jobsFinished, len(self.__jobs), percent)
@@ -0,0 +1,284 @@
+"""
+Journal of the jobs of a batch saved in a SQLite database
+
+Every change of status of a job is committed when it happens so a batch
+interrupted can be run again skipping the jobs already done.
+
+.. code:: Python
+
+    journal = JobJournal(batch="dsf2wv " + command)
+
+    for f in files:
+        if resume and journal.isDone(f):
+            continue
+        journal.running(f)
+        cli.run()
+        journal.setStatus(f, RunStatus.Done, outputFile)
+
+A job is done if its last status is RunStatus.Done and the output file
+recorded still has the same size and modification time. A job without
+output is validated with the item itself when it is a file i.e. the
+source was not modified since it was done.
+"""
+
+# JJL0001
+
+import logging
+import os
+import threading
+import time
+
+from pathlib import Path
+
+from vsutillib.sql import SqlDb
+
+from .RunCommand import RunStatus
+
+MODULELOG = logging.getLogger(__name__)
+MODULELOG.addHandler(logging.NullHandler())
+
+DBFILE = Path(Path.home(), ".vsutillib", "jobs.db")
+
+
+class JobJournal:
+    """
+    Status of the jobs of a batch
+
+    Args:
+        dbFile (:obj:`str`|:obj:`pathlib.Path`, optional): database file.
+            Defaults to ~/.vsutillib/jobs.db.
+        batch (:obj:`str`, optional): key of the batch, jobs of different
+            batches don't mix i.e. the command applied. Defaults to "".
+        log (:obj:`bool`, optional): log database errors.
+            Defaults to None.
+
+    The methods can be called from any thread. If the database can't be
+    created the journal is disabled, isDone is always False and the
+    status is not saved.
+    """
+
+    __log = False
+
+    __sqlCreate = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            batch TEXT NOT NULL,
+            item TEXT NOT NULL,
+            status TEXT NOT NULL,
+            output TEXT,
+            size INTEGER,
+            mtime INTEGER,
+            updated REAL NOT NULL,
+            PRIMARY KEY (batch, item)
+        );
+        """
+    __sqlSelect = (
+        "SELECT status, output, size, mtime FROM jobs WHERE batch = ? AND item = ?;"
+    )
+    __sqlInsert = (
+        "INSERT OR REPLACE INTO jobs "
+        "(batch, item, status, output, size, mtime, updated) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?);"
+    )
+    __sqlDelete = "DELETE FROM jobs WHERE batch = ?;"
+
+    @classmethod
+    def classLog(cls, setLogging=None):
+        """
+        get/set logging at class level
+        every class instance will log
+        unless overwritten
+
+        Args:
+            setLogging (bool):
+                - True class will log
+                - False turn off logging
+                - None returns current Value
+
+        Returns:
+            bool:
+
+            returns the current value set
+        """
+
+        if setLogging is not None:
+            if isinstance(setLogging, bool):
+                cls.__log = setLogging
+
+        return cls.__log
+
+    def __init__(self, dbFile=None, batch="", log=None):
+
+        self.__dbFile = Path(DBFILE if dbFile is None else dbFile)
+        self.__batch = batch
+        self.__lock = threading.Lock()
+        self.__log = None
+        self.log = log
+
+        self.__db = None
+
+        try:
+            self.__dbFile.parent.mkdir(parents=True, exist_ok=True)
+            self.__db = SqlDb(str(self.__dbFile), checkSameThread=False)
+        except OSError as error:
+            MODULELOG.error("JJL0003: Journal disabled %s", error)
+            return
+
+        if self.__db:
+            self.__db.sqlExecute(JobJournal.__sqlCreate)
+        if self.__db.error and self.log:
+            MODULELOG.error("JJL0001: Journal database error %s", self.__db.error)
+
+    def __bool__(self):
+        return bool(self.__db)
+
+    @property
+    def batch(self):
+        return self.__batch
+
+    @property
+    def dbFile(self):
+        return self.__dbFile
+
+    @property
+    def log(self):
+        """
+        class property can be used to override the class global
+        logging setting
+
+        Returns:
+            bool:
+
+            True if logging is enable False otherwise
+        """
+        if self.__log is not None:
+            return self.__log
+
+        return JobJournal.classLog()
+
+    @log.setter
+    def log(self, value):
+        """set instance log variable"""
+        if isinstance(value, bool) or value is None:
+            self.__log = value
+
+    def clear(self):
+        """delete all the jobs of the batch"""
+
+        if not self.__db:
+            return
+
+        with self.__lock:
+            self.__db.sqlExecute(JobJournal.__sqlDelete, self.__batch)
+
+    def close(self):
+        """close the database"""
+
+        with self.__lock:
+            if self.__db:
+                self.__db.close()
+
+    def isDone(self, item):
+        """
+        isDone check if item was done and its output, or the item file
+        when there is no output, is still valid
+
+        Args:
+            item (str): job i.e. source file
+
+        Returns:
+            bool:
+
+            True if the job doesn't need to run again
+        """
+
+        row = self._select(item)
+
+        if row is None or row[0] != RunStatus.Done:
+            return False
+
+        stampFile = item if row[1] is None else row[1]
+
+        return row[2] is not None and _fileStamp(stampFile) == (row[2], row[3])
+
+    def status(self, item):
+        """
+        status last status saved for item
+
+        Args:
+            item (str): job
+
+        Returns:
+            str:
+
+            RunStatus value None if item is not in the journal
+        """
+
+        row = self._select(item)
+
+        return None if row is None else row[0]
+
+    def queued(self, item, output=None):
+        """item added to the batch"""
+        self.setStatus(item, RunStatus.Queue, output)
+
+    def running(self, item, output=None):
+        """item started"""
+        self.setStatus(item, RunStatus.Running, output)
+
+    def setStatus(self, item, status, output=None):
+        """
+        setStatus save status of item the size and modification time of
+        output, or of the item file when there is no output, are saved to
+        validate it later
+
+        Args:
+            item (str): job i.e. source file
+            status (str): RunStatus value
+            output (str|Path, optional): file generated by the job.
+                Defaults to None.
+        """
+
+        if not self.__db:
+            return
+
+        if output is not None:
+            output = os.path.abspath(output)
+            size, mtime = _fileStamp(output)
+        else:
+            size, mtime = _fileStamp(item)
+
+        with self.__lock:
+            self.__db.sqlExecute(
+                JobJournal.__sqlInsert,
+                self.__batch,
+                str(item),
+                status,
+                output,
+                size,
+                mtime,
+                time.time(),
+            )
+            if self.__db.error and self.log:
+                MODULELOG.error("JJL0002: Journal database error %s", self.__db.error)
+
+    def _select(self, item):
+
+        if not self.__db:
+            return None
+
+        with self.__lock:
+            cursor = self.__db.sqlExecute(
+                JobJournal.__sqlSelect, self.__batch, str(item)
+            )
+            return None if cursor is None else cursor.fetchone()
+
+
+def _fileStamp(fileName):
+    """size and modification time of file (None, None) if not found"""
+
+    try:
+        st = os.stat(fileName)
+    except OSError:
+        return (None, None)
+
+    return (st.st_size, st.st_mtime_ns)
@@ -0,0 +1,178 @@
+"""
+Output sinks for RunCommand
+
+Control how much of the output of a command is kept in memory.
+
+OutputRingBuffer - keep only the last N lines
+
+OutputSpillFile - write the lines to a temporary file and read
+    them back lazily
+
+OutputDiscard - don't keep any output only count the lines
+"""
+
+import tempfile
+
+from collections import deque
+
+
+class OutputSink:
+    """
+    Base class for the output sinks. Keeps a count of all the
+    lines received even if they are not saved.
+    """
+
+    def __init__(self):
+
+        self.__total = 0
+
+    def __bool__(self):
+        return self.__total > 0
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    @property
+    def total(self):
+        """
+        total lines received since last clear
+
+        Returns:
+            int:
+
+            number of lines received
+        """
+        return self.__total
+
+    def append(self, line):
+        """
+        append receive a line from the command output
+
+        Args:
+            line (str): line read
+        """
+        self.__total += 1
+        self._append(line)
+
+    def clear(self):
+        """clear output received"""
+        self.__total = 0
+        self._clear()
+
+    def close(self):
+        """release any resources used by the sink"""
+        self.clear()
+
+    def _append(self, line):
+        pass
+
+    def _clear(self):
+        pass
+
+
+class OutputDiscard(OutputSink):
+    """
+    Don't capture any output. The sink only counts the lines
+    received so RunCommand.run still reports if there was any output.
+    """
+
+
+class OutputRingBuffer(OutputSink):
+    """
+    Keep the last maxLines lines of output
+
+    Args:
+        maxLines (:obj:`int`, optional): number of lines to keep.
+            Defaults to 1000.
+    """
+
+    def __init__(self, maxLines=1000):
+        super().__init__()
+
+        self.__lines = deque(maxlen=maxLines)
+
+    def __getitem__(self, index):
+        return self.__lines[index]
+
+    def __iter__(self):
+        return iter(list(self.__lines))
+
+    def __len__(self):
+        return len(self.__lines)
+
+    @property
+    def maxLines(self):
+        return self.__lines.maxlen
+
+    def _append(self, line):
+        self.__lines.append(line)
+
+    def _clear(self):
+        self.__lines.clear()
+
+
+class OutputSpillFile(OutputSink):
+    """
+    Write the output to a temporary file the file is deleted when the
+    sink is closed or garbage collected. Iterating over the sink reads
+    the lines back from the file without loading all of them in memory.
+
+    Args:
+        directory (:obj:`str`, optional): directory for the temporary file.
+            Defaults to None system temporary directory.
+        readSize (:obj:`int`, optional): aproximate size in bytes of every
+            block read while iterating. Defaults to 65536.
+    """
+
+    def __init__(self, directory=None, readSize=65536):
+        super().__init__()
+
+        self.__directory = directory
+        self.__readSize = readSize
+        self.__file = None
+
+    def __del__(self):
+        self._clear()
+
+    def __iter__(self):
+
+        if self.__file is None:
+            return
+
+        self.__file.flush()
+        position = 0
+
+        while True:
+            self.__file.seek(position)
+            lines = []
+            size = 0
+            while (size < self.__readSize) and (line := self.__file.readline()):
+                lines.append(line)
+                size += len(line)
+            position = self.__file.tell()
+            # leave file ready for appends while the caller works on the lines
+            self.__file.seek(0, 2)
+            if not lines:
+                break
+            yield from lines
+
+    def __len__(self):
+        return self.total
+
+    def _append(self, line):
+        if self.__file is None:
+            self.__file = tempfile.TemporaryFile(
+                mode="w+",
+                encoding="utf-8",
+                newline="",
+                dir=self.__directory,
+            )
+        self.__file.write(line)
+
+    def _clear(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
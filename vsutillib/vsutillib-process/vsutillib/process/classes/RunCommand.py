@@ -11,6 +11,7 @@ match will be set on regexmatch property
 """
 # RNC0004
 
+import codecs
 import io
 import logging
 import platform
@@ -42,8 +43,8 @@ class RunCommand:
         False otherwise. Defaults to False.
 
         **processLine** (:obj:`function`, optional): Function called with
-        every line read if working in text mode. If working in binary it
-        receives character by character. Defaults to None.
+        every line read. If working in binary mode with characterMode True
+        it receives character by character. Defaults to None.
 
         **processArgs** (:obj:`list`, optional): Variable length list to
         pass to processLine. Defaults to None.
@@ -57,6 +58,21 @@ class RunCommand:
         **universalNewLine** (:obj:`bool`): True to read in text mode
         False to read binary mode. Defaults to False.
 
+        **characterMode** (:obj:`bool`): In binary mode read the output
+        one character at the time and call processLine with every
+        character. Otherwise the output is read in chunks and processLine
+        receives complete lines split on '\\n' and '\\r'.
+        Defaults to False.
+
+        **bufferSize** (:obj:`int`): size of the chunks read in binary
+        mode. Defaults to 65536.
+
+        **outputSink** (:obj:`OutputSink`, optional): where to save the
+        output of the command. OutputRingBuffer keeps the last N lines,
+        OutputSpillFile saves the output to a temporary file and
+        OutputDiscard don't save any output. Defaults to None all the
+        output is saved in a list.
+
     Raises:
 
         ValueError: If processArgs is not a list or if processKWArgs
@@ -100,16 +116,23 @@ class RunCommand:
         universalNewLines=False,
         controlQueue=None,
         log=None,
+        characterMode=False,
+        bufferSize=65536,
+        outputSink=None,
     ):  # pylint: disable=too-many-arguments
 
         self.__command = None
+        self.__process = None
+        self.__outputSink = outputSink
         self.command = command  # Call class setter property
 
         self.__commandShlex = commandShlex
         self.__processLine = processLine
 
         self.__universalNewLines = universalNewLines
-        if not self.__universalNewLines:
+        self.__characterMode = characterMode
+        self.__bufferSize = bufferSize
+        if not self.__universalNewLines and self.__characterMode:
             if self.__processLine is None:
                 self.__processLine = processCommandOutput
 
@@ -137,7 +160,7 @@ class RunCommand:
                 self.__regEx = re.compile(regexsearch)
 
         self.__error = ""
-        self.__output = []
+        self.__output = [] if outputSink is None else outputSink
         self.__controlQueue = controlQueue
         self.__returnCode = None
         self.__regexmatch = None
@@ -225,9 +248,10 @@ class RunCommand:
         captured output
 
         Returns:
-            list:
+            list|OutputSink:
 
-            output of executed command
+            output of executed command. If an outputSink was set the
+            sink is returned.
         """
         return self.__output
 
@@ -277,18 +301,46 @@ class RunCommand:
         """
 
         self._reset()
-        if self.__universalNewLines:
-            self._getCommandOutputText()
-        else:
-            self._getCommandOutputBinary()
+        try:
+            if self.__universalNewLines:
+                self._getCommandOutputText()
+            elif self.__characterMode:
+                self._getCommandOutputCharacter()
+            else:
+                self._getCommandOutputBinary()
+        finally:
+            self.__process = None
         if self.__output:
             return True
         return False
 
+    def kill(self):
+        """
+        kill the command if it is running. Can be called from another
+        thread to stop a command that is not producing any output.
+
+        Returns:
+            bool:
+
+            True if a running command was killed False otherwise
+        """
+
+        if (p := self.__process) is not None:
+            if p.poll() is None:
+                p.kill()
+                if self.log:
+                    MODULELOG.debug("RNC0005: Command killed %s", self.__command)
+                return True
+
+        return False
+
     def _reset(self, command=None):
         """reset internal variables"""
 
-        self.__output = []
+        if self.__outputSink is None:
+            self.__output = []
+        else:
+            self.__outputSink.clear()
         self.__error = ""
         self.__regexmatch = None
         if command is not None:
@@ -339,6 +391,7 @@ class RunCommand:
                     universal_newlines=True,
                     stderr=subprocess.STDOUT,
                 )
+            self.__process = p
             try:
                 for line in p.stdout:
                     self.__output.append(line)
@@ -348,8 +401,7 @@ class RunCommand:
                             line, *self.__processArgs, **self.__processKWArgs
                         )
                     if self.__controlQueue:
-                        queueStatus = self.__controlQueue.popleft()
-                        self.__controlQueue.appendleft(queueStatus)
+                        queueStatus = self.__controlQueue[0]
                         if queueStatus in [
                             RunStatus.Abort,
                             RunStatus.AbortJob,
@@ -365,7 +417,7 @@ class RunCommand:
                                 )
                                 MODULELOG.debug(msg)
                             break
-                p.kill()
+                p.wait()
             except UnicodeDecodeError as error:
                 trb = traceback.format_exc()
                 msg = "Error: {}".format(error.reason)
@@ -391,7 +443,8 @@ class RunCommand:
                 if self.log:
                     MODULELOG.debug("RNC0002: Keyboard interrupt %s", msg)
                 raise SystemExit(0) from error
-            if rcResult := p.poll():
+            rcResult = p.poll()
+            if rcResult is not None:
                 self.__returnCode = rcResult
                 rc = rcResult
             p.kill()
@@ -401,7 +454,11 @@ class RunCommand:
         return rc
 
     def _getCommandOutputBinary(self):
-        """Execute command in a subprocess"""
+        """
+        Execute command in a subprocess reading the output in chunks. The
+        chunks are split in lines on '\\n' and '\\r' and every complete
+        line is passed to processLine and the regex search.
+        """
 
         self.__returnCode = 10000
         rc = 1000
@@ -415,11 +472,103 @@ class RunCommand:
                 cFlag = subprocess.CREATE_NO_WINDOW
             with subprocess.Popen(
                 cmd,
+                bufsize=0,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 universal_newlines=False,
                 creationflags=cFlag,
             ) as p:
+                self.__process = p
+                decoder = codecs.getincrementaldecoder("utf8")()
+                splitter = LineSplitter()
+                buffer = bytearray(self.__bufferSize)
+                view = memoryview(buffer)
+                try:
+                    while True:
+                        n = p.stdout.readinto(buffer)
+                        if not n:
+                            lines = splitter.feed(decoder.decode(b"", final=True))
+                            lines.extend(splitter.flush())
+                            self._processLines(lines)
+                            break
+                        self._processLines(splitter.feed(decoder.decode(view[:n])))
+
+                        if self.__controlQueue:
+                            queueStatus = self.__controlQueue[0]
+                            if queueStatus in [
+                                RunStatus.Abort,
+                                RunStatus.AbortJob,
+                                RunStatus.AbortForced,
+                            ]:
+                                p.kill()
+                                outs, errs = p.communicate()
+                                rc = p.returncode
+                                self.__returnCode = p.returncode
+                                if self.log:
+                                    msg = f"RNC0003: Aborting outs {outs} errs {errs} rc={rc}"
+                                    MODULELOG.debug(msg)
+                                break
+                    p.wait()
+
+                except UnicodeDecodeError as error:
+                    trb = traceback.format_exc()
+                    msg = "Error: {}".format(error.reason)
+                    self.__output.append(str(cmd) + "\n")
+                    self.__output.append(msg)
+                    self.__output.append(trb)
+                    if self.log:
+                        MODULELOG.debug("RNC0001: Unicode decode error %s", msg)
+                except KeyboardInterrupt as error:
+                    trb = traceback.format_exc()
+                    msg = "Error: {}".format(error.args)
+                    self.__output.append(str(cmd) + "\n")
+                    self.__output.append(msg)
+                    self.__output.append(trb)
+                    if self.log:
+                        MODULELOG.debug("RNC0002: Keyboard interrupt %s", msg)
+                    raise SystemExit(0) from error
+                rcResult = p.poll()
+                if rcResult is not None:
+                    self.__returnCode = rcResult
+                    rc = rcResult
+        except FileNotFoundError as e:
+            self.__error = e
+
+        return rc
+
+    def _processLines(self, lines):
+        """Save lines read and pass them to processLine and regex search"""
+
+        for line in lines:
+            self.__output.append(line)
+            self._regexMatch(line)
+            if self.__processLine is not None:
+                self.__processLine(line, *self.__processArgs, **self.__processKWArgs)
+
+    def _getCommandOutputCharacter(self):
+        """
+        Execute command in a subprocess reading the output character by
+        character. Only used when characterMode is requested.
+        """
+
+        self.__returnCode = 10000
+        rc = 1000
+        if self.__commandShlex:
+            cmd = self.__command
+        else:
+            cmd = shlex.split(self.__command)
+        try:
+            cFlag = 0
+            if platform.system() == "Windows":
+                cFlag = subprocess.CREATE_NO_WINDOW
+            with subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=False,
+                creationflags=cFlag,
+            ) as p:
+                self.__process = p
                 reader = io.TextIOWrapper(p.stdout, encoding="utf8")
                 try:
                     while ch := reader.read(1):
@@ -432,8 +581,7 @@ class RunCommand:
                                 self._regexMatch(line)
 
                         if self.__controlQueue:
-                            queueStatus = self.__controlQueue.popleft()
-                            self.__controlQueue.appendleft(queueStatus)
+                            queueStatus = self.__controlQueue[0]
                             if queueStatus in [
                                 RunStatus.Abort,
                                 RunStatus.AbortJob,
@@ -447,7 +595,7 @@ class RunCommand:
                                     msg = f"RNC0003: Aborting outs {outs} errs {errs} rc={rc}"
                                     MODULELOG.debug(msg)
                                 break
-                    p.kill()
+                    p.wait()
 
                 except UnicodeDecodeError as error:
                     trb = traceback.format_exc()
@@ -500,6 +648,69 @@ def processCommandOutput(ch):  # pylint: disable=invalid-name
     return line
 
 
+class LineSplitter:
+    """
+    Split a stream of text chunks in lines. Lines end in '\\n', '\\r' or
+    '\\r\\n' and are returned with the line ending included. A '\\r\\n'
+    split between two chunks is returned as one line ending in '\\r'
+    the '\\n' at the start of the next chunk is dropped.
+    """
+
+    reLineEx = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)")
+
+    def __init__(self):
+
+        self.__pending = ""
+        self.__skipLineFeed = False
+
+    def feed(self, text):
+        """
+        feed add text to the stream
+
+        Args:
+            text (str): chunk of text read
+
+        Returns:
+            list: complete lines found
+        """
+
+        if not text:
+            return []
+
+        if self.__skipLineFeed:
+            self.__skipLineFeed = False
+            if text[0] == "\n":
+                text = text[1:]
+
+        data = self.__pending + text
+        lines = []
+        end = 0
+
+        for match in self.reLineEx.finditer(data):
+            lines.append(match.group(0))
+            end = match.end()
+
+        self.__pending = data[end:]
+        if lines and end == len(data) and data[-1] == "\r":
+            self.__skipLineFeed = True
+
+        return lines
+
+    def flush(self):
+        """
+        flush return any text pending without line ending
+
+        Returns:
+            list: last line if any
+        """
+
+        lines = [self.__pending] if self.__pending else []
+        self.__pending = ""
+        self.__skipLineFeed = False
+
+        return lines
+
+
 class RunStatus:
     """Key values for job related work"""
 
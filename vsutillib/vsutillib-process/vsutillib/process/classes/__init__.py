@@ -4,6 +4,10 @@ Import names for process
 
 # THR0001
 
+from .AsyncRunCommand import AsyncRunCommand
+from .CommandScheduler import CommandJob, CommandScheduler
+from .JobJournal import JobJournal
 from .multithreading import GenericThreadWorker, QueueThreadWorker, ThreadWorker
 from .multiprocessing import ProcessWorker, QueueProcessWorker
-from .RunCommand import RunCommand
+from .OutputSink import OutputDiscard, OutputRingBuffer, OutputSink, OutputSpillFile
+from .RunCommand import RunCommand, RunStatus
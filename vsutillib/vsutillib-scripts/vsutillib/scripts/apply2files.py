@@ -10,6 +10,13 @@ wildcards also to run on subdirectories or not
 ie.
 python -m apply2files -c wavpack -a '-y --import-id3 --allow-huge-tags' -w '*.dsf' .
 
+with -j/--jobs N up to N commands run at the same time the output of
+every command is written to the log file when it finish
+
+the status of every file is saved in a journal with --resume the files
+done in a previous run of the same command are skipped unless they were
+modified after
+
 Raises:
     ValueError: [description]
 
@@ -17,14 +24,14 @@ Returns:
     [type] -- [description]
 """
 import argparse
+import os
 import sys
 import shlex
 from pathlib import Path
 
 from vsutillib import config
-from vsutillib.misc import staticVars
-from vsutillib.process import RunCommand
-from vsutillib.files import getFileList, getDirectoryList
+from vsutillib.process import CommandScheduler, JobJournal, RunCommand, RunStatus
+from vsutillib.files import FileStream, getDirectoryList
 
 VERSION = config.SCRIPTS_VERSION
 
@@ -79,6 +86,20 @@ def parserArguments():
         default="*",
         help="wildcard to select files to process",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        help="number of commands to run at the same time",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="skip files done in a previous run of the same command",
+    )
     parser.add_argument("--version", action="version", version="%(prog)s " + VERSION)
 
     group = parser.add_mutually_exclusive_group()
@@ -181,7 +202,8 @@ def apply2files():
     ::
 
         usage: apply2files.py [-h] [-a ARGUMENTS] [-d] [-o] [-v] [-c COMMAND]
-                            [-l LOGFILE] [-w WILDCARD] [--version]
+                            [-l LOGFILE] [-w WILDCARD] [-j JOBS] [--resume]
+                            [--version]
                             directory [directory ...]
 
         positional arguments:
@@ -202,6 +224,9 @@ def apply2files():
                                 file to log output
         -w WILDCARD, --wildcard WILDCARD
                                 wildcard to select files to process
+        -j JOBS, --jobs JOBS  number of commands to run at the same time
+        --resume              skip files done in a previous run of the same
+                                command
         --version             show program's version number and exit
 
     """
@@ -232,6 +257,12 @@ def apply2files():
 
     cli = RunCommand(processLine=processLine, universalNewLines=False)
 
+    # status of every file to resume an interrupted batch
+    # --debug doesn't run anything to save
+    journal = None
+    if not args.debug:
+        journal = JobJournal(batch="apply2files " + fileCommand(args, "{}"))
+
     for d in args.directory:
 
         msg = "Working\n\nDirectory: [{}]\nWildcard:  {}\n\n".format(
@@ -239,9 +270,12 @@ def apply2files():
         )
         printToConsoleAndFile(logFile, msg)
 
-        filesList = getFileList(
-            d, wildcard=args.wildcard, fullpath=True, recursive=recursive
-        )
+        # commands start with the first file found while the walk goes on
+        filesList = FileStream(d, wildcard=args.wildcard, recursive=recursive)
+
+        if (args.jobs > 1) and (not args.debug):
+            runParallel(args, filesList, logFile, journal)
+            continue
 
         for of in filesList:
 
@@ -250,13 +284,12 @@ def apply2files():
                     print("By pass.")
                     continue
 
-            f = str(of)
+            if isDone(args, journal, of, logFile):
+                continue
 
-            qf = shlex.quote(f)
+            f = str(of)
 
-            cliCommand = (
-                args.command + " " + args.arguments + " " + qf + " " + args.append
-            )
+            cliCommand = fileCommand(args, f)
             cli.command = cliCommand
 
             msg = "Processing file [{}]\n".format(f)
@@ -269,7 +302,12 @@ def apply2files():
 
             else:
 
+                journal.running(os.path.abspath(f))
                 cli.run()
+                journal.setStatus(
+                    os.path.abspath(f),
+                    RunStatus.Done if cli.rc == 0 else RunStatus.Error,
+                )
 
                 if cli.output:
                     for line in cli.output:
@@ -279,31 +317,116 @@ def apply2files():
     return None
 
 
-@staticVars(line="")
-def processCommandOutput(ch):  # pylint: disable=invalid-name
+def fileCommand(args, f):
+    """command line for file f"""
+
+    qf = shlex.quote(str(f))
+
+    return args.command + " " + args.arguments + " " + qf + " " + args.append
+
+
+def isDone(args, journal, of, logFile):
+    """check if file was done in a previous run when resuming"""
+
+    if args.resume and journal is not None and journal.isDone(os.path.abspath(of)):
+        msg = "Skipping file [{}] done in a previous run\n".format(str(of))
+        printToConsoleAndFile(logFile, msg)
+        return True
+
+    return False
+
+
+def runParallel(args, filesList, logFile, journal):
     """
-    Convenience function that interprets lines in a stream of characters.
+    run the command for every file in filesList with args.jobs workers.
+    The output of every command is written to the log file when it
+    finish so the output of different files is not mixed.
 
     Args:
-        ch (str): characters to display
-
-    Returns:
-        str: Complete line including "\n" character when "\n" is received.
-        None if character received is not a newline.
+        args (argparse.Namespace): command line arguments
+        filesList (FileStream): files to process
+        logFile (file): log file can be None
+        journal (JobJournal): status of the files
     """
 
-    processCommandOutput.line += ch
-    sys.stdout.write(ch)
-    sys.stdout.flush()
+    sourceFiles = []
 
-    if ch != "\n":
-        return None
+    def feed():
+        for of in filesList:
+            if args.onlysubdir:
+                if of.resolve().parent == Path.cwd():
+                    continue
+            if isDone(args, journal, of, logFile):
+                continue
+            sourceFiles.append(of)
+            yield fileCommand(args, of)
+
+    def jobStart(job):
+        journal.running(os.path.abspath(sourceFiles[job.index]))
+
+    def jobFinished(job):
+        journal.setStatus(os.path.abspath(sourceFiles[job.index]), job.status)
+
+        msg = "Processing file [{}] {}".format(sourceFiles[job.index], job.status)
+        if job.status == RunStatus.Error:
+            msg += " rc={} {}".format(job.rc, job.error)
+        msg += "\n"
+        # clear progress line
+        sys.stdout.write("\r" + " " * 60 + "\r")
+        printToConsoleAndFile(logFile, msg)
+
+        if job.output:
+            if args.verbose:
+                for line in job.output:
+                    sys.stdout.write(line)
+            if logFile is not None:
+                for line in job.output:
+                    logFile.write(line.encode())
+                logFile.write("\n\n".encode())
+
+    def progress(finished, total, _):
+        sys.stdout.write(
+            "\rFinished {} of {}{} files".format(
+                finished, total, "" if filesList.done else "+"
+            )
+        )
+        sys.stdout.flush()
+
+    scheduler = CommandScheduler(
+        maxWorkers=args.jobs,
+        progressRegex=None,
+        funcProgress=progress,
+        funcJobStart=jobStart,
+        funcJobFinished=jobFinished,
+        commandShlex=False,
+        universalNewLines=False,
+    )
 
-    line = processCommandOutput.line
+    try:
+        scheduler.run(feed=feed())
+    except SystemExit:
+        msg = "\n\nInterrupted {} files finished.\n".format(
+            sum(job.status == RunStatus.Done for job in scheduler)
+        )
+        printToConsoleAndFile(logFile, msg)
+        raise
+
+    errors = sum(job.status != RunStatus.Done for job in scheduler)
+    msg = "\n{} files processed {} errors\n".format(len(scheduler), errors)
+    printToConsoleAndFile(logFile, msg)
 
-    processCommandOutput.line = ""
 
-    return line
+def processCommandOutput(line):  # pylint: disable=invalid-name
+    """
+    Convenience function that display the lines read from the command
+    output.
+
+    Args:
+        line (str): line to display
+    """
+
+    sys.stdout.write(line)
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -4,32 +4,184 @@
 Compress DSF files into WavPack
 
 DSD format is preserved
+
+with -j/--jobs N up to N files are compressed at the same time
+
+with --resume the files compressed in a previous run are skipped if the
+WavPack file is still the same
 """
 
 import argparse
+import os
 import sys
 import shlex
+import threading
+import time
 
 from pathlib import Path
 
 from vsutillib import config
-from vsutillib.misc import staticVars
-from vsutillib.process import RunCommand
-from vsutillib.files import getFileList, getDirectoryList, getExecutable
+from vsutillib.process import CommandScheduler, JobJournal, RunCommand, RunStatus
+from vsutillib.files import FileStream, getDirectoryList, getExecutable
 
 VERSION = config.SCRIPTS_VERSION
 
 __version__ = VERSION
 
+# created file, version and temp file rename in wavpack output
+REGEXSEARCH = [
+    r"created (.*?) in.* (.*?)%",
+    r"sor.\W(.*?) Version (.*)",
+    r"temp file (.*?) to (.*)!",
+]
+
+
+class TranscodeResult:  # pylint: disable=too-few-public-methods
+    """
+    result of one file read from the wavpack output
+
+    Args:
+        fileName (str): file compressed
+        size (int): size of file in bytes
+        seconds (float): time used by wavpack
+        rc (int): wavpack return code
+        regexmatch (list): RunCommand.regexmatch for REGEXSEARCH
+    """
+
+    def __init__(self, fileName, size=0, seconds=0.0, rc=None, regexmatch=None):
+
+        self.fileName = fileName
+        self.size = size
+        self.seconds = seconds
+        self.rc = rc
+        self.createdFile = None
+        self.compression = None
+        self.version = None
+        self.tempFile = None
+        self.renamedFile = None
+
+        if regexmatch:
+            if (fc := regexmatch[0]) and len(fc) == 2:
+                self.createdFile, self.compression = fc[0], fc[1]
+            if fc := regexmatch[1]:
+                self.version = "WavPack {} Version {}".format(fc[0], fc[1])
+            if (fc := regexmatch[2]) and len(fc) == 2:
+                self.tempFile, self.renamedFile = fc[0], fc[1]
+
+    @property
+    def ok(self):
+        return self.createdFile is not None
+
+    @property
+    def outputFile(self):
+        """WavPack file created"""
+        return self.renamedFile or self.createdFile
+
+    @property
+    def mbPerSecond(self):
+        return _mbPerSecond(self.size, self.seconds)
+
+    def message(self, verbose=False):
+        """message for the log"""
+
+        if not self.ok:
+            return "no file created rc={}\n\n".format(self.rc)
+
+        version = "\n" if verbose else ""
+        if self.version:
+            version += self.version + " "
+
+        return "{}created file [{}] at {}% compression\n\n".format(
+            version, self.createdFile, self.compression
+        )
+
 
-class Files:  # pylint: disable=too-few-public-methods
+class TranscodeResults:
     """
-    utility class
+    results of all the files compressed they can be added from any
+    thread
     """
 
-    total = 0
-    count = 0
-    noMatch = []
+    def __init__(self):
+
+        self.__results = []
+        self.__lock = threading.Lock()
+        self.__start = time.perf_counter()
+
+    def __iter__(self):
+        return iter(self.__results)
+
+    def __len__(self):
+        return len(self.__results)
+
+    def add(self, result):
+        """add TranscodeResult"""
+
+        with self.__lock:
+            self.__results.append(result)
+
+    def summary(self):
+        """
+        summary table with every file and the totals
+
+        Returns:
+            str:
+
+            summary
+        """
+
+        with self.__lock:
+            results = list(self.__results)
+
+        lines = [
+            "{:>10} {:>9} {:>8} {:>12}  {}".format(
+                "Size MB", "Seconds", "MB/s", "Compression", "File"
+            )
+        ]
+        for result in results:
+            lines.append(
+                "{:>10.1f} {:>9.1f} {:>8.1f} {:>12}  {}".format(
+                    result.size / 1048576,
+                    result.seconds,
+                    result.mbPerSecond,
+                    result.compression + "%" if result.ok else "error",
+                    result.renamedFile or result.createdFile or result.fileName,
+                )
+            )
+        lines.append("\n" + self.totals() + "\n")
+
+        return "\n".join(lines)
+
+    def totals(self):
+        """
+        totals line with the throughput of all the files
+
+        Returns:
+            str:
+
+            number of files, MB compressed, elapsed time and MB/s
+        """
+
+        with self.__lock:
+            results = list(self.__results)
+
+        elapsed = time.perf_counter() - self.__start
+        totalSize = sum(result.size for result in results)
+        totalSeconds = sum(result.seconds for result in results)
+        ok = sum(1 for result in results if result.ok)
+
+        return (
+            "{} files {} ok {} errors {:.1f} MB in {:.1f} s {:.1f} MB/s "
+            "({:.1f} MB/s per file)".format(
+                len(results),
+                ok,
+                len(results) - ok,
+                totalSize / 1048576,
+                elapsed,
+                _mbPerSecond(totalSize, elapsed),
+                _mbPerSecond(totalSize, totalSeconds),
+            )
+        )
 
 
 def parserArguments():
@@ -68,6 +220,20 @@ def parserArguments():
         default="*.dsf",
         help="wildcard to select files to process",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        help="number of files to compress at the same time 0 for one per core",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="skip files compressed in a previous run",
+    )
     parser.add_argument("--version", action="version", version="%(prog)s " + VERSION)
 
     return parser
@@ -166,108 +332,240 @@ def dsf2wv():
     if not verifyDirectories(args, logFile):
         return
 
+    results = TranscodeResults()
+
+    # status of every file to resume an interrupted batch
+    # --debug doesn't run anything to save
+    journal = None
+    if not args.debug:
+        journal = JobJournal(batch="dsf2wv " + command)
+
+    for d in args.directory:
+
+        msg = "Working in \n\nDirectory: [{}]\nWildcard:  {}\n\n".format(
+            str(Path(d).resolve()), args.wildcard
+        )
+        printToConsoleAndFile(logFile, msg)
+
+        # encoding starts with the first file found while the walk goes on
+        filesList = FileStream(
+            d, wildcard=args.wildcard, recursive=not args.onlycurrentdir
+        )
+
+        directoryResults = len(results)
+
+        if (args.jobs != 1) and (not args.debug):
+            runParallel(args, command, filesList, results, logFile, journal)
+        else:
+            runSequential(args, command, filesList, results, logFile, journal)
+
+        noMatch = [
+            result.fileName
+            for result in list(results)[directoryResults:]
+            if not result.ok
+        ]
+
+        if noMatch:
+            msg = "Bummer.."
+            for f in noMatch:
+                msg = "Check file '{}'\n".format(f)
+                logFile.write(msg.encode())
+
+    if len(results):
+        logFile.write(("\n" + results.summary()).encode())
+        print(results.totals())
+
+
+def runSequential(args, command, filesList, results, logFile, journal):
+    """
+    compress the files one at a time
+
+    Args:
+        args (argparse.Namespace): command line arguments
+        command (str): wavpack command without file
+        filesList (FileStream): files to compress
+        results (TranscodeResults): results aggregator
+        logFile (file): log file
+        journal (JobJournal): status of the files None with --debug
+    """
+
     processLine = None
     if args.verbose:
         # processLine = sys.stdout.write
         processLine = processCommandOutput
 
     cli = RunCommand(
-        regexsearch=[
-            r"created (.*?) in.* (.*?)%",
-            r"sor.\W(.*?) Version (.*)",
-            r"temp file (.*?) to (.*)!",
-        ],
+        regexsearch=REGEXSEARCH,
         processLine=processLine,
         universalNewLines=False,
     )
 
-    workFiles = Files()
+    for of in filesList:
 
-    for d in args.directory:
+        if isDone(args, journal, of, logFile):
+            continue
 
-        msg = "Working in \n\nDirectory: [{}]\nWildcard:  {}\n\n".format(
-            str(Path(d).resolve()), args.wildcard
-        )
+        f = str(of)
+
+        cliCommand = command + " " + shlex.quote(f)
+        cli.command = cliCommand
+
+        msg = "Processing file [{}]".format(f)
         printToConsoleAndFile(logFile, msg)
 
-        filesList = getFileList(
-            d, wildcard=args.wildcard, fullpath=True, recursive=not args.onlycurrentdir
-        )
+        if args.debug:
+
+            msg = "Command: {}\n\n".format(cliCommand)
+            printToConsoleAndFile(logFile, msg)
+
+        else:
 
-        workFiles.total = len(filesList)
-        workFiles.count = 0
-        workFiles.noMatch = []
+            journal.running(os.path.abspath(f))
+            start = time.perf_counter()
+            cli.run()
 
+            result = TranscodeResult(
+                f,
+                fileSize(of),
+                time.perf_counter() - start,
+                cli.rc,
+                cli.regexmatch,
+            )
+            results.add(result)
+            journalResult(journal, result)
+            if result.ok:
+                printToConsoleAndFile(logFile, result.message(args.verbose))
+
+            if cli.output:
+                for line in cli.output:
+                    logFile.write(line.encode())
+                logFile.write("\n\n".encode())
+
+
+def runParallel(args, command, filesList, results, logFile, journal):
+    """
+    compress the files with a pool of args.jobs workers. The wavpack
+    output of every file is written to the log when it finish.
+
+    Args:
+        args (argparse.Namespace): command line arguments
+        command (str): wavpack command without file
+        filesList (FileStream): files to compress
+        results (TranscodeResults): results aggregator
+        logFile (file): log file
+        journal (JobJournal): status of the files
+    """
+
+    sourceFiles = []
+    startTimes = {}
+
+    def feed():
         for of in filesList:
+            if isDone(args, journal, of, logFile):
+                continue
+            sourceFiles.append((str(of), fileSize(of)))
+            yield command + " " + shlex.quote(str(of))
+
+    def jobStart(job):
+        journal.running(os.path.abspath(sourceFiles[job.index][0]))
+        startTimes[job.index] = time.perf_counter()
+
+    def jobFinished(job):
+        if job.status == RunStatus.Skipped:
+            # not started after interrupt
+            return
+
+        f, size = sourceFiles[job.index]
+        seconds = 0.0
+        if job.index in startTimes:
+            seconds = time.perf_counter() - startTimes.pop(job.index)
+
+        result = TranscodeResult(f, size, seconds, job.rc, job.regexmatch)
+        results.add(result)
+        journalResult(
+            journal, result, RunStatus.Error if job.status == RunStatus.Done else job.status
+        )
 
-            f = str(of)
+        msg = "Processing file [{}]\n".format(f)
+        msg += result.message(args.verbose)
+        printToConsoleAndFile(logFile, msg)
 
-            cliCommand = command + " " + shlex.quote(f)
-            cli.command = cliCommand
+        if job.output:
+            if args.verbose:
+                for line in job.output:
+                    sys.stdout.write(line)
+            for line in job.output:
+                logFile.write(line.encode())
+            logFile.write("\n\n".encode())
+
+    scheduler = CommandScheduler(
+        maxWorkers=args.jobs if args.jobs > 0 else None,
+        regexsearch=REGEXSEARCH,
+        progressRegex=None,
+        funcJobStart=jobStart,
+        funcJobFinished=jobFinished,
+        commandShlex=False,
+        universalNewLines=False,
+    )
 
-            msg = "Processing file [{}]".format(f)
-            printToConsoleAndFile(logFile, msg)
+    try:
+        scheduler.run(feed=feed())
+    except SystemExit:
+        logFile.write(("\n\nInterrupted.\n\n" + results.summary()).encode())
+        print("\nInterrupted.\n" + results.totals())
+        raise
 
-            if args.debug:
 
-                msg = "Command: {}\n\n".format(cliCommand)
-                printToConsoleAndFile(logFile, msg)
+def isDone(args, journal, of, logFile):
+    """check if file was compressed in a previous run when resuming"""
 
-            else:
+    if args.resume and journal is not None and journal.isDone(os.path.abspath(of)):
+        msg = "Skipping file [{}] compressed in a previous run\n".format(str(of))
+        printToConsoleAndFile(logFile, msg)
+        return True
 
-                cli.run()
+    return False
 
-                version = "\n" if args.verbose else ""
-                if fc := cli.regexmatch[1]:
-                    version += "WavPack {} Version {} ".format(fc[0], fc[1])
 
-                if fc := cli.regexmatch[0]:
-                    if len(fc) == 2:
-                        msg = "{}created file [{}] at {}% compression\n\n".format(
-                            version, fc[0], fc[1]
-                        )
-                        printToConsoleAndFile(logFile, msg)
-                        workFiles.count += 1
-                    else:
-                        workFiles.noMatch.append(f)
+def journalResult(journal, result, errorStatus=RunStatus.Error):
+    """save status of the file with the WavPack file created"""
 
-                if cli.output:
-                    for line in cli.output:
-                        logFile.write(line.encode())
-                    logFile.write("\n\n".encode())
+    if result.ok:
+        journal.setStatus(
+            os.path.abspath(result.fileName), RunStatus.Done, result.outputFile
+        )
+    else:
+        journal.setStatus(os.path.abspath(result.fileName), errorStatus)
 
-        if workFiles.count != workFiles.total:
-            msg = "Bummer.."
-            for f in workFiles.noMatch:
-                msg = "Check file '{}'\n".format(f)
-                logFile.write(msg.encode())
 
+def fileSize(oFile):
+    """size of file 0 if it can not be read"""
 
-@staticVars(line="")
-def processCommandOutput(ch):  # pylint: disable=invalid-name
-    """
-    Convenience function that interprets lines in a stream of characters.
+    try:
+        return Path(oFile).stat().st_size
+    except OSError:
+        return 0
 
-    Args:
-        ch (str): characters to display
 
-    Returns:
-        str: Complete line including "\n" character when "\n" is received.
-        None if character received is not a newline.
-    """
+def _mbPerSecond(size, seconds):
 
-    processCommandOutput.line += ch
-    sys.stdout.write(ch)
-    sys.stdout.flush()
+    if seconds <= 0:
+        return 0.0
 
-    if ch != "\n":
-        return None
+    return size / 1048576 / seconds
 
-    line = processCommandOutput.line
 
-    processCommandOutput.line = ""
+def processCommandOutput(line):  # pylint: disable=invalid-name
+    """
+    Convenience function that display the lines read from the command
+    output.
 
-    return line
+    Args:
+        line (str): line to display
+    """
+
+    sys.stdout.write(line)
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
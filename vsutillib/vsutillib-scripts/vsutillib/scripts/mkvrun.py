@@ -4,14 +4,18 @@
 run command line generated by mkvmerge-gui
 
 use the linux bash one encased in double quotes
+
+with --resume the commands done in a previous run are skipped if the
+destination file is still the same
 """
 
 import argparse
 import sys
 
 from vsutillib import config
+from vsutillib.media import MediaFileInfo, MediaInfoCache
 from vsutillib.mkv import MKVCommandParser, VerifyStructure
-from vsutillib.process import RunCommand
+from vsutillib.process import CommandScheduler, JobJournal, OutputSpillFile
 
 
 VERSION = config.SCRIPTS_VERSION
@@ -28,7 +32,9 @@ def mkvrun():
 
     ::
 
-        usage: mkvRun.py [-h] [--version] command
+        usage: mkvRun.py [-h] [-j JOBS] [-d DEVICE_JOBS] [--no-cache] [--resume]
+                         [--version]
+                         command
 
         mkvmerge-gui generated command line batch run utility
 
@@ -38,6 +44,13 @@ def mkvrun():
 
         optional arguments:
         -h, --help  show this help message and exit
+        -j JOBS, --jobs JOBS
+                    number of mkvmerge commands to run in parallel
+        -d DEVICE_JOBS, --device-jobs DEVICE_JOBS
+                    maximum number of parallel commands reading or
+                    writing the same device
+        --no-cache  don't use the MediaInfo cache in ~/.vsutillib
+        --resume    skip commands done in a previous run
         --version   show program's version number and exit
 
     Args:
@@ -52,6 +65,34 @@ def mkvrun():
         "command",
         help='mkvmerge-gui "command" line - used Linux/Unix shell enclose it in double quotes',
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        help="number of mkvmerge commands to run in parallel",
+    )
+    parser.add_argument(
+        "-d",
+        "--device-jobs",
+        action="store",
+        type=int,
+        default=None,
+        help="maximum number of parallel commands reading or writing the same device",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="don't use the MediaInfo cache in ~/.vsutillib",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="skip commands done in a previous run",
+    )
     parser.add_argument("--version", action="version", version="%(prog)s " + VERSION)
 
     args = parser.parse_args()
@@ -61,49 +102,141 @@ def mkvrun():
 
     f = open("log.txt", mode="w", encoding="utf-8")
 
+    if not args.no_cache:
+        # files already probed in previous runs are not parsed again
+        MediaFileInfo.classCache(MediaInfoCache())
+
     mkv = MKVCommandParser()
     mkv.command = args.command
 
     verify = VerifyStructure()
 
-    cli = RunCommand(
-        processLine=displayConsoleOutput,
-        commandShlex=True,
-        universalNewLines=True
-    )
+    # status of every command to resume an interrupted batch the source
+    # files identify the command the destination can be renamed to avoid
+    # overwrites
+    journal = JobJournal(batch="mkvrun " + args.command)
 
     if mkv:
-        for cmd, baseFiles, sourceFiles, destinationFiles, _, _, _ in mkv:
+        commands = []
+        destinations = []
+        devices = mkv.devices
+        messages = []
+        items = []
 
-            verify.verifyStructure(baseFiles, sourceFiles)
+        # all the files are verified before the first command runs
+        results = verify.verifyBatch(mkv)
 
-            if verify:
-                msg = ( f"\nCommand: {cmd}\nBase Files: {baseFiles}\n"
-                       f"Source Files: {sourceFiles}\n"
-                       f"Destination Files: {destinationFiles}\n\n"
-                )
+        for (cmd, baseFiles, sourceFiles, destinationFiles, _, _, _), result in zip(
+            mkv, results
+        ):
 
+            if args.resume and journal.isDone(str(sourceFiles)):
+                msg = f"\nSkipping done in a previous run: {destinationFiles}\n"
                 print(msg)
                 f.write(msg)
 
-                cli.command = cmd
-                cli.run()
-
-                for l in cli.output:
-                    f.write(str(l))
+            elif result:
+                msg = ( f"\nCommand: {cmd}\nBase Files: {baseFiles}\n"
+                       f"Source Files: {sourceFiles}\n"
+                       f"Destination Files: {destinationFiles}\n\n"
+                )
+                commands.append(cmd)
+                destinations.append(destinationFiles)
+                messages.append(msg)
+                items.append(str(sourceFiles))
 
             else:
                 msg = f"\nDestination Files: {destinationFiles}\n"
                 f.write(msg)
-                for m in verify.analysis:
+                for m in result.analysis:
                     print(m)
                     f.write(m)
 
+        scheduler = CommandScheduler(
+            commands,
+            destinations,
+            devices=[devices] * len(commands),
+            maxWorkers=max(args.jobs, 1),
+            maxPerDevice=args.device_jobs,
+            processLine=displayConsoleOutput if args.jobs <= 1 else None,
+            funcProgress=None if args.jobs <= 1 else displayProgress,
+            funcJobStart=lambda job: jobStart(
+                f, messages[job.index], args.jobs, journal, items[job.index]
+            ),
+            funcJobFinished=lambda job: jobFinished(
+                f, job, messages[job.index], args.jobs, journal, items[job.index]
+            ),
+            universalNewLines=True,
+            outputSink=OutputSpillFile,
+            successCodes=(0, 1),  # mkvmerge return 1 for warnings
+        )
+        scheduler.run()
+
     else:
 
         print("Bummer...{}".format(mkv.error))
 
 
+def jobStart(logFile, msg, jobs, journal, item):
+    """
+    Convenience function to display and log the command when a job starts
+    running one job at the time.
+
+    Args:
+        logFile (file): log file
+        msg (str): command information
+        jobs (int): number of parallel jobs
+        journal (JobJournal): status of the commands
+        item (str): key of the command in journal
+    """
+
+    journal.running(item)
+
+    if jobs <= 1:
+        print(msg)
+        logFile.write(msg)
+
+
+def jobFinished(logFile, job, msg, jobs, journal, item):
+    """
+    Convenience function to save the output of a job to the log file
+    when it finish. When running parallel jobs the command information
+    and output of the job are written in one block.
+
+    Args:
+        logFile (file): log file
+        job (CommandJob): job finished
+        msg (str): command information
+        jobs (int): number of parallel jobs
+        journal (JobJournal): status of the commands
+        item (str): key of the command in journal
+    """
+
+    journal.setStatus(item, job.status, job.destinationFile)
+
+    if jobs > 1:
+        sys.stdout.write(f"\n{job.status}: {job.destinationFile}\n")
+        logFile.write(msg)
+    if job.output:
+        for l in job.output:
+            logFile.write(str(l))
+        job.output.close()
+
+
+def displayProgress(jobsDone, jobsTotal, percent):
+    """
+    Convenience function that display the aggregate progress of the batch.
+
+    Args:
+        jobsDone (int): jobs finished
+        jobsTotal (int): total jobs
+        percent (int): aggregate percentage
+    """
+
+    sys.stdout.write(f"Jobs: {jobsDone}/{jobsTotal} Progress: {percent}%\r")
+    sys.stdout.flush()
+
+
 def displayConsoleOutput(line):
     """
     Convenience function that interprets lines in a stream of characters.
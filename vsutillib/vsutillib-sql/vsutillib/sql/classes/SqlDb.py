@@ -17,7 +17,7 @@ class SqlDb:
         ValueError: when parametes don't match
     """
 
-    def __init__(self, dbFile=None, autoCommit=False):
+    def __init__(self, dbFile=None, autoCommit=False, checkSameThread=True):
 
         self.__dbFile = dbFile
         self.__conn = None
@@ -25,7 +25,7 @@ class SqlDb:
         self.__autoCommit = autoCommit
 
         if self.__dbFile is not None:
-            self.connect(dbFile)
+            self.connect(dbFile, checkSameThread=checkSameThread)
 
     def __bool__(self):
         return bool(self.__conn)
@@ -41,7 +41,7 @@ class SqlDb:
     def close(self):
         self.connection.close()
 
-    def connect(self, database, autoCommit=False):
+    def connect(self, database, autoCommit=False, checkSameThread=True):
         """
         connect connects to sqlite database
 
@@ -49,6 +49,9 @@ class SqlDb:
             database (str, optional): database file. Defaults to None.
             autoCommit (bool, optional): execute commit after detection of
                 SQL statement. Defaults to False.
+            checkSameThread (bool, optional): False to use the connection
+                from other threads, the caller must serialize the access.
+                Defaults to True.
         """
 
         rc = False
@@ -64,7 +67,9 @@ class SqlDb:
 
         if dbFile is not None:
             try:
-                self.__conn = sqlite3.connect(database)
+                self.__conn = sqlite3.connect(
+                    database, check_same_thread=checkSameThread
+                )
                 rc = True
             except SQLiteError as e:
                 self.__lastError = "SQLiteError: {}".format(e)